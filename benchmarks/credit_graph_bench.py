@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Builds a synthetic credit graph and compares CreditGraph against dicts of
+lists for building, breadth first search and loading. Needs numpy
+
+    ~/imdb-data-parser$ python3 benchmarks/credit_graph_bench.py --credits 1000000
+"""
+
+import argparse
+import collections
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from idp.parser.creditgraph import CreditGraph
+
+
+def synthetic_credits(credits, persons, titles, seed=1):
+    generator = random.Random(seed)
+    for i in range(credits):
+        person = generator.randrange(persons)
+        title = generator.randrange(titles)
+        yield "Surname%d, Name%d" % (person, person), "Synthetic Title %d (%d)" % (title, 1950 + title % 60)
+
+
+def dict_graph(credits):
+    """ the dict of lists way """
+    person_titles = collections.defaultdict(list)
+    title_persons = collections.defaultdict(list)
+    for person, title in credits:
+        person_titles[person].append(title)
+        title_persons[title].append(person)
+    return person_titles, title_persons
+
+
+def dict_distances(graph, source):
+    person_titles, title_persons = graph
+    depths = {source: 0}
+    seen_titles = set()
+    frontier = [source]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for person in frontier:
+            for title in person_titles[person]:
+                if title not in seen_titles:
+                    seen_titles.add(title)
+                    for costar in title_persons[title]:
+                        if costar not in depths:
+                            depths[costar] = depth
+                            next_frontier.append(costar)
+        frontier = next_frontier
+    return depths
+
+
+def timed(name, function, *args):
+    start_time = time.perf_counter()
+    result = function(*args)
+    print("%-32s %7.3f secs" % (name, time.perf_counter() - start_time))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="credit graph benchmark")
+    parser.add_argument('--credits', type=int, default=1000000)
+    parser.add_argument('--persons', type=int, default=250000)
+    parser.add_argument('--titles', type=int, default=100000)
+    args = parser.parse_args()
+
+    credits = list(synthetic_credits(args.credits, args.persons, args.titles))
+    source = credits[0][0]
+
+    graph = timed("dict of lists build", dict_graph, credits)
+    depths = timed("dict of lists BFS", dict_distances, graph, source)
+    del graph
+
+    credit_graph = timed("CreditGraph build", CreditGraph.from_credits, credits)
+    distances = timed("CreditGraph BFS", credit_graph.distances, credit_graph.person_id(source))
+    assert sorted(depths.values()) == sorted(distance for distance in distances.tolist() if distance >= 0)
+
+    with tempfile.TemporaryDirectory() as graph_dir:
+        timed("CreditGraph save", credit_graph.save, graph_dir)
+        loaded = timed("CreditGraph load, memory mapped", CreditGraph.load, graph_dir)
+        timed("CreditGraph BFS, memory mapped", loaded.distances, 0)
+        del loaded
+    print("%d persons, %d titles, %d credits, %d persons reached" % (len(credit_graph.persons), len(credit_graph.titles), len(credit_graph.person_titles), len(depths)))
+
+
+if __name__ == "__main__":
+    main()
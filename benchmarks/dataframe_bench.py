@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Compares pandas.read_csv of the TSV output of a synthetic actors.list
+against load_dataframe, which builds the DataFrame while parsing the list.
+Needs pandas
+
+    ~/imdb-data-parser$ python3 benchmarks/dataframe_bench.py --lines 1000000
+"""
+
+import argparse
+import csv
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pandas
+from idp.parser.actorsparser import ActorsParser
+from idp.parser.dataframeloader import load_dataframe
+from projection_bench import write_synthetic_actors_list
+
+
+def timed(name, function, *args, **kwargs):
+    start_time = time.perf_counter()
+    frame = function(*args, **kwargs)
+    seconds = time.perf_counter() - start_time
+    print("%-36s %7.3f secs  %8.1f MB" % (name, seconds, frame.memory_usage(deep=True).sum() / float(1 << 20)))
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DataFrame loading benchmark")
+    parser.add_argument('--lines', type=int, default=1000000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    columns = [col['colname'] for col in ActorsParser.db_table_info['columns']]
+    with tempfile.TemporaryDirectory() as work_dir:
+        write_synthetic_actors_list(os.path.join(work_dir, "actors.list"), args.lines)
+        start_time = time.perf_counter()
+        ActorsParser({"mode": "TSV", "input_dir": work_dir, "output_dir": work_dir}).start_processing()
+        print("%-36s %7.3f secs" % ("parsing to TSV", time.perf_counter() - start_time))
+        tsv_path = os.path.join(work_dir, "actors.list.tsv")
+
+        read_csv_options = dict(sep="\t", header=None, names=columns, quoting=csv.QUOTE_NONE, keep_default_na=False)
+        timed("read_csv, strings", pandas.read_csv, tsv_path, dtype=str, **read_csv_options)
+        timed("read_csv, categories", pandas.read_csv, tsv_path,
+              dtype=dict((name, "category" if name in ("info_1", "info_2") else str) for name in columns), **read_csv_options)
+        list_path = os.path.join(work_dir, "actors.list")
+        timed("load_dataframe", load_dataframe, "actors", list_path)
+        timed("load_dataframe, title,info_1", load_dataframe, "actors", list_path, columns=["title", "info_1"])
+        timed("load_dataframe, title,year_released", load_dataframe, "actors", list_path, columns=["title", "year_released"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Answers "Comedy and Drama but not Short" over synthetic genre rows by
+grouping the (title, genre) rows and with GenreBitmaps, with and without
+numpy
+
+    ~/imdb-data-parser$ python3 benchmarks/genre_filter_bench.py --titles 1500000
+"""
+
+import argparse
+import collections
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from idp.parser.genrebitmap import GenreBitmapBuilder
+from idp.parser.records import Genre
+
+GENRES = ["Action", "Adult", "Adventure", "Animation", "Biography", "Comedy", "Crime", "Documentary", "Drama", "Family",
+          "Fantasy", "Film-Noir", "Game-Show", "History", "Horror", "Music", "Musical", "Mystery", "News", "Reality-TV",
+          "Romance", "Sci-Fi", "Short", "Sport", "Talk-Show", "Thriller", "War", "Western"]
+
+
+def synthetic_rows(titles, seed=1):
+    generator = random.Random(seed)
+    for i in range(titles):
+        title = "Synthetic Title %d (%d)" % (i, 1950 + i % 60)
+        for genre in generator.sample(GENRES, generator.randint(1, 4)):
+            yield Genre(title, title, "", genre)
+
+
+def scan_rows(rows):
+    """ the way downstream jobs filter the TSV rows """
+    title_genres = collections.defaultdict(set)
+    for row in rows:
+        title_genres[row.title].add(row.genre)
+    return [title for title, genres in title_genres.items() if "Comedy" in genres and "Drama" in genres and "Short" not in genres]
+
+
+def timed(name, function, *args, **kwargs):
+    start_time = time.perf_counter()
+    result = function(*args, **kwargs)
+    print("%-28s %8.1f ms  %d titles" % (name, (time.perf_counter() - start_time) * 1000, len(result)))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="genre filter benchmark")
+    parser.add_argument('--titles', type=int, default=1500000)
+    args = parser.parse_args()
+
+    rows = list(synthetic_rows(args.titles))
+    builder = GenreBitmapBuilder(None)
+    for row in rows:
+        builder.add(row)
+    bitmaps = builder.build()
+    print("%d rows, %d titles, %d KB of bitmaps" % (len(rows), len(bitmaps.titles), len(bitmaps.bitmaps) * bitmaps.bitmaps.itemsize // 1024))
+
+    timed("grouping rows", scan_rows, rows)
+    try:
+        import numpy
+        timed("bitmaps, numpy", bitmaps.select, all_of=["Comedy", "Drama"], none_of=["Short"])
+    except ImportError:
+        print("numpy is not installed")
+    # hides numpy from select
+    sys.modules['numpy'] = None
+    timed("bitmaps, plain Python", bitmaps.select, all_of=["Comedy", "Drama"], none_of=["Short"])
+
+
+if __name__ == "__main__":
+    main()
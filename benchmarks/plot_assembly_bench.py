@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Compares string concatenation against RecordAssembler on a synthetic plot.list
+
+    ~/imdb-data-parser$ python3 benchmarks/plot_assembly_bench.py --titles 2000 --lines 2000
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from idp.parser.records import Plot
+from idp.utils.recordassembler import RecordAssembler
+
+pattern = re.compile("(.+?): (.*)")
+
+
+def synthetic_plot_list(titles, lines):
+    for i in range(titles):
+        yield "-------------------------------------------------------------------------------\n"
+        yield "MV: Synthetic Title %d (2000)\n" % i
+        yield "\n"
+        for j in range(lines):
+            yield "PL: line %d of a long plot summary, wrapped at roughly seventy columns.\n" % j
+        yield "\n"
+        yield "BY: Benchmark\n"
+        yield "\n"
+
+
+class ConcatenatingParser(object):
+    """ the way PlotParser used to accumulate text """
+
+    def __init__(self):
+        self.title = ""
+        self.plot = ""
+
+    def parse(self, lines):
+        records = []
+        for line in lines:
+            matcher = pattern.match(line)
+            if matcher:
+                if matcher.group(1) == "MV":
+                    if self.title != "":
+                        records.append(Plot(self.title, self.plot))
+                    self.plot = ""
+                    self.title = matcher.group(2)
+                elif matcher.group(1) == "PL":
+                    self.plot += matcher.group(2)
+        return records
+
+
+class AssemblingParser(object):
+    def __init__(self):
+        self.assembler = RecordAssembler(Plot)
+
+    def parse(self, lines):
+        records = []
+        for line in lines:
+            matcher = pattern.match(line)
+            if matcher:
+                if matcher.group(1) == "MV":
+                    record = self.assembler.start(matcher.group(2))
+                    if record is not None:
+                        records.append(record)
+                elif matcher.group(1) == "PL":
+                    self.assembler.add(matcher.group(2))
+        record = self.assembler.finish()
+        if record is not None:
+            records.append(record)
+        return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="plot.list accumulation benchmark")
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--lines', type=int, default=1000, help='PL lines per title')
+    args = parser.parse_args()
+
+    lines = list(synthetic_plot_list(args.titles, args.lines))
+    print("%d titles, %d PL lines each, %d lines in total" % (args.titles, args.lines, len(lines)))
+
+    for name, parser_class in (("concatenation", ConcatenatingParser), ("assembler", AssemblingParser)):
+        start_time = time.perf_counter()
+        records = parser_class().parse(lines)
+        print("%-14s %8.3f secs  %d records" % (name, time.perf_counter() - start_time, len(records)))
+
+
+if __name__ == "__main__":
+    main()
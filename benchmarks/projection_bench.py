@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Parses a synthetic actors.list into TSV with all columns and with --columns
+projections, and reports the throughput of each run
+
+    ~/imdb-data-parser$ python3 benchmarks/projection_bench.py --lines 1000000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from idp.parser.actorsparser import ActorsParser
+
+PROJECTIONS = [
+    ("all columns", None),
+    ("surname,name,title", ["surname", "name", "title"]),
+    ("title,role", ["title", "role"]),
+    ("title", ["title"]),
+    ("title,year_released", ["title", "year_released"])
+]
+
+
+def write_synthetic_actors_list(path, lines):
+    """ blocks of a person followed by titles, like actors.list """
+    with open(path, "w", encoding='iso-8859-1') as list_file:
+        list_file.write("THE ACTORS LIST\n===============\n\nName\t\t\tTitles\n----\t\t\t------\n")
+        written = 0
+        person = 0
+        while written < lines:
+            person += 1
+            for credit in range(8):
+                name = "Surname%d, Name%d" % (person, person) if credit == 0 else ""
+                if credit % 3 == 0:
+                    title = "\"Synthetic Series %d\" (%d) {Episode %d (#1.%d)}" % (person, 1950 + person % 60, credit, credit)
+                else:
+                    title = "Synthetic Movie %d (%d) (TV)" % (person * 8 + credit, 1950 + credit * 7)
+                list_file.write("%s\t\t\t%s  (uncredited)  [Role %d]  <%d>\n" % (name, title, credit, credit + 1))
+            list_file.write("\n")
+            written += 9
+        list_file.write("-----------------------------------------------------------------------------\n")
+
+
+def parse(input_dir, output_dir, columns):
+    preferences_map = {"mode": "TSV", "input_dir": input_dir, "output_dir": output_dir}
+    if columns is not None:
+        preferences_map["columns"] = {"actors": columns}
+    start_time = time.perf_counter()
+    ActorsParser(preferences_map).start_processing()
+    return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="column projection benchmark")
+    parser.add_argument('--lines', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each projection, the fastest one is reported')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        write_synthetic_actors_list(os.path.join(work_dir, "actors.list"), args.lines)
+        baseline = None
+        for name, columns in PROJECTIONS:
+            seconds = min(parse(work_dir, work_dir, columns) for run in range(args.repeat))
+            baseline = baseline or seconds
+            print("%-22s %7.3f secs  %8.0f lines/sec  %5.2fx" % (name, seconds, args.lines / seconds, baseline / seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Compares the script of the SqlWriter before dialects (one INSERT of all rows
+with re.escape'd values) against the current SqlWriter, writing and loading
+both into sqlite
+
+    ~/imdb-data-parser$ python3 benchmarks/sql_writer_bench.py --rows 20000
+"""
+
+import argparse
+import io
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from idp.parser.records import Rating
+from idp.parser.ratingsparser import RatingsParser
+from idp.utils.recordwriters import SqlWriter
+
+
+def synthetic_ratings(rows, plain=False):
+    """ plain titles have no quotes or backslashes, which the old scripts could not load """
+    for i in range(rows):
+        if plain:
+            title = "Synthetic Movie %d (2000)" % i
+        else:
+            title = "\"Synthetic's Series %d\" (2000) {Episode \\ %d (#1.%d)}" % (i // 100, i, i % 100)
+        yield Rating("0000000125", str(1000 + i), "7.%d" % (i % 10), title, title, "")
+
+
+def old_script(records):
+    """ the script SqlWriter wrote before dialects, with its DROP, CREATE and INSERT lines """
+    table_info = RatingsParser.db_table_info
+    columns = [col['colname'] for col in table_info['columns']]
+    output = io.StringIO()
+    output.write("DROP TABLE " + table_info['tablename'] + ";" + os.linesep)
+    output.write("CREATE TABLE " + table_info['tablename'] + "(" + ', '.join(filter(None, (', '.join('%s %s' % (col['colname'], col['colinfo']) for col in table_info['columns']), table_info['constraints']))) + ") CHARACTER SET utf8 COLLATE utf8_bin;" + os.linesep)
+    output.write("INSERT INTO " + table_info['tablename'] + "(" + ', '.join(columns) + ") VALUES" + os.linesep)
+    first_one = True
+    for record in records:
+        row = ", ".join("\"" + re.escape(value) + "\"" for value in (record.distribution, record.votes, record.rank, record.title))
+        if first_one:
+            output.write("(" + row + ")")
+            first_one = False
+        else:
+            output.write(",\n(" + row + ")")
+    output.write(";\n COMMIT;")
+    return output.getvalue()
+
+
+def sqlite_compatible(script):
+    """
+    The old scripts were written for MySQL only, sqlite needs the DROP of a
+    missing table, the MySQL CREATE options and the COMMIT without BEGIN
+    removed. The rows are loaded as they were written
+    """
+    return re.sub(r"^DROP TABLE .*\n", "", script, count=1).replace(" CHARACTER SET utf8 COLLATE utf8_bin", "").replace(" COMMIT;", "")
+
+
+def new_script(records, dialect="sqlite", batch_rows=1000):
+    output = io.StringIO()
+    output.close = lambda: None
+    writer = SqlWriter(output, RatingsParser.db_table_info, dialect, batch_rows=batch_rows)
+    for record in records:
+        writer.write(record)
+    writer.close()
+    return output.getvalue()
+
+
+def timed(name, function, *args):
+    start_time = time.perf_counter()
+    result = function(*args)
+    print("%-34s %7.3f secs" % (name, time.perf_counter() - start_time))
+    return result
+
+
+def load(script):
+    with tempfile.TemporaryDirectory() as database_dir:
+        connection = sqlite3.connect(os.path.join(database_dir, "imdb.db"))
+        connection.executescript(script)
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQL writer benchmark")
+    parser.add_argument('--rows', type=int, default=20000)
+    args = parser.parse_args()
+
+    records = list(synthetic_ratings(args.rows))
+    baseline = timed("old SqlWriter script", old_script, records)
+    timed("SqlWriter mysql script", new_script, records, "mysql")
+    script = timed("SqlWriter sqlite script", new_script, records, "sqlite")
+    try:
+        load(sqlite_compatible(baseline))
+    except sqlite3.Error as e:
+        print("old script does not load: " + str(e))
+
+    plain_records = list(synthetic_ratings(args.rows, plain=True))
+    timed("sqlite load, old script", load, sqlite_compatible(old_script(plain_records)))
+    timed("sqlite load, SqlWriter script", load, new_script(plain_records, "sqlite"))
+
+
+if __name__ == "__main__":
+    main()
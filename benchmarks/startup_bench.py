@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Measures the startup cost of imdbparser.py invocations
+
+    ~/imdb-data-parser$ python3 benchmarks/startup_bench.py --runs 20
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+COMMANDS = [
+    ("interpreter only", [sys.executable, "-c", "pass"]),
+    ("--list-parsers", [sys.executable, os.path.join(ROOT, "imdbparser.py"), "--list-parsers"]),
+    ("import one parser", [sys.executable, "-c", "from idp.parser import registry; registry.get_parser_class('movies')"]),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="imdbparser.py startup benchmark")
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    for name, command in COMMANDS:
+        timings = []
+        for _ in range(args.runs):
+            start_time = time.perf_counter()
+            subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+            timings.append((time.perf_counter() - start_time) * 1000)
+        print("%-18s median %6.1f ms  min %6.1f ms" % (name, statistics.median(timings), min(timings)))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,9 +15,9 @@ You should have received a copy of the GNU General Public License
 along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-import json
 from .baseparser import *
-from .moviesparser import MoviesParser
+from .records import Credit
+from .listspec import ListSpec, Carry, split_person_name
 
 
 class ActorsParser(BaseParser):
@@ -44,6 +44,7 @@ class ActorsParser(BaseParser):
     base_matcher_pattern = '(.*?)\t+((.*? \(\S{4,}\)) ?(\(\S+\))? ?(?!\{\{SUSPENDED\}\})(\{(.*?) ?(\(\S+?\))?\})? ?(\{\{SUSPENDED\}\})?)\s*(\(.*?\))?\s*(\(.*\))?\s*(\[.*\])?\s*(<.*>)?$'
     input_file_name = "actors.list"
     number_of_lines_to_be_skipped = 239
+    header_end_pattern = rb"^THE ACTORS LIST\r?\n=+\r?\n\r?\nName[ \t]+Titles[ \t]*\r?\n-+[ \t]+-+[ \t]*\r?\n"
     db_table_info = {
         'tablename' : 'actors',
         'columns' : [
@@ -54,95 +55,15 @@ class ActorsParser(BaseParser):
             {'colname' : 'info_2', 'colinfo' : DbScriptHelper.keywords['string'] + '(127)'},
             {'colname' : 'role', 'colinfo' : DbScriptHelper.keywords['string'] + '(127)'}
         ],
-        'constraints' : 'PRIMARY KEY(title)'
-    }
-
-    json_info = {
-        'keys' : [
-            {'name': 'string'},
-            {'movie_name_year': 'string'},
-            {'movie_type': 'string'},
-            {'role': 'string'}
-        ]
+        # a title has many credits, so it is not a key
+        'constraints' : '',
+        'indexes' : ['title', 'surname, name']
     }
 
+    doc_type = "actor"
+    partitionable = True
     end_of_dump_delimiter = "-----------------------------------------------------------------------------"
 
-    name = ""
-    surname = ""
-
-    def __init__(self, preferences_map):
-        super(ActorsParser, self).__init__(preferences_map)
-        self.first_one = True
-
-    def parse_into_json(self, matcher):
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-            if(len(matcher.group(1).strip()) > 0):
-                namelist = matcher.group(1).split(', ')
-                if(len(namelist) == 2):
-                    self.name = namelist[1]
-                    self.surname = namelist[0]
-                else:
-                    self.name = namelist[0]
-                    self.surname = ""
-            #if(MoviesParser.get_movie_type(matcher.group(3), matcher.group(4)) == MoviesParser.TYPE_MOVIE):
-            json_string = self.concat_regex_groups([1,3,4,11], [1,3,4,11], matcher, "actor")
-            json_obj = json.loads(json_string)
-            json_obj['name'] = self.name + " " + self.surname
-            json_obj['movie_name'] = MoviesParser.get_movie_name(matcher.group(3))
-            json_obj['movie_type'] = MoviesParser.get_movie_type(matcher.group(3), matcher.group(4))
-            json_obj['year_released'] = MoviesParser.get_year_released(matcher.group(3))
-            self.json_file.write(json.dumps(json_obj) + "\n")
-        elif(len(matcher.get_last_string()) == 1):
-            pass
-        else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
-
-
-    def parse_into_tsv(self, matcher):
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-            if(len(matcher.group(1).strip()) > 0):
-                namelist = matcher.group(1).split(', ')
-                if(len(namelist) == 2):
-                    self.name = namelist[1]
-                    self.surname = namelist[0]
-                else:
-                    self.name = namelist[0]
-                    self.surname = ""
-                    
-            self.tsv_file.write(self.name + self.seperator + self.surname + self.seperator + self.concat_regex_groups([2,9,10,11], None, matcher) + "\n")
-        elif(len(matcher.get_last_string()) == 1):
-            pass
-        else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
-
-    def parse_into_db(self, matcher):
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-            if(len(matcher.group(1).strip()) > 0):
-                namelist = matcher.group(1).split(', ')
-                if(len(namelist) == 2):
-                    self.name = namelist[1]
-                    self.surname = namelist[0]
-                else:
-                    self.name = namelist[0]
-                    self.surname = ""
-            
-            if(self.first_one):
-                self.sql_file.write("(\"" + self.name + "\", \"" + self.surname + "\", " + self.concat_regex_groups([2,9,10,11], [2,3,4,5], matcher) + ")")
-                self.first_one = False;
-            else:
-                self.sql_file.write(",\n(\"" + self.name + "\", \"" + self.surname + "\", " + self.concat_regex_groups([2,9,10,11], [2,3,4,5], matcher) + ")")  
-
-        elif(len(matcher.get_last_string()) == 1):
-            pass
-        else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
+    # the person is only on the first line of a block, it is carried over to the following lines
+    row_spec = ListSpec(base_matcher_pattern, Credit, ('name', 'surname', 2, 3, 4, 9, 10, 11),
+                        carry=Carry(1, ('name', 'surname'), split_person_name), skip_blank=True)
@@ -0,0 +1,210 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Aggregates updated while a list is parsed
+
+An AggregateHook passes each written record to its aggregates and writes
+their results to <list>.aggregates.json when the list is parsed, so counts
+like titles per year or the most credited persons need no second pass over
+the outputs. The aggregates of each list are made by the factories in
+AGGREGATES, other aggregates are plugged in by replacing or wrapping them:
+
+    AGGREGATES["ratings"] = lambda: [Count("votes_over_1000", ("votes",), key=lambda votes: int(votes) > 1000)]
+"""
+
+import heapq
+import json
+from functools import lru_cache
+from operator import attrgetter
+from .moviesparser import MoviesParser
+
+# titles have many credits, genres and episodes, so the year and type of
+# recent titles are kept instead of matching the title again for each record
+TITLE_CACHE_SIZE = 1 << 16
+
+
+class Aggregate(object):
+    """
+    name: key of the result in the summary file
+    attributes: record attributes the aggregate reads
+    key: optional function of the attribute values, by default the value of
+        a single attribute or the tuple of several
+    """
+
+    def __init__(self, name, attributes, key=None):
+        self.name = name
+        self.attributes = tuple(attributes)
+        getter = attrgetter(*self.attributes)
+        if key is None:
+            self.key = getter
+        elif len(self.attributes) == 1:
+            self.key = lambda record: key(getter(record))
+        else:
+            self.key = lambda record: key(*getter(record))
+
+
+class Count(Aggregate):
+    """
+    Number of records per key, e.g. titles per year
+    """
+
+    def __init__(self, name, attributes, key=None):
+        super(Count, self).__init__(name, attributes, key)
+        self.counts = {}
+
+    def add(self, record):
+        key = self.key(record)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def result(self):
+        return dict((str(key), count) for key, count in sorted(self.counts.items(), key=lambda item: str(item[0])))
+
+
+class TopK(Aggregate):
+    """
+    The k records with the largest values, key returns the (value, label) of
+    a record. A heap of k items is kept
+    """
+
+    def __init__(self, name, attributes, k, key):
+        super(TopK, self).__init__(name, attributes, key)
+        self.k = k
+        self.heap = []
+
+    def add(self, record):
+        item = self.key(record)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, item)
+        elif item > self.heap[0]:
+            heapq.heapreplace(self.heap, item)
+
+    def result(self):
+        return [[label, value] for value, label in sorted(self.heap, reverse=True)]
+
+
+class TopRuns(Aggregate):
+    """
+    The k keys with the most records in a row, e.g. the persons with the most
+    credits in lists where the credits of a person are consecutive. Runs are
+    counted as they end and the longest k are kept in a heap
+    """
+
+    def __init__(self, name, attributes, k, key=None):
+        super(TopRuns, self).__init__(name, attributes, key)
+        self.k = k
+        self.heap = []
+        self.runs = 0
+        self.current = None
+        self.length = 0
+
+    def add(self, record):
+        key = self.key(record)
+        if key == self.current and self.length:
+            self.length += 1
+            return
+        self.end_run()
+        self.current = key
+        self.length = 1
+
+    def end_run(self):
+        if not self.length:
+            return
+        self.runs += 1
+        item = (self.length, str(self.current))
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, item)
+        elif item > self.heap[0]:
+            heapq.heapreplace(self.heap, item)
+        self.length = 0
+
+    def result(self):
+        self.end_run()
+        return {"runs": self.runs, "top": [[key, length] for length, key in sorted(self.heap, reverse=True)]}
+
+
+def person_name(name, surname):
+    return surname + ", " + name if surname else name
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def title_year(full_name):
+    """ year_released of a title """
+    return MoviesParser.get_year_released(full_name)
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def title_type(full_name, type):
+    """ movie_type of a title """
+    return MoviesParser.get_movie_type(full_name, type)
+
+
+def credit_aggregates():
+    return [
+        Count("credits_per_year", ("full_name",), key=title_year),
+        Count("credits_per_type", ("full_name", "type"), key=title_type),
+        TopRuns("most_credited", ("name", "surname"), 100, key=person_name)
+    ]
+
+
+AGGREGATES = {
+    "movies": lambda: [Count("titles_per_year", ("full_name",), key=title_year), Count("titles_per_type", ("full_name", "type"), key=title_type)],
+    "actors": credit_aggregates,
+    "actresses": credit_aggregates,
+    "directors": credit_aggregates,
+    "genres": lambda: [Count("titles_per_genre", ("genre",))],
+    "ratings": lambda: [
+        Count("rank_histogram", ("rank",), key=lambda rank: rank.split(".")[0]),
+        Count("titles_per_year", ("full_name",), key=title_year),
+        TopK("most_votes", ("votes", "title"), 100, key=lambda votes, title: (int(votes), title))
+    ]
+}
+
+
+class AggregateHook(object):
+    """
+    Record hook that updates the aggregates and writes their results and the
+    number of records to path when it is closed
+    """
+
+    def __init__(self, path, aggregates):
+        self.path = path
+        self.aggregates = aggregates
+        self.records = 0
+        self.adds = [aggregate.add for aggregate in aggregates]
+        self.attributes = tuple(attribute for aggregate in aggregates for attribute in aggregate.attributes)
+
+    def add(self, record):
+        self.records += 1
+        for add in self.adds:
+            add(record)
+
+    def close(self):
+        summary = {"records": self.records}
+        for aggregate in self.aggregates:
+            summary[aggregate.name] = aggregate.result()
+        with open(self.path, "w", encoding='utf-8') as summary_file:
+            json.dump(summary, summary_file, indent=1)
+            summary_file.write("\n")
+
+
+def aggregate_hook(list_name, path):
+    """
+    Returns the AggregateHook of a list, lists without aggregates only count their records
+    """
+    factory = AGGREGATES.get(list_name)
+    return AggregateHook(path, factory() if factory is not None else [])
@@ -0,0 +1,75 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Parsers of aka-names.list and aka-titles.list, generated from their specs
+
+Both lists are blocks of a name or title line followed by indented
+"(aka ...)" lines, every aka line is a record.
+"""
+
+from ..utils.dbscripthelper import DbScriptHelper
+from .listspec import ListSpec, Carry, split_person_name, spec_parser_class
+from .records import AkaName, AkaTitle
+
+# group 1: (\S.*?)    surname, name
+# group 2: (.*)       other name
+AKA_NAMES_SPEC = ListSpec(r"^(?:(\S.*?)|\s+\(aka (.*)\))\s*$", AkaName, ('name', 'surname', 2),
+                          carry=Carry(1, ('name', 'surname'), split_person_name), require=2, skip_blank=True)
+
+AkaNamesParser = spec_parser_class("AkaNamesParser", __name__, AKA_NAMES_SPEC,
+    input_file_name="aka-names.list",
+    # lines before the header only set the person, they yield no records
+    number_of_lines_to_be_skipped=0,
+    header_end_pattern=rb"^AKA NAMES LIST\r?\n=+\r?\n",
+    db_table_info={
+        'tablename' : 'aka_names',
+        'columns' : [
+            {'colname' : 'name', 'colinfo' : DbScriptHelper.keywords['string'] + '(127)'},
+            {'colname' : 'surname', 'colinfo' : DbScriptHelper.keywords['string'] + '(127)'},
+            {'colname' : 'aka_name', 'colinfo' : DbScriptHelper.keywords['string'] + '(255)'}
+        ],
+        'constraints' : '',
+        'indexes' : ['surname, name']
+    },
+    doc_type="aka_name",
+    end_of_dump_delimiter=""
+)
+
+# group 1: (\S.*?)    #TITLE
+# group 2: (.*?)      other title
+# group 3: (.*?)      info ex: (USA) (working title)
+AKA_TITLES_SPEC = ListSpec(r"^(?:(\S.*?)|\s+\(aka (.*?)\)(?:\t+(.*?))?)\s*$", AkaTitle, ('title', 2, 3),
+                           carry=Carry(1, ('title',)), require=2, skip_blank=True)
+
+AkaTitlesParser = spec_parser_class("AkaTitlesParser", __name__, AKA_TITLES_SPEC,
+    input_file_name="aka-titles.list",
+    number_of_lines_to_be_skipped=0,
+    header_end_pattern=rb"^AKA TITLES LIST\r?\n=+\r?\n",
+    db_table_info={
+        'tablename' : 'aka_titles',
+        'columns' : [
+            {'colname' : 'title', 'colinfo' : DbScriptHelper.keywords['string'] + '(255) NOT NULL'},
+            {'colname' : 'aka_title', 'colinfo' : DbScriptHelper.keywords['string'] + '(255)'},
+            {'colname' : 'info', 'colinfo' : DbScriptHelper.keywords['string'] + '(127)'}
+        ],
+        'constraints' : '',
+        'indexes' : ['title']
+    },
+    doc_type="aka_title",
+    end_of_dump_delimiter=""
+)
@@ -0,0 +1,180 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from idp import settings
+from .parsinghelper import ParsingHelper
+
+
+def parse_list(item, preferences_map, gzip_path=None):
+    """
+    Runs in a worker process: extracts a freshly downloaded list if needed and parses it.
+    Returns True if the list was parsed, see ParsingHelper.parse_one
+    """
+    if gzip_path is not None:
+        from ..utils.filehandler import FileHandler
+        if FileHandler.extract(gzip_path) != 0:
+            return False
+    return ParsingHelper.parse_one(item, preferences_map)
+
+
+class StageStats(object):
+    """
+    Time a stage spent doing work versus waiting on its neighbours
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.working = 0.0
+        self.waiting = 0.0
+        self.items = 0
+
+    async def wait(self, awaitable):
+        start_time = time.monotonic()
+        try:
+            return await awaitable
+        finally:
+            self.waiting += time.monotonic() - start_time
+
+    async def work(self, awaitable):
+        start_time = time.monotonic()
+        try:
+            return await awaitable
+        finally:
+            self.working += time.monotonic() - start_time
+
+    def __str__(self):
+        return "%s: %d items, working %.2f secs, waiting %.2f secs" % (self.name, self.items, self.working, self.waiting)
+
+
+class AsyncParsingHelper(object):
+    """
+    Runs download, parse and load stages concurrently
+
+    Lists are downloaded with asyncio streams, parsed in a process pool and
+    optionally loaded by a shell command. Stages are connected by bounded
+    queues, so downloads never run more than queue_size lists ahead of the
+    parsers and parsers never run ahead of a slow loader.
+
+    load_command is formatted with {list}, {mode} and {output_dir}, e.g.
+        "mysql imdb < {output_dir}/{list}.list.sql"
+    """
+
+    def __init__(self, preferences_map, lists=None, update_lists=False, workers=None, load_command=None, queue_size=2):
+        self.preferences_map = preferences_map
+        self.lists = list(settings.LISTS if lists is None else lists)
+        self.update_lists = update_lists
+        self.workers = workers or os.cpu_count() or 1
+        self.load_command = load_command
+        self.queue_size = queue_size
+        self.parse_function = parse_list
+        self.stats = [StageStats("download"), StageStats("parse"), StageStats("load")]
+        self.tasks = []
+        self.executor = None
+
+    async def download(self, item):
+        """
+        Returns the path of the downloaded .gz file or None if nothing was downloaded
+        """
+        if not self.update_lists:
+            return None
+        from ..utils import listdownloader
+        return await listdownloader.download_async(item)
+
+    async def load(self, item):
+        command = self.load_command.format(list=item, mode=self.preferences_map['mode'], output_dir=self.preferences_map['output_dir'])
+        process = await asyncio.create_subprocess_shell(command)
+        if await process.wait() != 0:
+            logging.error("Load command failed for item: " + item + "\n\tCommand is: " + command)
+
+    async def _download_stage(self, parse_queue):
+        stats = self.stats[0]
+        for item in self.lists:
+            try:
+                gzip_path = await stats.work(self.download(item))
+            except (OSError, EOFError) as e:
+                logging.error("There is a problem when downloading list " + item + "\n\t" + str(e))
+                continue
+            stats.items += 1
+            await stats.wait(parse_queue.put((item, gzip_path)))
+        for _ in range(self.workers):
+            await stats.wait(parse_queue.put(None))
+
+    async def _parse_stage(self, parse_queue, load_queue):
+        stats = self.stats[1]
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await stats.wait(parse_queue.get())
+            if job is None:
+                break
+            item, gzip_path = job
+            result = await stats.work(loop.run_in_executor(self.executor, self.parse_function, item, self.preferences_map, gzip_path))
+            stats.items += 1
+            # a failed parse leaves partial or no outputs, they are not loaded
+            if result and load_queue is not None:
+                await stats.wait(load_queue.put(item))
+
+    async def _load_stage(self, load_queue):
+        stats = self.stats[2]
+        while True:
+            item = await stats.wait(load_queue.get())
+            if item is None:
+                break
+            await stats.work(self.load(item))
+            stats.items += 1
+
+    async def run(self):
+        parse_queue = asyncio.Queue(self.queue_size)
+        load_queue = asyncio.Queue(self.queue_size) if self.load_command else None
+        self.executor = ProcessPoolExecutor(self.workers)
+        try:
+            self.tasks = [asyncio.ensure_future(self._download_stage(parse_queue))]
+            self.tasks += [asyncio.ensure_future(self._parse_stage(parse_queue, load_queue)) for _ in range(self.workers)]
+            producers = list(self.tasks)
+            if load_queue is not None:
+                self.tasks.append(asyncio.ensure_future(self._load_stage(load_queue)))
+            await asyncio.gather(*producers)
+            if load_queue is not None:
+                await load_queue.put(None)
+                await self.tasks[-1]
+        except BaseException:
+            self.cancel()
+            raise
+        finally:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            for stats in self.stats:
+                logging.info(str(stats))
+
+    def cancel(self):
+        """
+        Cancels every stage, lists that are already being parsed are finished by their worker
+        """
+        for task in self.tasks:
+            task.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def parse_all(preferences_map, **kwargs):
+        helper = AsyncParsingHelper(preferences_map, **kwargs)
+        asyncio.run(helper.run())
+        logging.info("All parsing finished.")
+        return helper.stats
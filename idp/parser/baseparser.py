@@ -16,14 +16,19 @@ along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import re
+import os.path
+import sys
 import logging
-import json
 import time
 from abc import *
 from ..utils.filehandler import FileHandler
 from ..utils.regexhelper import RegExHelper
 from ..utils.decorators import duration_logged
 from ..utils.dbscripthelper import DbScriptHelper
+from ..utils.recordwriters import TsvWriter, JsonWriter, SqlWriter, CopyWriter
+from ..utils import headerscanner
+from ..utils.rejectsink import RejectSink
+from ..utils.memorybudget import MemoryBudget
 
 
 class BaseParser(metaclass=ABCMeta):
@@ -34,42 +39,284 @@ class BaseParser(metaclass=ABCMeta):
     must be implemented by any Parser class
 
     Implementing classes' responsibilities are as follows:
-    * Implement parse_into_tsv function
-    * Implement parse_into_db function
-    * Calculate fuckedUpCount and store in self.fuckedUpCount
+    * Define row_spec, a ListSpec of the line format (see listspec.py), or
+      implement parse_record function which turns a line into a record
+      (see records.py) or returns None when the line holds no record
+    * Call self.reject for lines that cannot be parsed in parse_record
     * Define following properties:
-        - baseMatcherPattern
-        - inputFileName
-        - numberOfLinesToBeSkipped
-        - scripts
+        - base_matcher_pattern
+        - input_file_name
+        - number_of_lines_to_be_skipped
+        - header_end_pattern (optional)
+        - db_table_info
+        - end_of_dump_delimiter
+        - doc_type
     """
 
     seperator = "\t" #TODO: get from settings
 
-    def __init__(self, preferences_map):
-        self.mode = preferences_map['mode']
+    # regular expression (bytes) matching the end of the list's header, the data starts right after it.
+    # number_of_lines_to_be_skipped is used when it's None or the header is not recognized
+    header_end_pattern = None
+
+    # ListSpec of single line formats, compiled into parse_line
+    row_spec = None
+
+    # True for parsers whose records carry a title type and year, see PartitionedSink
+    partitionable = False
+
+    # lines between memory checks, see MemoryBudget
+    memory_check_interval = 10000
+
+    # columns worked out from the titles of partitionable parsers' records, see TitleRecord
+    title_columns = [
+        {'colname' : 'movie_name', 'colinfo' : DbScriptHelper.keywords['string'] + '(255)'},
+        {'colname' : 'movie_type', 'colinfo' : DbScriptHelper.keywords['string'] + '(20)'},
+        {'colname' : 'year_released', 'colinfo' : DbScriptHelper.keywords['string'] + '(4)'}
+    ]
+
+    def __init__(self, preferences_map, input_file=None):
+        """
+        input_file: optional already opened list, e.g. a download stream.
+            By default the list is looked up in the input directory
+        Without a mode the parser has no outputs, its records are read with
+        records(), see recordreader.iter_records
+        """
+        self.mode = preferences_map.get('mode')
         self.filehandler = FileHandler(self.input_file_name, preferences_map)
-        self.input_file = self.filehandler.get_input_file()
-        self.log_file = self.filehandler.get_log_file()
+        if input_file is None:
+            input_file = self.filehandler.get_input_file()
+        self.input_file = input_file
+        output_dir = preferences_map.get('output_dir')
+        if output_dir is not None:
+            self.log_file = self.filehandler.get_log_file()
+        # only records whose title is in it are written, see ParsingHelper.build_title_filter
+        self.title_filter = preferences_map.get('title_filter')
+        if self.title_filter is not None and not self.has_titles():
+            logging.info("The title filter is not applied to " + self.input_file_name + ", its records have no title")
+            self.title_filter = None
+        self.rejects = RejectSink(self.filehandler.rejects_path() if output_dir is not None else None, self.input_file_name, preferences_map.get('max_reject_ratio'))
+        # columns of the --columns option, None for all columns
+        self.selected_columns = None
+        columns = (preferences_map.get('columns') or {}).get(self.list_name())
+        if columns:
+            self.selected_columns = self.select_columns(columns)
+        # objects with add(record) and close() that see every written record,
+        # e.g. indexes built during the parse. They write next to the outputs
+        self.hooks = self.create_hooks(preferences_map) if output_dir is not None else []
+        if self.row_spec is not None:
+            row_spec = self.row_spec
+            if self.selected_columns is not None:
+                row_spec = row_spec.project(self.record_attributes(preferences_map))
+            self.parse_line = row_spec.row_function(self.reject_line)
+        self.writer = self.create_writer(preferences_map) if self.mode is not None else None
+
+        # buffers of the writer and the reject sink are flushed when memory runs low
+        self.memory = MemoryBudget(preferences_map.get('memory_limit'), name=self.input_file_name)
+        for buffered in (self.writer, self.rejects):
+            if hasattr(buffered, 'shrink'):
+                self.memory.register(buffered.shrink)
+
+    def create_writer(self, preferences_map):
+        partitioning = preferences_map.get('partitioning')
+        if partitioning and not self.partitionable:
+          logging.info(self.input_file_name + " has no title types and years, it is not partitioned")
+        elif partitioning and self.mode in ("TSV", "JSON"):
+          return self.partitioned_writer(partitioning)
 
         if (self.mode == "TSV"):
-          self.tsv_file = self.filehandler.get_tsv_file()
+          return TsvWriter(self.filehandler.get_tsv_file(), self.columns(), self.seperator)
         elif (self.mode == "JSON"):
-          self.json_file = self.filehandler.get_json_file()
+          return JsonWriter(self.filehandler.get_json_file(), self.doc_type, self.json_columns())
         elif (self.mode == "SQL"):
-          self.sql_file = self.filehandler.get_sql_file()
-          self.scripthelper = DbScriptHelper(self.db_table_info)
-          self.sql_file.write(self.scripthelper.scripts['drop'])
-          self.sql_file.write(self.scripthelper.scripts['create'])
-          self.sql_file.write(self.scripthelper.scripts['insert'])
-
-    @abstractmethod
-    def parse_into_tsv(self, matcher):
-        raise NotImplemented
-
-    @abstractmethod
-    def parse_into_db(self, matcher):
-        raise NotImplemented
+          return SqlWriter(self.filehandler.get_sql_file(), self.table_info(), preferences_map.get('sql_dialect') or "mysql", preferences_map.get('sql_copy', False))
+        elif (self.mode == "COPY" and preferences_map.get('pipe')):
+          # the table scripts have no place in a pipe, they are written by COPY runs to files
+          return CopyWriter(self.filehandler.get_copy_file(), self.table_info())
+        elif (self.mode == "COPY"):
+          return CopyWriter(self.filehandler.get_copy_file(), self.table_info(), open(self.filehandler.create_sql_path(), "w", encoding='utf-8'), open(self.filehandler.post_load_sql_path(), "w", encoding='utf-8'))
+        else:
+          raise NotImplementedError("Mode: " + self.mode)
+
+    def create_hooks(self, preferences_map):
+        """
+        Returns the record hooks of the parser, parsers add their own.
+        A hook's attributes are the record attributes it reads
+        """
+        hooks = []
+        if preferences_map.get('aggregates'):
+            from .aggregates import aggregate_hook
+            hooks.append(aggregate_hook(self.list_name(), self.filehandler.aggregates_path()))
+        if preferences_map.get('profile'):
+            from .profiler import ProfileHook
+            hooks.append(ProfileHook(self.filehandler.profile_path(), self.table_info()))
+        return hooks
+
+    def partitioned_writer(self, partitioning):
+        """
+        Returns a PartitionedSink writing records to type=<type>/year=<year>/
+        directories, partitioning holds the optional 'filter' expression and
+        'max_open_files'
+        """
+        from ..utils.partitionedsink import PartitionedSink, compile_filter
+        if self.mode == "TSV":
+            file_name = os.path.basename(self.filehandler.tsv_path())
+            make_writer = lambda output_file: TsvWriter(output_file, self.columns(), self.seperator)
+        else:
+            file_name = os.path.basename(self.filehandler.json_path())
+            make_writer = lambda output_file: JsonWriter(output_file, self.doc_type, self.json_columns())
+        expression = partitioning.get('filter')
+        accept = compile_filter(expression) if expression else None
+        return PartitionedSink(self.filehandler.preferences_map['output_dir'], file_name, make_writer, accept, partitioning.get('max_open_files') or 64)
+
+    def parse_record(self, matcher):
+        """
+        Parsers without a row_spec implement this
+        """
+        if self.row_spec is None:
+            raise NotImplementedError(type(self).__name__ + " has neither a row_spec nor parse_record")
+        return self.parse_line(matcher.get_last_string())
+
+    def parse_line(self, line):
+        """
+        Turns a line into a record or None, replaced by the compiled row
+        function of row_spec if there is one
+        """
+        return self.parse_record(RegExHelper(line))
+
+    @classmethod
+    def find_data_offset(cls, path):
+        """
+        Returns the offset of the first data line of a list file or None if the
+        header is not recognized. Offsets of .gz files are in uncompressed bytes
+        """
+        import gzip
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rb") as list_file:
+            return headerscanner.find_data_offset(list_file.read(headerscanner.HEADER_SCAN_LIMIT), cls.header_end_pattern)
+
+    def finish(self):
+        """
+        Called after the last line, returns the record that is still being
+        assembled by parsers of multi-line records, if any
+        """
+        return None
+
+    def observed(self, write, hooks):
+        """
+        Wraps write so that the hooks see each written record
+        """
+        adds = [hook.add for hook in hooks]
+        def write_observed(record):
+            write(record)
+            for add in adds:
+                add(record)
+        return write_observed
+
+    def filtered(self, write, title_filter):
+        """
+        Wraps write so that records of titles not in title_filter are dropped.
+        Credit titles keep the spaces before their info and role, titles of
+        the filter have none
+        """
+        def write_filtered(record):
+            if record.title.rstrip() in title_filter:
+                write(record)
+            else:
+                self.filtered_count += 1
+        return write_filtered
+
+    @classmethod
+    def has_titles(cls):
+        """
+        Whether the records of the list have a #TITLE, lists of persons like
+        aka-names.list have none
+        """
+        return cls.row_spec is None or 'title' in cls.row_spec.record_class.__slots__
+
+    @classmethod
+    def list_name(cls):
+        """
+        Name of the list, e.g. actors, as in settings.LISTS
+        """
+        return cls.input_file_name[:-len(".list")]
+
+    @classmethod
+    def available_columns(cls):
+        """
+        Column infos of the table columns and, for lists of titles, the
+        columns worked out from the titles
+        """
+        if cls.partitionable:
+            return cls.db_table_info['columns'] + cls.title_columns
+        return cls.db_table_info['columns']
+
+    @classmethod
+    def select_columns(cls, names):
+        """
+        Returns the column infos of the named columns in the given order,
+        raises ValueError for names that are not available
+        """
+        available = dict((col['colname'], col) for col in cls.available_columns())
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValueError("%s has no columns %s, available: %s" % (cls.input_file_name, ", ".join(unknown), ", ".join(available)))
+        return [available[name] for name in names]
+
+    def table_info(self):
+        """
+        db_table_info of the selected columns, constraints and indexes on
+        columns that are not selected are left out
+        """
+        if self.selected_columns is None:
+            return self.db_table_info
+        names = set(col['colname'] for col in self.selected_columns)
+        covered = lambda expression: all(name.strip() in names for name in expression.split(","))
+        constraints = self.db_table_info['constraints']
+        if constraints and not covered(constraints[constraints.index("(") + 1:constraints.rindex(")")]):
+            constraints = ''
+        return {
+            'tablename' : self.db_table_info['tablename'],
+            'columns' : self.selected_columns,
+            'constraints' : constraints,
+            'indexes' : [index for index in self.db_table_info.get('indexes', []) if covered(index)]
+        }
+
+    def columns(self):
+        """
+        Output columns, they are the attributes of the records with the same names
+        """
+        return [col['colname'] for col in self.table_info()['columns']]
+
+    def json_columns(self):
+        """
+        Fields of JSON documents, None for the documents of to_json
+        """
+        return self.columns() if self.selected_columns is not None else None
+
+    def record_attributes(self, preferences_map):
+        """
+        Record attributes needed for the selected columns, the partitions and
+        the title filter, the parsers leave the others empty
+        """
+        attributes = set(self.columns())
+        for hook in self.hooks:
+            attributes.update(hook.attributes)
+        if attributes.intersection(col['colname'] for col in self.title_columns) or preferences_map.get('partitioning'):
+            attributes.update(('full_name', 'type'))
+        if self.title_filter is not None:
+            attributes.add('title')
+        return attributes
+
+    def reject(self, matcher):
+        """
+        Records a line that cannot be parsed in the reject file of the list
+        """
+        self.reject_line(matcher.get_last_string())
+
+    def reject_line(self, line):
+        self.fucked_up_count += 1
+        self.rejects.reject(line, self.header_lines + self.processed_lines, self.line_offset, self.processed_lines)
 
     @duration_logged
     def start_processing(self):
@@ -77,86 +324,90 @@ class BaseParser(metaclass=ABCMeta):
         Actual parsing and generation of scripts (tsv & sql) are done here.
         '''
 
+        self.filtered_count = 0
+        write = self.writer.write
+        if self.hooks:
+            write = self.observed(write, self.hooks)
+        title_filter = self.title_filter
+        if title_filter is not None:
+            write = self.filtered(write, title_filter)
+
+        records = self.records()
+        try:
+            for record in records:
+                write(record)
+        finally:
+            records.close()
+            self.writer.close()
+        for hook in self.hooks:
+            hook.close()
+
+        # fuckedUpCount is calculated in implementing class
+        logging.info("Finished with " + str(self.fucked_up_count) + " fucked up line")
+        self.memory.check()
+        self.memory.report()
+        if title_filter is not None:
+            logging.info("Dropped " + str(self.filtered_count) + " records of titles not in the title filter")
+
+    def records(self):
+        """
+        Yields the records of the list one by one, the input and the reject
+        file are closed when the generator ends or is closed
+        """
         self.fucked_up_count = 0
-        counter = 0
         number_of_processed_lines = 0
         start_time = time.time()
+        parse_line = self.parse_line
+        memory = self.memory
+        memory_check_interval = self.memory_check_interval
 
-        for line in self.input_file : #assuming the file is opened in the subclass before here
-            if(number_of_processed_lines >= self.number_of_lines_to_be_skipped):
+        try:
+            self.input_file, self.data_offset, self.header_lines = headerscanner.skip_header(self.input_file, self.header_end_pattern, self.number_of_lines_to_be_skipped)
+            logging.info("Data starts at offset: " + str(self.data_offset))
+            offset = self.data_offset
+
+            for line in self.input_file : #assuming the file is opened in the subclass before here
                 #end of data
                 if(self.end_of_dump_delimiter != "" and self.end_of_dump_delimiter in line):
                     break
 
-                matcher = RegExHelper(line)
-
-                if(self.mode == "TSV"):
-                    '''
-                    give the matcher directly to implementing class
-                     and let it decide what to do when regEx is matched and unmatched
-                    '''
-                    self.parse_into_tsv(matcher)
-                elif(self.mode == "JSON"):
-                    self.parse_into_json(matcher)
-                elif(self.mode == "SQL"):
-                    self.parse_into_db(matcher)
-                else:
-                    raise NotImplemented("Mode: " + self.mode)
-
-            number_of_processed_lines +=  1
-
-            if(number_of_processed_lines%50000 == 0):
-                end_time = time.time()
-                time_taken = end_time - start_time
-                print("File name: %s \t Lines processed: %d \t Elapsed time: %d secs" % (self.input_file_name, number_of_processed_lines, time_taken))
-
-            #print("Processed lines: %d\r" % (number_of_processed_lines), end="")
-
-        self.input_file.close()
-
-        if(self.mode == "SQL"):
-            self.sql_file.write(";\n COMMIT;")
-            self.sql_file.close()
-
-        if 'outputFile' in locals():
-            self.output_file.flush()
-            self.output_file.close()
-
-        # fuckedUpCount is calculated in implementing class
-        logging.info("Finished with " + str(self.fucked_up_count) + " fucked up line")
-
-    def concat_regex_groups(self, group_list, col_list, matcher, doc_type):
-        ret_val = ""
-
-        if self.mode == "TSV":
-            ret_val = self.seperator.join('%s' % (matcher.group(i)) for i in group_list)
-        elif self.mode == "JSON":
-            ret_obj = {"doc_type": doc_type}
-            cnt = 0
-            
-            for i in group_list:
-                key = list(self.json_info['keys'][cnt].keys())[0]
-                key_type = list(self.json_info['keys'][cnt].values())[0]
-
-                if key_type == 'string':
-                    value = str(matcher.group(i))
-                elif key_type == 'int':
-                    value = int(matcher.group(i))
-                elif key_type == 'float':
-                    value = float(matcher.group(i))
-
-                ret_obj[key] = value
-                ret_val = json.dumps(ret_obj)
-                cnt += 1
-        else:
-            for i in range(len(group_list)):
-                if DbScriptHelper.keywords['string'] in self.db_table_info['columns'][col_list[i]]['colinfo']:
-                    ret_val += "\"" + re.escape(matcher.group(group_list[i])) + "\", "
-                else:
-                    ret_val += matcher.group(group_list[i]) + ", "
-            ret_val = ret_val[:-2]
-        
-        return ret_val
+                number_of_processed_lines +=  1
+                # position of the current line, for reject
+                self.processed_lines = number_of_processed_lines
+                self.line_offset = offset
+                offset += len(line)
+
+                record = parse_line(line)
+                if record is not None:
+                    yield record
+
+                if(number_of_processed_lines%memory_check_interval == 0):
+                    memory.check()
+
+                if(number_of_processed_lines%50000 == 0):
+                    end_time = time.time()
+                    time_taken = end_time - start_time
+                    # stdout may carry the output, see pipeoutput.py
+                    print("File name: %s \t Lines processed: %d \t Elapsed time: %d secs" % (self.input_file_name, number_of_processed_lines, time_taken), file=sys.stderr)
+
+                #print("Processed lines: %d\r" % (number_of_processed_lines), end="")
+
+            record = self.finish()
+            if record is not None:
+                yield record
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Closes the input and the reject file, also when records() was not started
+        """
+        try:
+            self.input_file.close()
+        except ValueError:
+            # detached by a header scan that failed, which closed the input
+            pass
+        self.rejects.close()
 
     ##### Below methods force associated properties to be defined in any derived class #####
 
@@ -179,3 +430,7 @@ class BaseParser(metaclass=ABCMeta):
     @abstractproperty
     def end_of_dump_delimiter(self):
         raise NotImplemented
+
+    @abstractproperty
+    def doc_type(self):
+        raise NotImplemented
@@ -0,0 +1,223 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Person-title graph of actors.list and actresses.list in CSR arrays
+
+Persons and titles get integer ids in the order they are first seen. The
+titles of person p are person_titles[person_indptr[p]:person_indptr[p + 1]]
+and the persons of title t are title_persons[title_indptr[t]:title_indptr[t + 1]].
+The arrays are saved with numpy.save and can be loaded memory mapped, the
+names of the ids are saved one per line in persons.txt and titles.txt.
+
+numpy is needed for building and loading graphs, it is imported lazily.
+"""
+
+import logging
+import os
+from array import array
+
+ARRAY_NAMES = ('person_indptr', 'person_titles', 'title_indptr', 'title_persons')
+
+
+def person_name(name, surname):
+    """ the "Surname, Name" form of the lists """
+    return surname + ", " + name if surname else name
+
+
+def _csr(numpy, sources, targets, size):
+    """
+    Returns the indptr and indices arrays of the edges sources[i] -> targets[i]
+    """
+    indptr = numpy.zeros(size + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(sources, minlength=size), out=indptr[1:])
+    return indptr, targets[numpy.argsort(sources, kind='stable')]
+
+
+def _neighbours(numpy, indptr, indices, nodes):
+    """
+    Returns the edges of nodes as (sources, targets) arrays
+    """
+    starts = indptr[nodes]
+    lengths = indptr[nodes + 1] - starts
+    # the position of an edge is the start of its node plus its rank among the node's edges
+    ends = numpy.cumsum(lengths)
+    positions = numpy.repeat(starts - ends + lengths, lengths) + numpy.arange(ends[-1] if len(ends) else 0)
+    return numpy.repeat(nodes, lengths), indices[positions]
+
+
+class CreditGraph(object):
+    """
+    Bipartite graph of persons and the titles they are credited in
+    """
+
+    def __init__(self, persons, titles, person_indptr, person_titles, title_indptr, title_persons):
+        self.persons = persons
+        self.titles = titles
+        self.person_indptr = person_indptr
+        self.person_titles = person_titles
+        self.title_indptr = title_indptr
+        self.title_persons = title_persons
+        self.person_ids = None
+
+    @classmethod
+    def from_credits(cls, credits):
+        """
+        credits: iterable of (person, title) pairs
+        """
+        import numpy
+        person_ids = {}
+        title_ids = {}
+        edge_persons = array('i')
+        edge_titles = array('i')
+        for person, title in credits:
+            edge_persons.append(person_ids.setdefault(person, len(person_ids)))
+            edge_titles.append(title_ids.setdefault(title, len(title_ids)))
+
+        sources = numpy.frombuffer(edge_persons, dtype=numpy.int32)
+        targets = numpy.frombuffer(edge_titles, dtype=numpy.int32)
+        person_indptr, person_titles = _csr(numpy, sources, targets, len(person_ids))
+        title_indptr, title_persons = _csr(numpy, targets, sources, len(title_ids))
+        return cls(list(person_ids), list(title_ids), person_indptr, person_titles, title_indptr, title_persons)
+
+    def save(self, directory):
+        import numpy
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAY_NAMES:
+            numpy.save(os.path.join(directory, name + ".npy"), getattr(self, name))
+        for name in ('persons', 'titles'):
+            with open(os.path.join(directory, name + ".txt"), "w", encoding='utf-8') as names_file:
+                names_file.writelines(value + "\n" for value in getattr(self, name))
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """
+        Loads a saved graph, the arrays are memory mapped unless mmap_mode is None
+        """
+        import numpy
+        names = []
+        for name in ('persons', 'titles'):
+            with open(os.path.join(directory, name + ".txt"), encoding='utf-8') as names_file:
+                names.append(names_file.read().splitlines())
+        arrays = [numpy.load(os.path.join(directory, name + ".npy"), mmap_mode=mmap_mode) for name in ARRAY_NAMES]
+        return cls(names[0], names[1], *arrays)
+
+    def person_id(self, person):
+        """
+        Returns the id of a person in "Surname, Name" form, raises KeyError for unknown persons
+        """
+        if self.person_ids is None:
+            self.person_ids = dict((name, person_id) for person_id, name in enumerate(self.persons))
+        return self.person_ids[person]
+
+    def titles_of(self, person_id):
+        return self.person_titles[self.person_indptr[person_id]:self.person_indptr[person_id + 1]]
+
+    def persons_of(self, title_id):
+        return self.title_persons[self.title_indptr[title_id]:self.title_indptr[title_id + 1]]
+
+    def search(self, source, target=None, max_depth=None):
+        """
+        Breadth first search from person source, each level expands the whole
+        frontier with array operations. Stops at the level target is reached
+        if there is a target.
+
+        Returns (depths, person_parents, title_parents): the number of titles
+        between source and each person (-1 if not reached), the title through
+        which each person was reached and the person through which each title
+        was reached
+        """
+        import numpy
+        depths = numpy.full(len(self.persons), -1, dtype=numpy.int32)
+        person_parents = numpy.full(len(self.persons), -1, dtype=numpy.int32)
+        title_parents = numpy.full(len(self.titles), -1, dtype=numpy.int32)
+        title_seen = numpy.zeros(len(self.titles), dtype=bool)
+        depths[source] = 0
+        frontier = numpy.array([source], dtype=numpy.int64)
+        depth = 0
+        while len(frontier) and (max_depth is None or depth < max_depth) and (target is None or depths[target] < 0):
+            persons, titles = _neighbours(numpy, self.person_indptr, self.person_titles, frontier)
+            new = ~title_seen[titles]
+            titles, first = numpy.unique(titles[new], return_index=True)
+            title_parents[titles] = persons[new][first]
+            title_seen[titles] = True
+
+            titles, persons = _neighbours(numpy, self.title_indptr, self.title_persons, titles)
+            new = depths[persons] < 0
+            persons, first = numpy.unique(persons[new], return_index=True)
+            person_parents[persons] = titles[new][first]
+            depth += 1
+            depths[persons] = depth
+            frontier = persons
+        return depths, person_parents, title_parents
+
+    def distances(self, source, max_depth=None):
+        """
+        Degrees of separation from person source to every person, -1 for
+        persons that are not connected within max_depth
+        """
+        return self.search(source, max_depth=max_depth)[0]
+
+    def shortest_path(self, source, target):
+        """
+        Returns the ids of a shortest path from person source to person target
+        as [source, title, person, title, ..., target], or None if they are
+        not connected
+        """
+        depths, person_parents, title_parents = self.search(source, target)
+        if depths[target] < 0:
+            return None
+        path = [target]
+        person = target
+        while person != source:
+            title = int(person_parents[person])
+            person = int(title_parents[title])
+            path += [title, person]
+        path.reverse()
+        return path
+
+
+def credits_of_lists(sources):
+    """
+    Yields (person, title) pairs of credit lists, sources is a list of
+    (list name, path or file) pairs, see recordreader.iter_records
+    """
+    from .recordreader import iter_records
+    for list_name, source in sources:
+        for credit in iter_records(list_name, source, columns=['name', 'surname', 'title']):
+            # titles of credits end with the spaces before infos and roles
+            yield person_name(credit.name, credit.surname), credit.title.rstrip()
+
+
+def export_credit_graph(preferences_map, directory, lists=("actors", "actresses")):
+    """
+    Builds the graph of the lists in the input directory and saves it to
+    directory, lists that are not on disk are left out
+    """
+    from ..utils.filehandler import FileHandler
+    from . import registry
+    sources = []
+    for list_name in lists:
+        input_path = FileHandler(registry.get_parser_class(list_name).input_file_name, preferences_map).existing_input_path()
+        if input_path is None:
+            logging.warning("%s cannot be found, it is left out of the credit graph", list_name)
+        else:
+            sources.append((list_name, input_path))
+    graph = CreditGraph.from_credits(credits_of_lists(sources))
+    graph.save(directory)
+    logging.info("Credit graph of %d persons, %d titles and %d credits saved to %s", len(graph.persons), len(graph.titles), len(graph.person_titles), directory)
+    return graph
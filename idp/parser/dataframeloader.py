@@ -0,0 +1,140 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Loading lists into pandas DataFrames straight from the parsers
+
+    from idp.parser.dataframeloader import load_dataframe
+
+    actors = load_dataframe("actors", "/data/imdb/actors.list.gz", columns=["surname", "name", "title", "info_1"])
+
+Columns are collected while the list is parsed, without a TSV file in
+between. Columns with few distinct values, e.g. title types and
+"(uncredited)" infos, are dictionary encoded into categoricals and years,
+votes and ranks become numbers, with missing values masked. pandas is
+optional, it is only imported by load_dataframe.
+"""
+
+from array import array
+from . import registry
+from .recordreader import iter_records
+from ..utils.recordwriters import columns_getter
+
+# columns with few distinct values, they become pandas categoricals
+CATEGORICAL_COLUMNS = frozenset(('type', 'movie_type', 'info_1', 'info_2', 'suspended', 'year', 'ep_num', 'genre', 'distribution'))
+
+# numeric columns: array typecode, the conversion of the parsed strings and
+# the masked pandas array, e.g. IntegerArray of int16 is the Int16 dtype
+NUMERIC_COLUMNS = {
+    'year_released': ('h', int, 'IntegerArray'),
+    'votes': ('i', int, 'IntegerArray'),
+    'rank': ('f', float, 'FloatingArray')
+}
+
+
+class CategoricalColumn(object):
+    """
+    Dictionary encoded column, empty strings are missing values
+    """
+
+    def __init__(self):
+        self.codes = array('i')
+        self.index = {"": -1}
+
+    def add(self, value):
+        index = self.index
+        self.codes.append(index.setdefault(value, len(index) - 1))
+
+    def categories(self):
+        """ the values in the order of their codes """
+        return list(self.index)[1:]
+
+    def to_pandas(self, pandas, numpy):
+        return pandas.Categorical.from_codes(numpy.frombuffer(self.codes, dtype=self.codes.typecode), self.categories())
+
+
+class NumericColumn(object):
+    """
+    Column of numbers in an array, values that cannot be converted are missing
+    """
+
+    def __init__(self, typecode, convert, array_class):
+        self.values = array(typecode)
+        self.mask = bytearray()
+        self.convert = convert
+        self.array_class = array_class
+
+    def add(self, value):
+        try:
+            self.values.append(self.convert(value))
+            self.mask.append(0)
+        except (ValueError, OverflowError):
+            self.values.append(0)
+            self.mask.append(1)
+
+    def to_pandas(self, pandas, numpy):
+        values = numpy.frombuffer(self.values, dtype=self.values.typecode)
+        return getattr(pandas.arrays, self.array_class)(values, numpy.frombuffer(self.mask, dtype=bool))
+
+
+class StringColumn(object):
+    def __init__(self):
+        self.values = []
+        self.add = self.values.append
+
+    def to_pandas(self, pandas, numpy):
+        return self.values
+
+
+def column_builder(name, categorical=CATEGORICAL_COLUMNS):
+    if name in NUMERIC_COLUMNS:
+        return NumericColumn(*NUMERIC_COLUMNS[name])
+    if name in categorical:
+        return CategoricalColumn()
+    return StringColumn()
+
+
+def collect_columns(records, columns, categorical=CATEGORICAL_COLUMNS):
+    """
+    Returns a column builder for each of the columns, filled with the values
+    of the records
+    """
+    builders = [column_builder(name, categorical) for name in columns]
+    values = columns_getter(columns)
+    adders = [builder.add for builder in builders]
+    for record in records:
+        for add, value in zip(adders, values(record)):
+            add(value)
+    return builders
+
+
+def load_dataframe(list_name, source, columns=None, categorical=CATEGORICAL_COLUMNS):
+    """
+    Parses a list into a pandas DataFrame
+
+    list_name, source: see recordreader.iter_records
+    columns: names of the columns, by default the columns of the TSV output.
+        Only these are extracted from the list
+    categorical: names of the columns to dictionary encode
+    """
+    import numpy
+    import pandas
+    ParserClass = registry.get_parser_class(list_name)
+    if columns is None:
+        columns = [col['colname'] for col in ParserClass.db_table_info['columns']]
+    builders = collect_columns(iter_records(list_name, source, columns), columns, categorical)
+    return pandas.DataFrame(dict((name, builder.to_pandas(pandas, numpy)) for name, builder in zip(columns, builders)), columns=columns)
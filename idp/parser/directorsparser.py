@@ -16,7 +16,8 @@ along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from .baseparser import *
-from .moviesparser import MoviesParser
+from .records import Credit
+from .listspec import ListSpec, Carry, split_person_name
 
 
 class DirectorsParser(BaseParser):
@@ -41,6 +42,7 @@ class DirectorsParser(BaseParser):
     base_matcher_pattern = '(.*?)\t+((.*? \(\S{4,}\)) ?(\(\S+\))? ?(?!\{\{SUSPENDED\}\})(\{(.*?) ?(\(\S+?\))?\})? ?(\{\{SUSPENDED\}\})?)\s*(\(.*\)|EDIT)?\s*(<.*>)?$'
     input_file_name = "directors.list"
     number_of_lines_to_be_skipped = 235
+    header_end_pattern = rb"^THE DIRECTORS LIST\r?\n=+\r?\n\r?\nName[ \t]+Titles[ \t]*\r?\n-+[ \t]+-+[ \t]*\r?\n"
     db_table_info = {
         'tablename' : 'directors',
         'columns' : [
@@ -49,58 +51,14 @@ class DirectorsParser(BaseParser):
             {'colname' : 'title', 'colinfo' : DbScriptHelper.keywords['string'] + '(255) NOT NULL'},            
             {'colname' : 'info', 'colinfo' : DbScriptHelper.keywords['string'] + '(127)'}
         ],
-        'constraints' : 'PRIMARY KEY(title)'
+        # a title has many credits, so it is not a key
+        'constraints' : '',
+        'indexes' : ['title', 'surname, name']
     }
+    doc_type = "director"
+    partitionable = True
     end_of_dump_delimiter = ""
 
-    name = ""
-    surname = ""
-
-    def __init__(self, preferences_map):
-        super(DirectorsParser, self).__init__(preferences_map)
-        self.first_one = True
-
-    def parse_into_tsv(self, matcher):
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-            if(len(matcher.group(1).strip()) > 0):
-                namelist = matcher.group(1).split(', ')
-                if(len(namelist) == 2):
-                    self.name = namelist[1]
-                    self.surname = namelist[0]
-                else:
-                    self.name = namelist[0]
-                    self.surname = ""
-
-            self.tsv_file.write(self.name + self.seperator + self.surname + self.seperator + self.concat_regex_groups([2,9], None, matcher) + "\n")
-        elif(len(matcher.get_last_string()) == 1):
-            pass
-        else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
-
-    def parse_into_db(self, matcher):
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-            if(len(matcher.group(1).strip()) > 0):
-                namelist = matcher.group(1).split(', ')
-                if(len(namelist) == 2):
-                    self.name = namelist[1]
-                    self.surname = namelist[0]
-                else:
-                    self.name = namelist[0]
-                    self.surname = ""
-
-            if(self.first_one):
-                self.sql_file.write("(\"" + self.name + "\", \"" + self.surname + "\", " + self.concat_regex_groups([2,9], [2,3], matcher) + ")")
-                self.first_one = False;
-            else:
-                self.sql_file.write(",\n(\"" + self.name + "\", \"" + self.surname + "\", " + self.concat_regex_groups([2,9], [2,3], matcher) + ")")  
-
-        elif(len(matcher.get_last_string()) == 1):
-            pass
-        else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
+    # the person is only on the first line of a block, it is carried over to the following lines
+    row_spec = ListSpec(base_matcher_pattern, Credit, ('name', 'surname', 2, 3, 4, 9),
+                        carry=Carry(1, ('name', 'surname'), split_person_name), skip_blank=True)
@@ -0,0 +1,174 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Series, season and episode index of movies.list
+
+Episodes are sorted by series, season and episode number. Their seasons
+and numbers are kept in arrays, and the episodes of series i are the slice
+offsets[i]:offsets[i + 1] of them, so the episodes of a series or its
+episode counts per season need no scan. The index is built while
+movies.list is parsed (see MoviesParser.create_hooks) and saved to two
+files:
+
+    <prefix>.bin: the offsets, seasons and numbers arrays
+    <prefix>.txt: the series, one per line, followed by the episode titles
+
+Seasons and numbers are -1 when an episode has no (#season.episode) number.
+"""
+
+import bisect
+import itertools
+import re
+import struct
+import sys
+from array import array
+
+MAGIC = b"IDPE"
+# magic, byte order, number of series, number of episodes
+HEADER = struct.Struct("<4scqq")
+
+episode_number_pattern = re.compile(r"\(#(\d+)\.(\d+)\)$")
+
+
+def parse_episode_number(ep_num):
+    """
+    "(#8.12)" -> (8, 12), (-1, -1) when there is no season and episode number
+    """
+    matcher = episode_number_pattern.match(ep_num)
+    if matcher is None:
+        return -1, -1
+    return int(matcher.group(1)), int(matcher.group(2))
+
+
+class EpisodeIndex(object):
+    """
+    series: series titles, sorted
+    offsets: array('q'), the episodes of series i are offsets[i]:offsets[i + 1]
+    seasons, numbers: array('h') and array('i') of the episodes
+    titles: titles of the episodes
+    """
+
+    def __init__(self, series, offsets, seasons, numbers, titles):
+        self.series = series
+        self.offsets = offsets
+        self.seasons = seasons
+        self.numbers = numbers
+        self.titles = titles
+
+    def series_id(self, series):
+        """
+        Returns the id of a series title like '"Allo 'Allo!" (1982)', raises KeyError for unknown series
+        """
+        position = bisect.bisect_left(self.series, series)
+        if position == len(self.series) or self.series[position] != series:
+            raise KeyError(series)
+        return position
+
+    def episode_range(self, series):
+        series_id = self.series_id(series)
+        return self.offsets[series_id], self.offsets[series_id + 1]
+
+    def episodes(self, series):
+        """
+        Returns (season, number, title) of the episodes of a series in order
+        """
+        start, end = self.episode_range(series)
+        return list(zip(self.seasons[start:end], self.numbers[start:end], self.titles[start:end]))
+
+    def season_counts(self, series):
+        """
+        Returns [(season, number of episodes)] of a series, season -1 counts
+        the episodes without a season
+        """
+        start, end = self.episode_range(series)
+        return [(season, len(list(group))) for season, group in itertools.groupby(self.seasons[start:end])]
+
+    def save(self, prefix):
+        with open(prefix + ".bin", "wb") as index_file:
+            index_file.write(HEADER.pack(MAGIC, b"<" if sys.byteorder == "little" else b">", len(self.series), len(self.titles)))
+            for values in (self.offsets, self.seasons, self.numbers):
+                values.tofile(index_file)
+        with open(prefix + ".txt", "w", encoding='utf-8') as names_file:
+            names_file.writelines(name + "\n" for name in itertools.chain(self.series, self.titles))
+
+    @classmethod
+    def load(cls, prefix):
+        with open(prefix + ".bin", "rb") as index_file:
+            magic, byteorder, series_count, episode_count = HEADER.unpack(index_file.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(prefix + ".bin is not an episode index")
+            arrays = []
+            for typecode, size in (('q', series_count + 1), ('h', episode_count), ('i', episode_count)):
+                values = array(typecode)
+                values.fromfile(index_file, size)
+                if byteorder != (b"<" if sys.byteorder == "little" else b">"):
+                    values.byteswap()
+                arrays.append(values)
+        with open(prefix + ".txt", encoding='utf-8') as names_file:
+            names = names_file.read().splitlines()
+        return cls(names[:series_count], arrays[0], arrays[1], arrays[2], names[series_count:])
+
+
+class EpisodeIndexBuilder(object):
+    """
+    Record hook of MoviesParser that collects the episodes and saves an
+    EpisodeIndex to prefix when it is closed
+    """
+
+    # Movie attributes the hook reads, they are extracted even with --columns
+    attributes = ('title', 'full_name', 'ep_name', 'ep_num')
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.series = {}
+        self.episode_series = []
+        self.seasons = array('h')
+        self.numbers = array('i')
+        self.titles = []
+
+    def add(self, movie):
+        if not (movie.ep_name or movie.ep_num):
+            # series have their own line before their episodes
+            if movie.full_name.startswith('"'):
+                self.series[movie.full_name] = None
+            return
+        season, number = parse_episode_number(movie.ep_num)
+        self.series[movie.full_name] = None
+        self.episode_series.append(movie.full_name)
+        self.seasons.append(season)
+        self.numbers.append(number)
+        self.titles.append(movie.title)
+
+    def build(self):
+        series = sorted(self.series)
+        series_ids = dict((name, series_id) for series_id, name in enumerate(series))
+        episode_series = [series_ids[name] for name in self.episode_series]
+        order = sorted(range(len(episode_series)), key=lambda episode: (episode_series[episode], self.seasons[episode], self.numbers[episode], self.titles[episode]))
+
+        offsets = array('q', [0]) * (len(series) + 1)
+        for series_id in episode_series:
+            offsets[series_id + 1] += 1
+        for series_id in range(len(series)):
+            offsets[series_id + 1] += offsets[series_id]
+        return EpisodeIndex(series, offsets,
+                            array('h', (self.seasons[episode] for episode in order)),
+                            array('i', (self.numbers[episode] for episode in order)),
+                            [self.titles[episode] for episode in order])
+
+    def close(self):
+        self.build().save(self.prefix)
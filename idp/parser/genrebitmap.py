@@ -0,0 +1,148 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Genres of titles as bitmaps
+
+Each genre of genres.list gets a bit and each title one integer with the
+bits of its genres, so genre filters over the whole catalog are bitwise
+operations on an array. Bitmaps are built while genres.list is parsed (see
+GenresParser.create_hooks) and saved to three files:
+
+    <prefix>.json: the genres in bit order and the array typecode
+    <prefix>.bin: the bitmaps, the title id is the position in the array
+    <prefix>.txt: the titles in id order, they are sorted
+
+Filters use numpy when it is installed and plain Python otherwise.
+"""
+
+import bisect
+import json
+import sys
+from array import array
+
+
+class GenreBitmaps(object):
+    """
+    genres: genre names, genre i is bit 1 << i
+    titles: sorted titles, the ids of the bitmaps
+    bitmaps: array of the bitmaps, 'I' for up to 32 genres and 'Q' otherwise
+    """
+
+    def __init__(self, genres, titles, bitmaps):
+        self.genres = genres
+        self.titles = titles
+        self.bitmaps = bitmaps
+        self.bits = dict((genre, 1 << bit) for bit, genre in enumerate(genres))
+
+    def mask(self, genres):
+        """
+        Returns the bits of genres, raises KeyError for unknown genres
+        """
+        mask = 0
+        for genre in genres:
+            mask |= self.bits[genre]
+        return mask
+
+    def title_id(self, title):
+        position = bisect.bisect_left(self.titles, title)
+        if position == len(self.titles) or self.titles[position] != title:
+            raise KeyError(title)
+        return position
+
+    def genres_of(self, title):
+        bitmap = self.bitmaps[self.title_id(title)]
+        return [genre for genre in self.genres if bitmap & self.bits[genre]]
+
+    def select(self, all_of=(), any_of=(), none_of=()):
+        """
+        Returns the ids of the titles that have all genres of all_of, at
+        least one of any_of if it is given and none of none_of, e.g.
+        select(all_of=["Comedy", "Drama"], none_of=["Short"])
+        """
+        required = self.mask(all_of)
+        wanted = self.mask(any_of)
+        excluded = self.mask(none_of)
+        try:
+            import numpy
+        except ImportError:
+            return [title_id for title_id, bitmap in enumerate(self.bitmaps)
+                    if bitmap & required == required and (not wanted or bitmap & wanted) and not bitmap & excluded]
+
+        bitmaps = numpy.frombuffer(self.bitmaps, dtype=self.bitmaps.typecode)
+        # the masks are of the same unsigned type, so numpy compares without conversions
+        required, wanted, excluded = (bitmaps.dtype.type(mask) for mask in (required, wanted, excluded))
+        selected = (bitmaps & required) == required
+        if wanted:
+            selected &= (bitmaps & wanted) != 0
+        if excluded:
+            selected &= (bitmaps & excluded) == 0
+        return numpy.flatnonzero(selected)
+
+    def select_titles(self, all_of=(), any_of=(), none_of=()):
+        return [self.titles[title_id] for title_id in self.select(all_of, any_of, none_of)]
+
+    def save(self, prefix):
+        with open(prefix + ".json", "w", encoding='utf-8') as dictionary_file:
+            json.dump({"genres": self.genres, "typecode": self.bitmaps.typecode, "titles": len(self.titles), "byteorder": sys.byteorder}, dictionary_file)
+        with open(prefix + ".bin", "wb") as bitmaps_file:
+            self.bitmaps.tofile(bitmaps_file)
+        with open(prefix + ".txt", "w", encoding='utf-8') as titles_file:
+            titles_file.writelines(title + "\n" for title in self.titles)
+
+    @classmethod
+    def load(cls, prefix):
+        with open(prefix + ".json", encoding='utf-8') as dictionary_file:
+            dictionary = json.load(dictionary_file)
+        bitmaps = array(dictionary["typecode"])
+        with open(prefix + ".bin", "rb") as bitmaps_file:
+            bitmaps.fromfile(bitmaps_file, dictionary["titles"])
+        if dictionary["byteorder"] != sys.byteorder:
+            bitmaps.byteswap()
+        with open(prefix + ".txt", encoding='utf-8') as titles_file:
+            titles = titles_file.read().splitlines()
+        return cls(dictionary["genres"], titles, bitmaps)
+
+
+class GenreBitmapBuilder(object):
+    """
+    Record hook of GenresParser that collects the genres of each title and
+    saves GenreBitmaps to prefix when it is closed
+    """
+
+    # Genre attributes the hook reads, they are extracted even with --columns
+    attributes = ('title', 'genre')
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.bits = {}
+        self.title_bitmaps = {}
+
+    def add(self, genre):
+        bit = self.bits.get(genre.genre)
+        if bit is None:
+            bit = self.bits[genre.genre] = 1 << len(self.bits)
+        self.title_bitmaps[genre.title] = self.title_bitmaps.get(genre.title, 0) | bit
+
+    def build(self):
+        titles = sorted(self.title_bitmaps)
+        # genres are numbered in the order they are first seen, so bits follow the dict order
+        bitmaps = array('I' if len(self.bits) <= 32 else 'Q', (self.title_bitmaps[title] for title in titles))
+        return GenreBitmaps(list(self.bits), titles, bitmaps)
+
+    def close(self):
+        self.build().save(self.prefix)
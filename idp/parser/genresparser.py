@@ -16,8 +16,9 @@ along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from .baseparser import *
-from .moviesparser import MoviesParser
-import json
+from .records import Genre
+from .listspec import ListSpec
+from .genrebitmap import GenreBitmapBuilder
 
 
 class GenresParser(BaseParser):
@@ -40,61 +41,25 @@ class GenresParser(BaseParser):
     base_matcher_pattern = "((.*? \(\S{4,}\)) ?(\(\S+\))? ?(?!\{\{SUSPENDED\}\})(\{(.*?) ?(\(\S+?\))?\})? ?(\{\{SUSPENDED\}\})?)\t+(.*)$"
     input_file_name = "genres.list"
     number_of_lines_to_be_skipped = 378
+    header_end_pattern = rb"^(?:\d+: )?THE GENRES LIST\r?\n=+\r?\n\r?\n"
     db_table_info = {
         'tablename' : 'genres',
         'columns' : [
             {'colname' : 'title', 'colinfo' : DbScriptHelper.keywords['string'] + '(255) NOT NULL'},
             {'colname' : 'genre', 'colinfo' : DbScriptHelper.keywords['string'] + '(127)'}
         ],
-        'constraints' : 'PRIMARY KEY(title)'
-    }
-
-    json_info = {
-        'keys' : [
-            {'genre': 'string'}
-        ]
+        # a title has many genres, so it is not a key
+        'constraints' : '',
+        'indexes' : ['title', 'genre']
     }
 
+    doc_type = "genre"
+    partitionable = True
     end_of_dump_delimiter = ""
+    row_spec = ListSpec(base_matcher_pattern, Genre, (1, 2, 3, 8))
 
-    def __init__(self, preferences_map):
-        super(GenresParser, self).__init__(preferences_map)
-        self.first_one = True
-
-    def parse_into_json(self, matcher):
-
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-            #if(MoviesParser.get_movie_type(matcher.group(2), matcher.group(3)) == MoviesParser.TYPE_MOVIE):
-            json_string = self.concat_regex_groups([8], [8], matcher, "genre")
-            json_obj = json.loads(json_string)
-            json_obj['year_released'] = MoviesParser.get_year_released(matcher.group(2))
-            json_obj['movie_name'] = MoviesParser.get_movie_name(matcher.group(2))
-            json_obj['movie_type'] = MoviesParser.get_movie_type(matcher.group(2), matcher.group(3))
-            self.json_file.write(json.dumps(json_obj) + "\n")
-        else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
-
-    def parse_into_tsv(self, matcher):
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-            self.tsv_file.write(self.concat_regex_groups([1,8], None, matcher) + "\n")
-        else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
-
-    def parse_into_db(self, matcher):
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-            if(self.first_one):
-                self.sql_file.write("(" + self.concat_regex_groups([1,8], [0,1], matcher) + ")")
-                self.first_one = False;
-            else:
-                self.sql_file.write(",\n(" + self.concat_regex_groups([1,8], [0,1], matcher) + ")")
-        else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
+    def create_hooks(self, preferences_map):
+        hooks = super(GenresParser, self).create_hooks(preferences_map)
+        if preferences_map.get('genre_bitmap'):
+            hooks.append(GenreBitmapBuilder(self.filehandler.genre_bitmap_path()))
+        return hooks
@@ -0,0 +1,215 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Declarative specs of single line list formats
+
+A ListSpec says which regex groups of a line become which fields of a record
+and which values are carried over from earlier lines, e.g. the person of a
+block in actors.list. Specs are compiled once into a row function with
+generated code, so the parsing loop runs straight line code without looking
+at the spec again. A spec projected on the record attributes a job needs
+leaves the other groups uncaptured, see ListSpec.project.
+"""
+
+import re
+
+
+def split_person_name(name):
+    """
+    "Surname, Name" -> (name, surname)
+    """
+    namelist = name.split(', ')
+    if len(namelist) == 2:
+        return namelist[1], namelist[0]
+    return namelist[0], ""
+
+
+def project_pattern(pattern, groups):
+    """
+    Turns the capturing groups of pattern that are not in groups into
+    non-capturing ones. Returns the new pattern and a map of the old number
+    of each kept group to its new number
+    """
+    parts = []
+    numbers = {}
+    number = 0
+    index = 0
+    in_class = False
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            parts.append(pattern[index:index + 2])
+            index += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # a ] right after [ or [^ is part of the class
+            if pattern[index + 1:index + 2] == "^":
+                parts.append("[^")
+                index += 2
+            else:
+                parts.append("[")
+                index += 1
+            if pattern[index:index + 1] == "]":
+                parts.append("]")
+                index += 1
+            continue
+        elif char == "(" and pattern[index + 1:index + 2] != "?":
+            number += 1
+            if number in groups:
+                numbers[number] = len(numbers) + 1
+            else:
+                char = "(?:"
+        parts.append(char)
+        index += 1
+    return "".join(parts), numbers
+
+
+class Carry(object):
+    """
+    A group that sets fields which are carried over to the following lines
+
+    The fields are updated on lines where the group is not blank. convert turns
+    the group into a tuple of field values, without convert the group is the
+    value of the single field.
+    """
+
+    def __init__(self, group, fields, convert=None):
+        if convert is None and len(fields) != 1:
+            raise ValueError("Carry of several fields needs a convert function")
+        self.group = group
+        self.fields = tuple(fields)
+        self.convert = convert
+
+
+class ListSpec(object):
+    """
+    pattern: regex matching a data line
+    record_class: class of the records, see records.py
+    fields: the arguments of record_class, each one is a group number, the
+        name of a carried field or None for an empty string
+    carry: optional Carry
+    require: lines where this group is empty yield no record, they only carry
+        values over. By default every matching line yields a record
+    skip_blank: blank lines are skipped instead of rejected
+    """
+
+    def __init__(self, pattern, record_class, fields, carry=None, require=None, skip_blank=False):
+        self.pattern = pattern
+        self.record_class = record_class
+        self.fields = tuple(fields)
+        self.carry = carry
+        self.require = require
+        self.skip_blank = skip_blank
+        self.factory = None
+
+        carried = carry.fields if carry is not None else ()
+        for field in self.fields:
+            if field is not None and not isinstance(field, int) and field not in carried:
+                raise ValueError("Field is neither a group nor carried: " + str(field))
+
+    def source(self):
+        """
+        Returns the source code of the row function factory
+        """
+        carried = self.carry.fields if self.carry is not None else ()
+        lines = ["def make_row_function(match, Record, convert, reject):"]
+        for field in carried:
+            lines.append("    %s = ''" % field)
+        lines.append("    def parse_line(line):")
+        if carried:
+            lines.append("        nonlocal " + ", ".join(carried))
+        lines.append("        matcher = match(line)")
+        lines.append("        if matcher is None:")
+        if self.skip_blank:
+            lines.append("            if not line.strip():")
+            lines.append("                return None")
+        lines.append("            reject(line)")
+        lines.append("            return None")
+        # unmatched groups are empty strings like in RegExHelper
+        lines.append("        groups = matcher.groups('')")
+        if self.carry is not None:
+            value = "groups[%d]" % (self.carry.group - 1)
+            lines.append("        if %s.strip():" % value)
+            if self.carry.convert is None:
+                lines.append("            %s = %s" % (carried[0], value))
+            else:
+                lines.append("            %s, = convert(%s)" % (", ".join(carried), value))
+        if self.require is not None:
+            lines.append("        if not groups[%d]:" % (self.require - 1))
+            lines.append("            return None")
+        arguments = [("groups[%d]" % (field - 1)) if isinstance(field, int) else (field or "''") for field in self.fields]
+        lines.append("        return Record(%s)" % ", ".join(arguments))
+        lines.append("    return parse_line")
+        return "\n".join(lines) + "\n"
+
+    def row_function(self, reject):
+        """
+        Returns a function that turns a line into a record or None. reject is
+        called with the lines that don't match. Each call returns a function
+        with its own carried values, the code is generated only once
+        """
+        if self.factory is None:
+            namespace = {}
+            exec(compile(self.source(), "<list spec of %s>" % self.record_class.__name__, "exec"), namespace)
+            self.factory = namespace["make_row_function"]
+        convert = self.carry.convert if self.carry is not None else None
+        return self.factory(re.compile(self.pattern).match, self.record_class, convert, reject)
+
+    def project(self, attributes):
+        """
+        Returns a spec whose records only fill the given attributes of
+        record_class, the others are empty strings. Groups of the other
+        attributes are not captured and the carried fields are not converted
+        when none of them is needed. The lines matched stay the same
+        """
+        names = self.record_class.__slots__
+        aliases = self.record_class.aliases
+        attributes = set(aliases.get(attribute, attribute) for attribute in attributes)
+        fields = [field if names[position] in attributes else None for position, field in enumerate(self.fields)]
+        carry = self.carry
+        if carry is not None and not any(field in carry.fields for field in fields):
+            carry = None
+        groups = set(field for field in fields if isinstance(field, int))
+        if carry is not None:
+            groups.add(carry.group)
+        if self.require is not None:
+            groups.add(self.require)
+        pattern, numbers = project_pattern(self.pattern, groups)
+        fields = [numbers[field] if isinstance(field, int) else field for field in fields]
+        if carry is not None:
+            carry = Carry(numbers[carry.group], carry.fields, carry.convert)
+        require = numbers[self.require] if self.require is not None else None
+        return ListSpec(pattern, self.record_class, fields, carry, require, self.skip_blank)
+
+
+def spec_parser_class(class_name, module_name, spec, **properties):
+    """
+    Creates a parser class for a list that is fully described by its spec,
+    properties are the class properties of BaseParser, e.g. input_file_name
+    """
+    from .baseparser import BaseParser
+    properties.update({
+        '__module__': module_name,
+        '__doc__': "Parses %s, generated from its ListSpec" % properties['input_file_name'],
+        'row_spec': spec,
+        'base_matcher_pattern': spec.pattern
+    })
+    return type(class_name, (BaseParser,), properties)
@@ -16,8 +16,10 @@ along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import re
-import json
 from .baseparser import *
+from .records import Movie
+from .listspec import ListSpec
+from .episodeindex import EpisodeIndexBuilder
 from ..utils.regexhelper import RegExHelper
 
 
@@ -42,8 +44,8 @@ class MoviesParser(BaseParser):
     # properties
     base_matcher_pattern = "((.*? \(\S{4,}\)) ?(\(\S+\))? ?(?!\{\{SUSPENDED\}\})(\{(.*?) ?(\(\S+?\))?\})? ?(\{\{SUSPENDED\}\})?)\t+(.*)$"
     input_file_name = "movies.list"
-    #FIXME: zafer: I think using a static number is critical for us. If imdb sends a new file with first 10 line fucked then we're also fucked
     number_of_lines_to_be_skipped = 15
+    header_end_pattern = rb"^MOVIES LIST\r?\n=+\r?\n\r?\n"
     TYPE_TV_SERIES = '(TV_SERIES)'
     TYPE_TV_MOVIE = '(TV)' # TV movie (a single episode, produced for TV)
     TYPE_VIDEO = '(V)' # video movie (straight to video)
@@ -64,16 +66,33 @@ class MoviesParser(BaseParser):
         'constraints' : 'PRIMARY KEY(title)'
     }
 
-    json_info = {
-        'keys' : [
-            {'movie_type': 'string'}
-        ]
-    }
+    doc_type = "movie"
+    partitionable = True
     end_of_dump_delimiter = "--------------------------------------------------------------------------------"
+    row_spec = ListSpec(base_matcher_pattern, Movie, (1, 2, 3, 5, 6, 7, 8))
 
-    def __init__(self, preferences_map):
-        super(MoviesParser, self).__init__(preferences_map)
-        self.first_one = True
+    def create_hooks(self, preferences_map):
+        hooks = super(MoviesParser, self).create_hooks(preferences_map)
+        if preferences_map.get('episode_index'):
+            hooks.append(EpisodeIndexBuilder(self.filehandler.episode_index_path()))
+        return hooks
+
+    @classmethod
+    def iter_movies(cls, input_file):
+        """
+        Yields the Movie records of an opened movies.list without writing
+        any output, for passes that only need the titles
+        """
+        input_file = headerscanner.skip_header(input_file, cls.header_end_pattern, cls.number_of_lines_to_be_skipped)[0]
+        # lines that don't match are ignored, the title, its type and year are enough
+        parse_line = cls.row_spec.project(('title', 'full_name', 'type')).row_function(lambda line: None)
+        with input_file:
+            for line in input_file:
+                if cls.end_of_dump_delimiter in line:
+                    break
+                movie = parse_line(line)
+                if movie is not None:
+                    yield movie
 
     @staticmethod
     def split_movie_year(movie_year):
@@ -101,7 +120,8 @@ class MoviesParser(BaseParser):
                 return year_matcher.group(1)
 
         error = "something went wrong with year in movie parsing"
-        print(error, movie_year)
+        # titles with an unknown year are common and these run several times per record
+        logging.debug("%s %s", error, movie_year)
         return '????'
 
     @staticmethod
@@ -122,7 +142,8 @@ class MoviesParser(BaseParser):
                 return matcher.group(1)
 
         error = "something went wrong with movie name parsing"
-        print(error, movie_year)
+        # titles with an unknown year are common and these run several times per record
+        logging.debug("%s %s", error, movie_year)
         return error
 
     @staticmethod
@@ -143,43 +164,3 @@ class MoviesParser(BaseParser):
                 movie_type = MoviesParser.TYPE_MOVIE
 
         return movie_type
-
-
-    def parse_into_json(self, matcher):
-
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-
-            #if(MoviesParser.get_movie_type(matcher.group(2), matcher.group(3)) == MoviesParser.TYPE_MOVIE):
-            json_string = self.concat_regex_groups([3], [3], matcher, "movie")
-            movie_info = json.loads(json_string)
-            movie_info['movie_type'] = MoviesParser.get_movie_type(matcher.group(2), matcher.group(3))
-            movie_info['movie_name'] = MoviesParser.get_movie_name(matcher.group(2))
-            movie_info['year_released'] = MoviesParser.get_year_released(matcher.group(2))
-            self.json_file.write(json.dumps(movie_info) + '\n')
-        else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
-
-    def parse_into_tsv(self, matcher):
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-            self.tsv_file.write(self.concat_regex_groups([1,2,3,5,6,7,8], None, matcher) + "\n")
-        else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
-
-    def parse_into_db(self, matcher):
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-            if(self.first_one):
-                self.sql_file.write("(" + self.concat_regex_groups([1,2,3,5,6,7,8], [0,1,2,3,4,5,6], matcher) + ")")
-                self.first_one = False;
-            else:
-                self.sql_file.write(",\n(" + self.concat_regex_groups([1,2,3,5,6,7,8], [0,1,2,3,4,5,6], matcher) + ")")
-        else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
@@ -16,8 +16,10 @@ along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import logging
+import os
 import traceback
 from idp import settings
+from . import registry
 
 
 class ParsingHelper(object):
@@ -26,41 +28,146 @@ class ParsingHelper(object):
     """
 
     @staticmethod
-    def parse_one(item, preferences_map):
-
-        def get_parser_class_for(item_name):
-            """
-            Thanks to http://stackoverflow.com/a/452981
-            """
-            kls = "idp.parser." + item_name + "parser." + item_name.title() + "Parser"
-            parts = kls.split('.')
-            module = ".".join(parts[:-1])
-            m = __import__( module )
-            for comp in parts[1:]:
-                m = getattr(m, comp)
-            return m
+    def get_parser_class_for(item_name):
+        return registry.get_parser_class(item_name)
 
+    @staticmethod
+    def parse_one(item, preferences_map, stream=False):
+        """
+        stream: if True the list is downloaded, decompressed and parsed
+            in one pass instead of being read from the input directory
+
+        Returns True if the outputs of the list were written or restored,
+        False if the list could not be parsed
+        """
         try:
-            ParserClass = get_parser_class_for(item)
+            ParserClass = ParsingHelper.get_parser_class_for(item)
         except Exception as e:
             logging.error("No parser found for: " + item + "\n\tException is: " + str(e))
-            return 1
+            return False
         logging.info("___________________")
+
+        cache = preferences_map.get('cache')
+        cache_key = None
+        # partitioned outputs are spread over directories, the cache holds flat outputs only
+        if cache is not None and not stream and not preferences_map.get('partitioning'):
+            cache_key = ParsingHelper.cache_key(cache, ParserClass, preferences_map)
+            if cache_key is not None and cache.restore(cache_key, preferences_map['output_dir']):
+                logging.info("Outputs of " + item + " restored from cache")
+                return True
+
         logging.info("Parsing " + item + "...")
-        parser = ParserClass(preferences_map)
         try:
+            # a missing list fails here, the other lists are still parsed
+            if stream:
+                from ..utils import listdownloader
+                parser = ParserClass(preferences_map, listdownloader.stream(ParserClass.input_file_name))
+            else:
+                parser = ParserClass(preferences_map)
             parser.start_processing()
+            if cache_key is not None:
+                cache.store(cache_key, parser.filehandler.output_paths())
         except Exception as e:
             logging.error("Exception occured while parsing item: " + item + "\n\tException is: " + str(e))
             traceback.print_exc()
-        logging.info("Parsing finished for item: " + item)
+            return False
+        finally:
+            logging.info("Parsing finished for item: " + item)
+        return True
+
+    @staticmethod
+    def cache_key(cache, ParserClass, preferences_map):
+        """
+        Returns the result cache key of a list or None if the list is not on disk
+        """
+        from ..utils.filehandler import FileHandler
+        input_path = FileHandler(ParserClass.input_file_name, preferences_map).existing_input_path()
+        if input_path is None:
+            return None
+        return cache.key(input_path, ParserClass, ParsingHelper.output_options(preferences_map))
+
+    @staticmethod
+    def output_options(preferences_map):
+        """
+        Returns the preferences that shape the outputs, that is every preference
+        except where the files are read from and written to
+        """
+        return dict((key, value) for key, value in preferences_map.items() if key not in ('input_dir', 'output_dir', 'cache'))
 
     @staticmethod
-    def parse_all(preferences_map):
+    def input_digests(preferences_map, lists=None):
+        """
+        Returns a map of list name to the sha256 of the list content and of
+        its parser's source, lists that are not on disk are left out.
+        Deterministic runs are named after these digests
+        """
+        from ..utils.filehandler import FileHandler
+        from ..utils.resultcache import ResultCache
+        from ..utils.runmanifest import file_sha256
+        digests = {}
+        for item in (settings.LISTS if lists is None else lists):
+            try:
+                ParserClass = ParsingHelper.get_parser_class_for(item)
+            except Exception:
+                continue
+            input_path = FileHandler(ParserClass.input_file_name, preferences_map).existing_input_path()
+            if input_path is not None:
+                digests[item] = [file_sha256(input_path), ResultCache.parser_version(ParserClass)]
+        return digests
+
+    @staticmethod
+    def parse_all(preferences_map, stream=False):
         for item in settings.LISTS:
-            ParsingHelper.parse_one(item, preferences_map)
+            ParsingHelper.parse_one(item, preferences_map, stream)
         logging.info("All parsing finished.")
 
+    @staticmethod
+    def build_title_filter(preferences_map, expression, exact=False, error_rate=0.01):
+        """
+        Builds the set of titles in movies.list that match a partition filter
+        expression (see partitionedsink.compile_filter), e.g. "type == 'MOVIE'".
+        Put into preferences_map as 'title_filter', parsers then drop the
+        records of all other titles.
+
+        The set is a BloomFilter of about 10 bits per title at error_rate, or
+        if exact a HashSetFilter of 8 bytes per title
+        """
+        from ..utils.filehandler import FileHandler
+        from ..utils.partitionedsink import compile_filter, partition_of
+        from ..utils.titlefilter import build_title_filter
+
+        accept = compile_filter(expression)
+        MoviesParser = ParsingHelper.get_parser_class_for("movies")
+        filehandler = FileHandler(MoviesParser.input_file_name, preferences_map)
+        input_file = filehandler.get_input_file()
+        # movies.list lines are longer than 32 bytes, so this overestimates the number of titles
+        capacity = os.path.getsize(filehandler.full_path()) // 32
+        titles = (movie.title for movie in MoviesParser.iter_movies(input_file) if accept(*partition_of(movie)))
+        title_filter = build_title_filter(titles, capacity, exact, error_rate, expression)
+        logging.info("Title filter has " + str(len(title_filter)) + " titles matching: " + expression)
+        return title_filter
+
+    @staticmethod
+    def data_offsets(input_dir, lists=None):
+        """
+        Returns a map of list name to the offset of its first data line, so
+        other tools can seek straight to the data. Lists without a parser or
+        file, and lists whose header is not recognized, map to None
+        """
+        offsets = {}
+        for item in (settings.LISTS if lists is None else lists):
+            offsets[item] = None
+            try:
+                ParserClass = ParsingHelper.get_parser_class_for(item)
+            except Exception:
+                continue
+            path = os.path.join(input_dir, ParserClass.input_file_name)
+            for candidate in (path, path + ".gz"):
+                if os.path.isfile(candidate):
+                    offsets[item] = ParserClass.find_data_offset(candidate)
+                    break
+        return offsets
+
 if __name__ == "__main__":
     """
     For debugging purposes
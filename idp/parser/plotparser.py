@@ -16,6 +16,8 @@ along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from .baseparser import *
+from .records import Plot
+from ..utils.recordassembler import RecordAssembler
 
 
 class PlotParser(BaseParser):
@@ -33,6 +35,7 @@ class PlotParser(BaseParser):
     base_matcher_pattern = "(.+?): (.*)"
     input_file_name = "plot.list"
     number_of_lines_to_be_skipped = 15
+    header_end_pattern = rb"^PLOT SUMMARIES LIST\r?\n=+\r?\n"
     db_table_info = {
         'tablename' : 'plot',
         'columns' : [
@@ -41,63 +44,30 @@ class PlotParser(BaseParser):
         ],
         'constraints' : 'PRIMARY KEY(title)'
     }
+    doc_type = "plot"
     end_of_dump_delimiter = ""
 
-    def __init__(self, preferences_map):
-        super(PlotParser, self).__init__(preferences_map)
-        self.first_one = True
+    def __init__(self, preferences_map, input_file=None):
+        super(PlotParser, self).__init__(preferences_map, input_file)
 
         # specific to this class
-        self.title = ""
-        self.plot = ""
+        self.assembler = RecordAssembler(Plot)
 
-    def parse_into_tsv(self, matcher):
+    def parse_record(self, matcher):
         is_match = matcher.match(self.base_matcher_pattern)
 
         if(is_match):
             if(matcher.group(1) == "MV"): #Title
-                if(self.title != ""):
-                    self.tsv_file.write(self.title + self.seperator + self.plot + "\n")
-
-                self.plot = ""
-                self.title = matcher.group(2)
-
+                return self.assembler.start(matcher.group(2))
             elif(matcher.group(1) == "PL"): #Descriptive text
-                self.plot += matcher.group(2)
+                self.assembler.add(matcher.group(2))
             elif(matcher.group(1) == "BY"):
                 pass
-            else:
-                logging.critical("Unhandled abbreviation: " + matcher.group(1) + " in " + line)
+            else: #Unhandled abbreviation
+                self.reject(matcher)
         #else:
             #just ignore this part, useless lines
 
-        """
-            FIXME: this parsing  misses the last entry
-                need to execute following just after looping the input file's lines:
-            # Covers the last item
-            outputFile.write(title + self.seperator + plot + "\n")
-
-            consider writing to the file in "BY:" condition
-        """
-
-    def parse_into_db(self, matcher):
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-            if(matcher.group(1) == "MV"): #Title
-                if(self.title != ""):
-                    if(self.first_one):
-                        self.sql_file.write("(\"" + self.title + "\", \"" + self.plot + "\")")
-                        self.first_one = False;
-                    else:
-                        self.sql_file.write(",\n(\"" + self.title + "\", \"" + self.plot + "\")")
-
-                self.plot = ""
-                self.title = matcher.group(2)
-
-            elif(matcher.group(1) == "PL"): #Descriptive text
-                self.plot += matcher.group(2)
-            elif(matcher.group(1) == "BY"):
-                pass
-            else:
-                logging.critical("Unhandled abbreviation: " + matcher.group(1) + " in " + line)
+    def finish(self):
+        # covers the last item
+        return self.assembler.finish()
@@ -0,0 +1,186 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Column profiles of a list, computed while it is parsed
+
+A ProfileHook keeps for every output column the number of values, the
+number of empty values (groups that did not match), a HyperLogLog estimate
+of the distinct values, the counts of value lengths, which give their
+percentiles, and the smallest and largest numbers, e.g. years. Its memory
+does not grow with the list, and records are profiled in batches with
+builtins doing most of the work, so the profile of a whole list is cheap.
+The profile is written to <list>.profile.json and tells whether the VARCHAR
+sizes of db_table_info hold the values.
+"""
+
+import hashlib
+import json
+import math
+import re
+from collections import Counter
+from operator import attrgetter
+
+DECLARED_LENGTH_PATTERN = re.compile(r"VARCHAR\((\d+)\)")
+PERCENTILES = (50, 90, 99)
+BATCH_SIZE = 4096
+
+
+def value_hash(value):
+    """
+    64 bit hash of a value, unlike hash() it is the same in every run
+    """
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class HyperLogLog(object):
+    """
+    Distinct count estimate in 2 ** precision registers, the standard error
+    is about 1.04 / sqrt(2 ** precision), 1.6% for the default precision
+    """
+
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+        self.width = 64 - precision
+
+    def update(self, values):
+        registers = self.registers
+        precision = self.precision
+        mask = self.m - 1
+        width = self.width + 1
+        for x in map(value_hash, values):
+            rank = width - (x >> precision).bit_length()
+            if rank > registers[x & mask]:
+                registers[x & mask] = rank
+
+    def estimate(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            # linear counting is more accurate for small counts
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+
+class ColumnProfile(object):
+    """
+    Profile of the values of one column, colinfo gives the declared length
+    """
+
+    def __init__(self, colname, colinfo, precision=12):
+        self.colname = colname
+        declared = DECLARED_LENGTH_PATTERN.search(colinfo)
+        self.declared_length = int(declared.group(1)) if declared else None
+        self.count = 0
+        self.empty = 0
+        self.distinct = HyperLogLog(precision)
+        self.lengths = Counter()
+        self.minimum = None
+        self.maximum = None
+
+    def update(self, values):
+        """
+        Adds a batch of values, None and "" are empty
+        """
+        self.count += len(values)
+        self.empty += len(values)
+        values = [value for value in values if value]
+        self.empty -= len(values)
+        if not values:
+            return
+        if not isinstance(values[0], str):
+            values = list(map(str, values))
+        self.distinct.update(set(values))
+        self.lengths.update(map(len, values))
+        numbers = list(map(int, filter(str.isdigit, values)))
+        if numbers:
+            minimum, maximum = min(numbers), max(numbers)
+            if self.minimum is None or minimum < self.minimum:
+                self.minimum = minimum
+            if self.maximum is None or maximum > self.maximum:
+                self.maximum = maximum
+
+    def length_percentiles(self):
+        """
+        Percentiles of the lengths of non-empty values
+        """
+        total = self.count - self.empty
+        percentiles = {}
+        if not total:
+            return percentiles
+        lengths = sorted(self.lengths.items())
+        for percentile in PERCENTILES:
+            rank = math.ceil(total * percentile / 100)
+            seen = 0
+            for length, count in lengths:
+                seen += count
+                if seen >= rank:
+                    percentiles["p%d" % percentile] = length
+                    break
+        return percentiles
+
+    def result(self):
+        profile = {
+            "count": self.count,
+            "empty": self.empty,
+            "empty_rate": round(self.empty / self.count, 6) if self.count else 0.0,
+            "distinct": self.distinct.estimate(),
+            "length": dict(self.length_percentiles(), max=max(self.lengths) if self.lengths else 0),
+        }
+        if self.declared_length is not None:
+            profile["declared_length"] = self.declared_length
+            profile["over_declared_length"] = sum(count for length, count in self.lengths.items() if length > self.declared_length)
+        if self.minimum is not None:
+            profile["min"] = self.minimum
+            profile["max"] = self.maximum
+        return profile
+
+
+class ProfileHook(object):
+    """
+    Record hook that profiles the columns of table_info and writes the
+    profile to path when it is closed. Records are kept until a batch is full
+    """
+
+    def __init__(self, path, table_info):
+        self.path = path
+        self.profiles = [ColumnProfile(col['colname'], col['colinfo']) for col in table_info['columns']]
+        self.getters = [attrgetter(profile.colname) for profile in self.profiles]
+        self.attributes = tuple(profile.colname for profile in self.profiles)
+        self.records = 0
+        self.batch = []
+
+    def add(self, record):
+        self.batch.append(record)
+        if len(self.batch) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        self.records += len(self.batch)
+        for profile, getter in zip(self.profiles, self.getters):
+            profile.update(list(map(getter, self.batch)))
+        self.batch = []
+
+    def close(self):
+        self.flush()
+        profile = {"records": self.records, "columns": dict((column.colname, column.result()) for column in self.profiles)}
+        with open(self.path, "w", encoding='utf-8') as profile_file:
+            json.dump(profile, profile_file, indent=1)
+            profile_file.write("\n")
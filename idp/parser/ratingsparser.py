@@ -16,8 +16,8 @@ along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from .baseparser import *
-from .moviesparser import MoviesParser
-import json
+from .records import Rating
+from .listspec import ListSpec
 
 
 class RatingsParser(BaseParser):
@@ -42,6 +42,7 @@ class RatingsParser(BaseParser):
     base_matcher_pattern = "\s*(\S*)\s*(\S*)\s*(\S*)\s*((.*? \(\S{4,}\)) ?(\(\S+\))? ?(?!\{\{SUSPENDED\}\})(\{(.*?) ?(\(\S+?\))?\})? ?(\{\{SUSPENDED\}\})?)$"
     input_file_name = "ratings.list"
     number_of_lines_to_be_skipped = 28
+    header_end_pattern = rb"^New[ \t]+Distribution[ \t]+Votes[ \t]+Rank[ \t]+Title[ \t]*\r?\n"
     db_table_info = {
         'tablename' : 'ratings',
         'columns' : [
@@ -52,53 +53,7 @@ class RatingsParser(BaseParser):
         ],
         'constraints' : 'PRIMARY KEY(title)'
     }
-    json_info = {
-        'keys' : [
-            {'distribution': 'string'},
-            {'votes': 'int'},
-            {'rank': 'float'}
-        ]
-    }
+    doc_type = "rating"
+    partitionable = True
     end_of_dump_delimiter = "------------------------------------------------------------------------------"
-
-    def __init__(self, preferences_map):
-        super(RatingsParser, self).__init__(preferences_map)
-        self.first_one = True
-
-
-    def parse_into_json(self, matcher):
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-            #if(MoviesParser.get_movie_type(matcher.group(5), matcher.group(6)) == MoviesParser.TYPE_MOVIE):
-            json_string = self.concat_regex_groups([1,2,3], [1,2,3], matcher, "rating")
-            json_obj = json.loads(json_string)
-            json_obj['year_released'] = MoviesParser.get_year_released(matcher.group(5))
-            json_obj['movie_name'] = MoviesParser.get_movie_name(matcher.group(5))
-            json_obj['movie_type'] = MoviesParser.get_movie_type(matcher.group(5), matcher.group(6))
-            self.json_file.write(json.dumps(json_obj) + "\n")
-        else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
-
-    def parse_into_tsv(self, matcher):
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-            self.tsv_file.write(self.concat_regex_groups([1,2,3,4], None, matcher) + "\n")
-        else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
-
-    def parse_into_db(self, matcher):
-        is_match = matcher.match(self.base_matcher_pattern)
-
-        if(is_match):
-            if(self.first_one):
-                self.sql_file.write("(" + self.concat_regex_groups([1,2,3,4], [0,1,2,3], matcher) + ")")
-                self.first_one = False;
-            else:
-                self.sql_file.write(",\n(" + self.concat_regex_groups([1,2,3,4], [0,1,2,3], matcher) + ")")
-        else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
+    row_spec = ListSpec(base_matcher_pattern, Rating, (1, 2, 3, 4, 5, 6))
@@ -0,0 +1,97 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Reading records of a list in process, without output files
+
+    from idp.parser.recordreader import iter_records
+
+    for credit in iter_records("actors", "/data/imdb/actors.list.gz"):
+        print(credit.surname, credit.title)
+
+Records are parsed while they are iterated, so memory use does not grow
+with the size of the list.
+"""
+
+import gzip
+import io
+from . import registry
+
+
+def open_list(source):
+    """
+    Opens a list for reading. source is the path of a list or of a .gz list,
+    or an opened file object in binary or text mode. gzip compressed file
+    objects are detected by their magic bytes
+    """
+    if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__'):
+        binary = open(source, "rb")
+    elif isinstance(source, io.TextIOBase):
+        return source
+    else:
+        binary = source
+    if not hasattr(binary, 'peek'):
+        binary = io.BufferedReader(binary)
+    if binary.peek(2)[:2] == b"\x1f\x8b":
+        binary = gzip.GzipFile(fileobj=binary, mode="rb")
+    return io.TextIOWrapper(binary, encoding='iso-8859-1')
+
+
+def iter_records(list_name, source, columns=None, max_reject_ratio=None):
+    """
+    Yields the records of a list, see records.py for their classes
+
+    list_name: name of the list as in registry.PARSERS, e.g. "actors"
+    source: see open_list, it is closed when the records end or the
+        iterator is closed
+    columns: optional names of the columns that are needed, the others are
+        not extracted and left empty, see BaseParser.select_columns
+    max_reject_ratio: see RejectSink, lines that cannot be parsed are
+        skipped and only counted otherwise
+    """
+    ParserClass = registry.get_parser_class(list_name)
+    preferences_map = {"mode": None, "input_dir": None, "output_dir": None, "max_reject_ratio": max_reject_ratio}
+    if columns:
+        preferences_map["columns"] = {ParserClass.list_name(): list(columns)}
+    input_file = open_list(source)
+    try:
+        parser = ParserClass(preferences_map, input_file)
+    except:
+        input_file.close()
+        raise
+    return RecordIterator(parser)
+
+
+class RecordIterator(object):
+    """
+    Iterator over the records of a parser. Unlike a bare generator, closing
+    it before the first record also closes the input
+    """
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.records = parser.records()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.records)
+
+    def close(self):
+        self.records.close()
+        self.parser.close()
@@ -0,0 +1,215 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Typed records produced by the parsers and consumed by the output writers
+
+Records use __slots__ so that millions of them can pass through the parsing
+loop without a per-instance __dict__. `fields` is the column order used by
+the TSV and SQL writers, to_json() returns the JSON document of a record.
+"""
+
+
+class Record(object):
+    __slots__ = ()
+    fields = ()
+    # columns that are properties reading a slot, column name -> slot
+    aliases = {}
+
+    def __repr__(self):
+        return "%s(%s)" % (type(self).__name__, ", ".join("%s=%r" % (slot, getattr(self, slot)) for slot in self.__slots__))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+
+class TitleRecord(Record):
+    """
+    Base class for records that carry a #TITLE
+
+    full_name and type are the raw "name (year)" and "(TV)" parts of the title,
+    the clean name, computed type and year are only worked out when requested
+    """
+    __slots__ = ()
+
+    @property
+    def movie_name(self):
+        from .moviesparser import MoviesParser
+        return MoviesParser.get_movie_name(self.full_name)
+
+    @property
+    def movie_type(self):
+        from .moviesparser import MoviesParser
+        return MoviesParser.get_movie_type(self.full_name, self.type)
+
+    @property
+    def year_released(self):
+        from .moviesparser import MoviesParser
+        return MoviesParser.get_year_released(self.full_name)
+
+
+class Movie(TitleRecord):
+    __slots__ = ('title', 'full_name', 'type', 'ep_name', 'ep_num', 'suspended', 'year')
+    fields = ('title', 'full_name', 'type', 'ep_name', 'ep_num', 'suspended', 'year')
+
+    def __init__(self, title, full_name, type, ep_name, ep_num, suspended, year):
+        self.title = title
+        self.full_name = full_name
+        self.type = type
+        self.ep_name = ep_name
+        self.ep_num = ep_num
+        self.suspended = suspended
+        self.year = year
+
+    def to_json(self):
+        return {
+            'movie_type': self.movie_type,
+            'movie_name': self.movie_name,
+            'year_released': self.year_released
+        }
+
+
+class Credit(TitleRecord):
+    """
+    One title of a person in actors, actresses or directors lists
+    """
+    __slots__ = ('name', 'surname', 'title', 'full_name', 'type', 'info_1', 'info_2', 'role')
+    fields = ('name', 'surname', 'title', 'info_1', 'info_2', 'role')
+    aliases = {'info': 'info_1'}
+
+    def __init__(self, name, surname, title, full_name, type, info_1, info_2="", role=""):
+        self.name = name
+        self.surname = surname
+        self.title = title
+        self.full_name = full_name
+        self.type = type
+        self.info_1 = info_1
+        self.info_2 = info_2
+        self.role = role
+
+    @property
+    def info(self):
+        """ directors.list has a single info column """
+        return self.info_1
+
+    def to_json(self):
+        return {
+            'name': self.name + " " + self.surname,
+            'movie_name_year': self.full_name,
+            'movie_type': self.movie_type,
+            'role': self.role,
+            'movie_name': self.movie_name,
+            'year_released': self.year_released
+        }
+
+
+class Genre(TitleRecord):
+    __slots__ = ('title', 'full_name', 'type', 'genre')
+    fields = ('title', 'genre')
+
+    def __init__(self, title, full_name, type, genre):
+        self.title = title
+        self.full_name = full_name
+        self.type = type
+        self.genre = genre
+
+    def to_json(self):
+        return {
+            'genre': self.genre,
+            'year_released': self.year_released,
+            'movie_name': self.movie_name,
+            'movie_type': self.movie_type
+        }
+
+
+class Rating(TitleRecord):
+    __slots__ = ('distribution', 'votes', 'rank', 'title', 'full_name', 'type')
+    fields = ('distribution', 'votes', 'rank', 'title')
+
+    def __init__(self, distribution, votes, rank, title, full_name, type):
+        self.distribution = distribution
+        self.votes = votes
+        self.rank = rank
+        self.title = title
+        self.full_name = full_name
+        self.type = type
+
+    def to_json(self):
+        return {
+            'distribution': self.distribution,
+            'votes': int(self.votes),
+            'rank': float(self.rank),
+            'year_released': self.year_released,
+            'movie_name': self.movie_name,
+            'movie_type': self.movie_type
+        }
+
+
+class Plot(Record):
+    __slots__ = ('title', 'plot')
+    fields = ('title', 'plot')
+
+    def __init__(self, title, plot):
+        self.title = title
+        self.plot = plot
+
+    def to_json(self):
+        return {'title': self.title, 'plot': self.plot}
+
+
+class Trivia(Record):
+    __slots__ = ('title', 'trivia')
+    fields = ('title', 'trivia')
+
+    def __init__(self, title, trivia):
+        self.title = title
+        self.trivia = trivia
+
+    def to_json(self):
+        return {'title': self.title, 'trivia': self.trivia}
+
+
+class AkaName(Record):
+    """
+    Another name of a person in aka-names.list
+    """
+    __slots__ = ('name', 'surname', 'aka_name')
+    fields = ('name', 'surname', 'aka_name')
+
+    def __init__(self, name, surname, aka_name):
+        self.name = name
+        self.surname = surname
+        self.aka_name = aka_name
+
+    def to_json(self):
+        return {'name': self.name + " " + self.surname, 'aka_name': self.aka_name}
+
+
+class AkaTitle(Record):
+    """
+    Another title of a title in aka-titles.list, info is e.g. the country
+    """
+    __slots__ = ('title', 'aka_title', 'info')
+    fields = ('title', 'aka_title', 'info')
+
+    def __init__(self, title, aka_title, info):
+        self.title = title
+        self.aka_title = aka_title
+        self.info = info
+
+    def to_json(self):
+        return {'title': self.title, 'aka_title': self.aka_title, 'info': self.info}
@@ -0,0 +1,52 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Registry of the parsers of interface lists
+
+Parser modules are imported only when their parser is requested, so listing
+parsers or parsing a single list doesn't pay for importing all of them.
+"""
+
+import importlib
+
+PARSERS = {
+    "actors": ("idp.parser.actorsparser", "ActorsParser"),
+    "actresses": ("idp.parser.actressesparser", "ActressesParser"),
+    "aka-names": ("idp.parser.akaparsers", "AkaNamesParser"),
+    "aka-titles": ("idp.parser.akaparsers", "AkaTitlesParser"),
+    "directors": ("idp.parser.directorsparser", "DirectorsParser"),
+    "genres": ("idp.parser.genresparser", "GenresParser"),
+    "movies": ("idp.parser.moviesparser", "MoviesParser"),
+    "plot": ("idp.parser.plotparser", "PlotParser"),
+    "ratings": ("idp.parser.ratingsparser", "RatingsParser"),
+    "trivia": ("idp.parser.triviaparser", "TriviaParser")
+}
+
+
+def list_names():
+    return sorted(PARSERS)
+
+
+def get_parser_class(name):
+    """
+    Imports and returns the parser class of a list, raises KeyError for unknown lists
+    """
+    if name not in PARSERS:
+        raise KeyError("No parser registered for list: " + name)
+    module_name, class_name = PARSERS[name]
+    return getattr(importlib.import_module(module_name), class_name)
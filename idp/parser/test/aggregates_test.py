@@ -0,0 +1,59 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from collections import namedtuple
+from ..actorsparser import ActorsParser
+from ..aggregates import AGGREGATES, Count, TopK, TopRuns
+
+ACTORS = """THE ACTORS LIST
+===============
+
+Name			Titles
+----			------
+Bacon, Kevin		Footloose (1984)  [Ren]
+			Tremors (1990)  [Valentine]
+
+Ward, Fred		Tremors (1990)  [Earl]
+			Henry & June (1990)  [Henry Miller]
+			Remo Williams: The Adventure Begins (1985)  [Remo]
+
+Loner, Lonely		Nobody Watched (2001)
+"""
+
+Rating = namedtuple("Rating", ["votes", "rank", "title"])
+
+
+class AggregateTests(unittest.TestCase):
+    def test_aggregates(self):
+        ratings = [Rating("10", "7.5", "A"), Rating("300", "7.9", "B"), Rating("20", "8.1", "C"), Rating("5", "2.0", "D")]
+        count = Count("rank_histogram", ("rank",), key=lambda rank: rank.split(".")[0])
+        top = TopK("most_votes", ("votes", "title"), 2, key=lambda votes, title: (int(votes), title))
+        runs = TopRuns("runs", ("rank",), 1, key=lambda rank: rank[0])
+        for rating in ratings:
+            for aggregate in (count, top, runs):
+                aggregate.add(rating)
+        self.assertEqual(count.result(), {"2": 1, "7": 2, "8": 1})
+        self.assertEqual(top.result(), [["B", 300], ["C", 20]])
+        self.assertEqual(runs.result(), {"runs": 3, "top": [["7", 2]]})
+
+    def test_summary_file(self):
+        output_dir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(output_dir, "actors.list"), "w", encoding='iso-8859-1') as list_file:
+                list_file.write(ACTORS)
+            preferences_map = {"mode": "TSV", "input_dir": output_dir, "output_dir": output_dir, "aggregates": True}
+            ActorsParser(preferences_map).start_processing()
+            with open(os.path.join(output_dir, "actors.list.aggregates.json"), encoding='utf-8') as summary_file:
+                summary = json.load(summary_file)
+        finally:
+            shutil.rmtree(output_dir)
+        self.assertEqual(summary["records"], 6)
+        self.assertEqual(summary["credits_per_year"], {"1984": 1, "1985": 1, "1990": 3, "2001": 1})
+        self.assertEqual(summary["most_credited"], {"runs": 3, "top": [["Ward, Fred", 3], ["Bacon, Kevin", 2], ["Loner, Lonely", 1]]})
+        self.assertEqual(sorted(AGGREGATES), ["actors", "actresses", "directors", "genres", "movies", "ratings"])
+
+
+if __name__ == '__main__':
+    unittest.main()
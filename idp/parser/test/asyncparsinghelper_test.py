@@ -0,0 +1,67 @@
+import asyncio
+import time
+import unittest
+from ..asyncparsinghelper import AsyncParsingHelper
+
+
+def fake_parse(item, preferences_map, gzip_path):
+    time.sleep(0.05)
+    return True
+
+
+def failing_parse(item, preferences_map, gzip_path):
+    return item != "genres"
+
+
+class FakeHelper(AsyncParsingHelper):
+    def __init__(self, *args, **kwargs):
+        super(FakeHelper, self).__init__(*args, **kwargs)
+        self.parse_function = fake_parse
+        self.downloaded = []
+        self.loaded = []
+
+    async def download(self, item):
+        await asyncio.sleep(0.01)
+        self.downloaded.append(item)
+        return None
+
+    async def load(self, item):
+        self.loaded.append(item)
+
+
+class AsyncParsingHelperTests(unittest.TestCase):
+    def setUp(self):
+        self.preferences_map = {"mode": "TSV", "input_dir": "", "output_dir": ""}
+        self.lists = ["movies", "genres", "ratings", "plot"]
+
+    def test_all_stages_see_every_list(self):
+        helper = FakeHelper(self.preferences_map, self.lists, workers=2, load_command="unused")
+        asyncio.run(helper.run())
+        self.assertEqual(helper.downloaded, self.lists)
+        self.assertEqual(sorted(helper.loaded), sorted(self.lists))
+        self.assertEqual([stats.items for stats in helper.stats], [4, 4, 4])
+        self.assertGreater(helper.stats[1].working, 0)
+
+    def test_failed_lists_are_not_loaded(self):
+        helper = FakeHelper(self.preferences_map, self.lists, workers=2, load_command="unused")
+        helper.parse_function = failing_parse
+        asyncio.run(helper.run())
+        self.assertEqual(sorted(helper.loaded), ["movies", "plot", "ratings"])
+
+    def test_cancellation(self):
+        helper = FakeHelper(self.preferences_map, self.lists * 10, workers=1)
+
+        async def run_and_cancel():
+            task = asyncio.ensure_future(helper.run())
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run_and_cancel())
+        self.assertLess(helper.stats[1].items, len(self.lists) * 10)
+        self.assertTrue(all(task.done() for task in helper.tasks))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from ..creditgraph import CreditGraph, credits_of_lists, person_name
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+ACTORS = """THE ACTORS LIST
+===============
+
+Name			Titles
+----			------
+Bacon, Kevin		Footloose (1984)  [Ren]
+			Tremors (1990)  [Valentine]
+
+Ward, Fred		Tremors (1990)  [Earl]
+			Henry & June (1990)  [Henry Miller]
+
+Loner, Lonely		Nobody Watched (2001)
+"""
+
+ACTRESSES = """THE ACTRESSES LIST
+==================
+
+Name			Titles
+----			------
+Thurman, Uma		Henry & June (1990)  [June Miller]
+			Pulp Fiction (1994)  [Mia]
+"""
+
+
+class CreditGraphTests(unittest.TestCase):
+    def test_credits_of_lists(self):
+        credits = list(credits_of_lists([("actors", io.StringIO(ACTORS)), ("actresses", io.StringIO(ACTRESSES))]))
+        self.assertEqual(credits[0], ("Bacon, Kevin", "Footloose (1984)"))
+        self.assertEqual(credits[-1], ("Thurman, Uma", "Pulp Fiction (1994)"))
+        self.assertEqual(len(credits), 7)
+        self.assertEqual(person_name("Madonna", ""), "Madonna")
+
+    @unittest.skipUnless(numpy, "numpy is not installed")
+    def test_graph(self):
+        graph = CreditGraph.from_credits(credits_of_lists([("actors", io.StringIO(ACTORS)), ("actresses", io.StringIO(ACTRESSES))]))
+        self.assertEqual(graph.persons, ["Bacon, Kevin", "Ward, Fred", "Loner, Lonely", "Thurman, Uma"])
+        self.assertEqual([graph.titles[title] for title in graph.titles_of(graph.person_id("Ward, Fred"))], ["Tremors (1990)", "Henry & June (1990)"])
+        self.assertEqual([graph.persons[person] for person in graph.persons_of(graph.titles.index("Tremors (1990)"))], ["Bacon, Kevin", "Ward, Fred"])
+
+        bacon = graph.person_id("Bacon, Kevin")
+        self.assertEqual(graph.distances(bacon).tolist(), [0, 1, -1, 2])
+        self.assertEqual(graph.distances(bacon, max_depth=1).tolist(), [0, 1, -1, -1])
+        path = graph.shortest_path(bacon, graph.person_id("Thurman, Uma"))
+        self.assertEqual([graph.persons[node] if position % 2 == 0 else graph.titles[node] for position, node in enumerate(path)],
+                         ["Bacon, Kevin", "Tremors (1990)", "Ward, Fred", "Henry & June (1990)", "Thurman, Uma"])
+        self.assertIsNone(graph.shortest_path(bacon, graph.person_id("Loner, Lonely")))
+        self.assertEqual(graph.shortest_path(bacon, bacon), [bacon])
+
+    @unittest.skipUnless(numpy, "numpy is not installed")
+    def test_save_and_load(self):
+        directory = tempfile.mkdtemp()
+        try:
+            graph = CreditGraph.from_credits([("A", "X (2000)"), ("B", "X (2000)"), ("B", "Y (2001)")])
+            graph.save(directory)
+            loaded = CreditGraph.load(directory)
+            self.assertIsInstance(loaded.person_indptr, numpy.memmap)
+            self.assertEqual(loaded.persons, ["A", "B"])
+            self.assertEqual(loaded.titles, ["X (2000)", "Y (2001)"])
+            self.assertEqual(loaded.title_indptr.tolist(), [0, 2, 3])
+            self.assertEqual(loaded.title_persons.tolist(), [0, 1, 1])
+            self.assertEqual(loaded.distances(0).tolist(), [0, 1])
+            del loaded
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import io
+import unittest
+from ..dataframeloader import collect_columns, load_dataframe, CategoricalColumn, NumericColumn, StringColumn
+from ..records import Rating
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+RATINGS = """MOVIE RATINGS REPORT
+
+New  Distribution  Votes  Rank  Title
+      0000000125  1234   8.5  Anno 2033 (1973)
+      0000001222    17   6.1  "Synthetic" (2001) {(#1.1)}
+      0000000125    99   7.0  Unknown (????)
+"""
+
+
+class DataFrameLoaderTests(unittest.TestCase):
+    def test_collect_columns(self):
+        ratings = [
+            Rating("0000000125", "1234", "8.5", "Anno 2033 (1973)", "Anno 2033 (1973)", ""),
+            Rating("0000001222", "17", "6.1", "Synthetic (2001) (TV)", "Synthetic (2001)", "(TV)"),
+            Rating("0000000125", "99", "7.0", "Unknown (????)", "Unknown (????)", "")
+        ]
+        distribution, votes, year, title = collect_columns(ratings, ["distribution", "votes", "year_released", "title"])
+        self.assertIsInstance(distribution, CategoricalColumn)
+        self.assertEqual(list(distribution.codes), [0, 1, 0])
+        self.assertEqual(distribution.categories(), ["0000000125", "0000001222"])
+        self.assertIsInstance(votes, NumericColumn)
+        self.assertEqual(list(votes.values), [1234, 17, 99])
+        # unknown years are missing
+        self.assertEqual(list(year.values), [1973, 2001, 0])
+        self.assertEqual(list(year.mask), [0, 0, 1])
+        self.assertIsInstance(title, StringColumn)
+        self.assertEqual(title.values[1], "Synthetic (2001) (TV)")
+
+    def test_empty_strings_are_missing_categories(self):
+        column = CategoricalColumn()
+        for value in ("(voice)", "", "(uncredited)", "(voice)"):
+            column.add(value)
+        self.assertEqual(list(column.codes), [0, -1, 1, 0])
+        self.assertEqual(column.categories(), ["(voice)", "(uncredited)"])
+
+    @unittest.skipUnless(pandas, "pandas is not installed")
+    def test_load_dataframe(self):
+        frame = load_dataframe("ratings", io.StringIO(RATINGS), columns=["title", "votes", "rank", "movie_type", "year_released"])
+        self.assertEqual(list(frame.columns), ["title", "votes", "rank", "movie_type", "year_released"])
+        self.assertEqual(str(frame["votes"].dtype), "Int32")
+        self.assertEqual(str(frame["rank"].dtype), "Float32")
+        self.assertEqual(str(frame["movie_type"].dtype), "category")
+        self.assertEqual(frame["votes"].tolist(), [1234, 17, 99])
+        self.assertEqual(frame["year_released"].isna().tolist(), [False, False, True])
+        self.assertEqual(frame["movie_type"].tolist(), ["(MOVIE)", "(TV_SERIES)", "(MOVIE)"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import unittest
+from ..episodeindex import EpisodeIndex, EpisodeIndexBuilder, parse_episode_number
+from ..moviesparser import MoviesParser
+
+MOVIES = """MOVIES LIST
+===========
+
+"'Allo 'Allo!" (1982)					1982-1992
+"'Allo 'Allo!" (1982) {A Bun in the Oven (#8.0)}	1991
+"'Allo 'Allo!" (1982) {Desperate Doings (#3.5)}	1986
+"'Allo 'Allo!" (1982) {The Nicked Airmen (#1.2)}	1984
+"'Allo 'Allo!" (1982) {Pilot (#1.0)}	1982
+"$weepstake$" (1979)					1979-????
+"$weepstake$" (1979) {(#1.1)}				1979
+"Daily Show" (1996) {(2001-01-05)}			2001
+Anno 2033 (1973)					1973
+--------------------------------------------------------------------------------
+"""
+
+
+class EpisodeIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.preferences_map = {"mode": "TSV", "input_dir": self.output_dir, "output_dir": self.output_dir, "episode_index": True}
+        with open(os.path.join(self.output_dir, "movies.list"), "w", encoding='iso-8859-1') as list_file:
+            list_file.write(MOVIES)
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_parse_episode_number(self):
+        self.assertEqual(parse_episode_number("(#8.12)"), (8, 12))
+        self.assertEqual(parse_episode_number("(2001-01-05)"), (-1, -1))
+        self.assertEqual(parse_episode_number(""), (-1, -1))
+
+    def test_built_while_parsing(self):
+        MoviesParser(self.preferences_map).start_processing()
+        index = EpisodeIndex.load(os.path.join(self.output_dir, "movies.list.episodes"))
+        self.assertEqual(index.series, ['"$weepstake$" (1979)', '"\'Allo \'Allo!" (1982)', '"Daily Show" (1996)'])
+        self.assertEqual(list(index.offsets), [0, 1, 5, 6])
+        self.assertEqual(index.episodes('"\'Allo \'Allo!" (1982)'), [
+            (1, 0, '"\'Allo \'Allo!" (1982) {Pilot (#1.0)}'),
+            (1, 2, '"\'Allo \'Allo!" (1982) {The Nicked Airmen (#1.2)}'),
+            (3, 5, '"\'Allo \'Allo!" (1982) {Desperate Doings (#3.5)}'),
+            (8, 0, '"\'Allo \'Allo!" (1982) {A Bun in the Oven (#8.0)}')
+        ])
+        self.assertEqual(index.season_counts('"\'Allo \'Allo!" (1982)'), [(1, 2), (3, 1), (8, 1)])
+        self.assertEqual(index.season_counts('"Daily Show" (1996)'), [(-1, 1)])
+        with self.assertRaises(KeyError):
+            index.series_id("Anno 2033 (1973)")
+
+    def test_columns_keep_hook_attributes(self):
+        self.preferences_map["columns"] = {"movies": ["year"]}
+        MoviesParser(self.preferences_map).start_processing()
+        index = EpisodeIndex.load(os.path.join(self.output_dir, "movies.list.episodes"))
+        self.assertEqual(len(index.titles), 6)
+
+    def test_empty_index(self):
+        builder = EpisodeIndexBuilder(os.path.join(self.output_dir, "empty"))
+        builder.close()
+        index = EpisodeIndex.load(os.path.join(self.output_dir, "empty"))
+        self.assertEqual((index.series, list(index.offsets), index.titles), ([], [0], []))
+
+
+if __name__ == '__main__':
+    unittest.main()
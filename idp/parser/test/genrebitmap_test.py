@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+import unittest
+from ..genrebitmap import GenreBitmaps, GenreBitmapBuilder
+from ..genresparser import GenresParser
+
+GENRES = """THE GENRES LIST
+===============
+
+"'Allo 'Allo!" (1982)					Comedy
+"'Allo 'Allo!" (1982)					War
+Anno 2033 (1973)					Comedy
+Anno 2033 (1973)					Drama
+Anno 2033 (1973)					Short
+Cry-Baby (1990)						Comedy
+Cry-Baby (1990)						Drama
+Cry-Baby (1990)						Musical
+Ed Wood (1994)						Drama
+"""
+
+
+class GenreBitmapTests(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.output_dir, "genres.list"), "w", encoding='iso-8859-1') as list_file:
+            list_file.write(GENRES)
+        preferences_map = {"mode": "TSV", "input_dir": self.output_dir, "output_dir": self.output_dir, "genre_bitmap": True}
+        GenresParser(preferences_map).start_processing()
+        self.bitmaps = GenreBitmaps.load(os.path.join(self.output_dir, "genres.list.bitmap"))
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_dictionary(self):
+        self.assertEqual(self.bitmaps.genres, ["Comedy", "War", "Drama", "Short", "Musical"])
+        self.assertEqual(self.bitmaps.titles, ['"\'Allo \'Allo!" (1982)', "Anno 2033 (1973)", "Cry-Baby (1990)", "Ed Wood (1994)"])
+        self.assertEqual(list(self.bitmaps.bitmaps), [0b00011, 0b01101, 0b10101, 0b00100])
+        self.assertEqual(self.bitmaps.genres_of("Cry-Baby (1990)"), ["Comedy", "Drama", "Musical"])
+
+    def test_select(self):
+        self.assertEqual(self.bitmaps.select_titles(all_of=["Comedy", "Drama"], none_of=["Short"]), ["Cry-Baby (1990)"])
+        self.assertEqual(self.bitmaps.select_titles(any_of=["War", "Short"]), ['"\'Allo \'Allo!" (1982)', "Anno 2033 (1973)"])
+        self.assertEqual(list(self.bitmaps.select(all_of=["Drama"], any_of=["Musical", "Short"])), [1, 2])
+        self.assertEqual(len(self.bitmaps.select()), 4)
+        with self.assertRaises(KeyError):
+            self.bitmaps.select(all_of=["Western"])
+
+    def test_many_genres(self):
+        builder = GenreBitmapBuilder(os.path.join(self.output_dir, "many"))
+        builder.title_bitmaps = {"A (2000)": 1 << 40}
+        builder.bits = dict(("Genre%d" % bit, 1 << bit) for bit in range(41))
+        bitmaps = builder.build()
+        self.assertEqual(bitmaps.bitmaps.typecode, 'Q')
+        self.assertEqual(bitmaps.select_titles(all_of=["Genre40"]), ["A (2000)"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+import unittest
+from ..listspec import ListSpec, Carry, split_person_name, project_pattern
+from ..records import Credit, Genre
+from ..actorsparser import ActorsParser
+from ..registry import get_parser_class
+
+AKA_NAMES = """CRC: 0x1A2B3C4D  File: aka-names.list  Date: Fri Dec 19 00:00:00 2014
+
+AKA NAMES LIST
+==============
+
+'Babs' Bradley, Barbara
+   (aka Bradley, Babs)
+   (aka Bradley, B.)
+
+Madonna
+   (aka Ciccone, Madonna Louise)
+"""
+
+AKA_TITLES = """AKA TITLES LIST
+===============
+
+"#1 Single" (2006)
+   (aka "Cold Turkey" (2006))	(USA) (working title)
+
+Anno 2033 (1973)
+   (aka Year 2033 (1973))
+this line is not an aka line of a title, it is a title
+"""
+
+
+class ListSpecTests(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.preferences_map = {"mode": "TSV", "input_dir": self.output_dir, "output_dir": self.output_dir}
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_row_function(self):
+        rejected = []
+        spec = ListSpec(r"(.*?)\t+(.*? \(\d{4}\))(?: (\[.*\]))?$", Credit, ('name', 'surname', 2, 2, 3, 3),
+                        carry=Carry(1, ('name', 'surname'), split_person_name), skip_blank=True)
+        parse_line = spec.row_function(rejected.append)
+        self.assertEqual(parse_line("Depp, Johnny\tCry-Baby (1990) [Wade]\n"), Credit("Johnny", "Depp", "Cry-Baby (1990)", "Cry-Baby (1990)", "[Wade]", "[Wade]"))
+        # the person is carried over and the missing group is an empty string
+        self.assertEqual(parse_line("\t\tEd Wood (1994)\n"), Credit("Johnny", "Depp", "Ed Wood (1994)", "Ed Wood (1994)", "", ""))
+        self.assertIsNone(parse_line("\n"))
+        self.assertIsNone(parse_line("no tab\n"))
+        self.assertEqual(rejected, ["no tab\n"])
+        # every row function has its own carried values
+        self.assertEqual(spec.row_function(rejected.append)("\tEd Wood (1994)\n").name, "")
+
+    def test_spec_errors(self):
+        with self.assertRaises(ValueError):
+            ListSpec("(.*)\t(.*)", Genre, (1, 'full_name', 2, 2))
+        with self.assertRaises(ValueError):
+            Carry(1, ('name', 'surname'))
+
+    def test_project_pattern(self):
+        self.assertEqual(project_pattern(r"(a)(b(c))\((d)", {2, 4}), (r"(?:a)(b(?:c))\((d)", {2: 1, 4: 2}))
+        # parentheses in character classes are not groups
+        self.assertEqual(project_pattern(r"([(])[]()](x)(?:y)", {2}), (r"(?:[(])[]()](x)(?:y)", {2: 1}))
+
+    def test_project(self):
+        line = "Depp, Johnny\tCry-Baby (1990) (TV)  (as J. Depp)  [Wade Walker]  <1>\n"
+        rejected = []
+        full = ActorsParser.row_spec.row_function(rejected.append)
+        projected_spec = ActorsParser.row_spec.project({'title', 'role'})
+        projected = projected_spec.row_function(rejected.append)
+        self.assertEqual(projected_spec.pattern.count("(?:"), ActorsParser.row_spec.pattern.count("(?:") + 10)
+        # the person is not carried any more
+        self.assertIsNone(projected_spec.carry)
+        record = full(line)
+        self.assertEqual(projected(line), Credit("", "", record.title, "", "", "", "", record.role))
+        self.assertEqual(ActorsParser.row_spec.project({'surname'}).row_function(rejected.append)(line).surname, "Depp")
+        self.assertIsNone(projected("bad line\n"))
+        self.assertEqual(rejected, ["bad line\n"])
+
+    def test_columns(self):
+        self.preferences_map["columns"] = {"aka-titles": ["info", "title"]}
+        self.assertEqual(self.parse("aka-titles", AKA_TITLES), [
+            ["(USA) (working title)", "\"#1 Single\" (2006)"],
+            ["", "Anno 2033 (1973)"]
+        ])
+        with self.assertRaises(ValueError):
+            ActorsParser.select_columns(["title", "budget"])
+
+    def test_column_aliases(self):
+        # the info column of directors.list is read from the info_1 slot
+        directors = "THE DIRECTORS LIST\n==================\n\nName\t\t\tTitles\n----\t\t\t------\n" \
+            "Waters, John\t\tCry-Baby (1990)  (as J. Waters)\n\t\t\tPink Flamingos (1972)\n"
+        self.preferences_map["columns"] = {"directors": ["info"]}
+        self.assertEqual(self.parse("directors", directors), [["(as J. Waters)"], [""]])
+
+    def parse(self, list_name, content):
+        ParserClass = get_parser_class(list_name)
+        with open(os.path.join(self.output_dir, ParserClass.input_file_name), "w", encoding='iso-8859-1') as list_file:
+            list_file.write(content)
+        ParserClass(self.preferences_map).start_processing()
+        with open(os.path.join(self.output_dir, ParserClass.input_file_name + ".tsv"), encoding='utf-8') as tsv_file:
+            return [line.rstrip("\n").split("\t") for line in tsv_file]
+
+    def test_aka_names(self):
+        self.assertEqual(self.parse("aka-names", AKA_NAMES), [
+            ["Barbara", "'Babs' Bradley", "Bradley, Babs"],
+            ["Barbara", "'Babs' Bradley", "Bradley, B."],
+            ["Madonna", "", "Ciccone, Madonna Louise"]
+        ])
+
+    def test_title_filter(self):
+        self.preferences_map["title_filter"] = {"Anno 2033 (1973)"}
+        self.assertEqual(self.parse("aka-titles", AKA_TITLES), [["Anno 2033 (1973)", "Year 2033 (1973)", ""]])
+        # aka names have no title, the filter does not apply to them
+        self.assertEqual(len(self.parse("aka-names", AKA_NAMES)), 3)
+
+    def test_title_filter_on_credits(self):
+        actors = "THE ACTORS LIST\n===============\n\nName\t\t\tTitles\n----\t\t\t------\n" \
+            "Depp, Johnny\t\tCry-Baby (1990)  [Wade Walker]  <1>\n\t\t\tEd Wood (1994)  (as J. Depp)\n\t\t\tEd Wood (1994)\n\t\t\tPlatoon (1986)  [Lerner]\n"
+        self.preferences_map["title_filter"] = {"Cry-Baby (1990)", "Ed Wood (1994)"}
+        self.assertEqual([row[2].rstrip() for row in self.parse("actors", actors)], ["Cry-Baby (1990)", "Ed Wood (1994)", "Ed Wood (1994)"])
+
+    def test_aka_titles(self):
+        self.assertEqual(self.parse("aka-titles", AKA_TITLES), [
+            ["\"#1 Single\" (2006)", "\"Cold Turkey\" (2006)", "(USA) (working title)"],
+            ["Anno 2033 (1973)", "Year 2033 (1973)", ""]
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
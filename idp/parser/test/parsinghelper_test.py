@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+import unittest
+from ..parsinghelper import ParsingHelper
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "samples")
+
+
+class ParsingHelperTests(unittest.TestCase):
+    def setUp(self):
+        self.input_dir = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+        shutil.copy(os.path.join(SAMPLES_DIR, "movies.list"), self.input_dir)
+        self.preferences_map = {"mode": "TSV", "input_dir": self.input_dir, "output_dir": self.output_dir}
+
+    def tearDown(self):
+        shutil.rmtree(self.input_dir)
+        shutil.rmtree(self.output_dir)
+
+    def read_titles(self):
+        with open(os.path.join(self.output_dir, "movies.list.tsv"), encoding='utf-8') as tsv_file:
+            return [line.split("\t")[0] for line in tsv_file]
+
+    def test_parse_status(self):
+        self.assertTrue(ParsingHelper.parse_one("movies", self.preferences_map))
+        # ratings.list is not in the input directory
+        self.assertFalse(ParsingHelper.parse_one("ratings", self.preferences_map))
+        self.assertFalse(ParsingHelper.parse_one("budgets", self.preferences_map))
+
+    def test_title_filter(self):
+        title_filter = ParsingHelper.build_title_filter(self.preferences_map, "type == 'MOVIE'", exact=True)
+        self.assertIn("Anno 2033 (1973)", title_filter)
+        self.assertNotIn("Anno 2006 (2007) (TV)", title_filter)
+        self.assertNotIn("\"'Allo 'Allo!\" (1982)", title_filter)
+
+        self.preferences_map["title_filter"] = title_filter
+        ParsingHelper.parse_one("movies", self.preferences_map)
+        titles = self.read_titles()
+        self.assertIn("Anno 2033 (1973)", titles)
+        self.assertFalse(any(title.startswith("\"") for title in titles))
+        self.assertNotIn("Anno 2006 (2007) (TV)", titles)
+        self.assertEqual(len(titles), len(title_filter))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import io
+import shutil
+import tempfile
+import unittest
+from ..plotparser import PlotParser
+from ..triviaparser import TriviaParser
+
+PLOT_LIST = """-------------------------------------------------------------------------------
+MV: "#1 Single" (2006)
+
+PL: Singer/songwriter Lisa Loeb, who has been unlucky
+PL: in love, moves to New York.
+
+BY: Anonymous
+
+-------------------------------------------------------------------------------
+MV: Anno 2033 (1973)
+
+PL: The last entry.
+
+BY: Anonymous
+"""
+
+TRIVIA_LIST = """# "#1 Single" (2006)
+- First item,
+  continued.
+
+- Second item.
+
+# Anno 2033 (1973)
+- Last item"""
+
+
+class BlockParserTests(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.preferences_map = {"mode": "TSV", "input_dir": "", "output_dir": self.output_dir}
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def parse(self, parser_class, content):
+        content = "\n" * parser_class.number_of_lines_to_be_skipped + content
+        parser = parser_class(self.preferences_map, io.StringIO(content))
+        parser.start_processing()
+        with open(parser.filehandler.tsv_path(), encoding='utf-8') as tsv_file:
+            return tsv_file.read().splitlines()
+
+    def test_plot_keeps_last_entry(self):
+        self.assertEqual(self.parse(PlotParser, PLOT_LIST), [
+            "\"#1 Single\" (2006)\tSinger/songwriter Lisa Loeb, who has been unlucky in love, moves to New York.",
+            "Anno 2033 (1973)\tThe last entry."
+        ])
+
+    def test_trivia_items(self):
+        self.assertEqual(self.parse(TriviaParser, TRIVIA_LIST), [
+            "\"#1 Single\" (2006)\tFirst item, continued.",
+            "\"#1 Single\" (2006)\tSecond item.",
+            "Anno 2033 (1973)\tLast item"
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from ..actorsparser import ActorsParser
+from ..profiler import ColumnProfile, HyperLogLog, value_hash
+
+ACTORS = """THE ACTORS LIST
+===============
+
+Name			Titles
+----			------
+Bacon, Kevin		Footloose (1984)  [Ren]
+			Tremors (1990)  [Valentine]
+
+Ward, Fred		Tremors (1990)  [Earl]
+			Henry & June (1990)
+
+Loner		Nobody Watched (2001)
+"""
+
+
+class ProfilerTests(unittest.TestCase):
+    def test_hyperloglog(self):
+        for count in (10, 1000, 100000):
+            distinct = HyperLogLog()
+            distinct.update(str(value) for value in range(count))
+            distinct.update(str(value) for value in range(count))
+            self.assertAlmostEqual(distinct.estimate(), count, delta=max(1, count * 0.05))
+        self.assertEqual(HyperLogLog().estimate(), 0)
+
+    def test_stable_hash(self):
+        # profiles of deterministic runs must not depend on PYTHONHASHSEED
+        self.assertEqual(value_hash("Ed Wood (1994)"), 11354617162626536706)
+
+    def test_column_profile(self):
+        profile = ColumnProfile("votes", "VARCHAR(3)")
+        profile.update(["12", "", None, "7", "1234", "n/a"])
+        profile.update(["12"])
+        self.assertEqual(profile.result(), {
+            "count": 7, "empty": 2, "empty_rate": round(2 / 7, 6), "distinct": 4,
+            "length": {"p50": 2, "p90": 4, "p99": 4, "max": 4},
+            "declared_length": 3, "over_declared_length": 1, "min": 7, "max": 1234
+        })
+
+    def test_profile_file(self):
+        output_dir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(output_dir, "actors.list"), "w", encoding='iso-8859-1') as list_file:
+                list_file.write(ACTORS)
+            preferences_map = {"mode": "TSV", "input_dir": output_dir, "output_dir": output_dir, "profile": True,
+                               "columns": {"actors": ["surname", "role", "year_released"]}}
+            ActorsParser(preferences_map).start_processing()
+            with open(os.path.join(output_dir, "actors.list.profile.json"), encoding='utf-8') as profile_file:
+                profile = json.load(profile_file)
+        finally:
+            shutil.rmtree(output_dir)
+        self.assertEqual(profile["records"], 5)
+        self.assertEqual(sorted(profile["columns"]), ["role", "surname", "year_released"])
+        self.assertEqual(profile["columns"]["role"]["empty"], 2)
+        self.assertEqual(profile["columns"]["surname"]["distinct"], 2)
+        self.assertEqual((profile["columns"]["year_released"]["min"], profile["columns"]["year_released"]["max"]), (1984, 2001))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from ..recordreader import iter_records
+from ..records import Credit, Plot
+
+ACTORS = """THE ACTORS LIST
+===============
+
+Name			Titles
+----			------
+Depp, Johnny		Cry-Baby (1990)  [Wade Walker]  <1>
+			Ed Wood (1994)  [Ed Wood]  <1>
+
+Madonna		Evita (1996)  [Eva Peron]  <1>
+this line cannot be parsed
+
+-----------------------------------------------------------------------------
+"""
+
+PLOT = """PLOT SUMMARIES LIST
+===================
+
+-------------------------------------------------------------------------------
+MV: Anno 2033 (1973)
+
+PL: First line
+PL: second line.
+
+BY: Someone
+"""
+
+
+class RecordReaderTests(unittest.TestCase):
+    def setUp(self):
+        self.input_dir = tempfile.mkdtemp()
+        # the spaces before the role are part of the title, as in the TSV outputs
+        self.credits = [
+            Credit("Johnny", "Depp", "Cry-Baby (1990)  ", "Cry-Baby (1990)", "", "", "", "[Wade Walker]"),
+            Credit("Johnny", "Depp", "Ed Wood (1994)  ", "Ed Wood (1994)", "", "", "", "[Ed Wood]"),
+            Credit("Madonna", "", "Evita (1996)  ", "Evita (1996)", "", "", "", "[Eva Peron]")
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.input_dir)
+
+    def write(self, name, content, opener=open):
+        path = os.path.join(self.input_dir, name)
+        with opener(path, "wb") as list_file:
+            list_file.write(content.encode('iso-8859-1'))
+        return path
+
+    def test_paths(self):
+        self.assertEqual(list(iter_records("actors", self.write("actors.list", ACTORS))), self.credits)
+        self.assertEqual(list(iter_records("actors", self.write("actors.list.gz", ACTORS, gzip.open))), self.credits)
+
+    def test_file_objects(self):
+        self.assertEqual(list(iter_records("actors", io.BytesIO(ACTORS.encode('iso-8859-1')))), self.credits)
+        self.assertEqual(list(iter_records("actors", io.BytesIO(gzip.compress(ACTORS.encode('iso-8859-1'))))), self.credits)
+        self.assertEqual(list(iter_records("actors", io.StringIO(ACTORS))), self.credits)
+
+    def test_multi_line_records(self):
+        self.assertEqual(list(iter_records("plot", io.StringIO(PLOT))), [Plot("Anno 2033 (1973)", "First line second line.")])
+
+    def test_columns(self):
+        records = iter_records("actors", io.StringIO(ACTORS), columns=["title"])
+        self.assertEqual([(credit.title, credit.surname, credit.role) for credit in records], [
+            ("Cry-Baby (1990)  ", "", ""), ("Ed Wood (1994)  ", "", ""), ("Evita (1996)  ", "", "")
+        ])
+
+    def test_closing_closes_input(self):
+        input_file = open(self.write("actors.list", ACTORS), "rb")
+        records = iter_records("actors", input_file)
+        self.assertEqual(next(records), self.credits[0])
+        records.close()
+        self.assertTrue(input_file.closed)
+        # no reject file or log is written anywhere
+        self.assertEqual(os.listdir(self.input_dir), ["actors.list"])
+
+        input_file = open(self.write("actors.list", ACTORS), "rb")
+        iter_records("actors", input_file).close()
+        self.assertTrue(input_file.closed)
+
+    def test_header_error_closes_input(self):
+        source = io.BytesIO(gzip.compress(ACTORS.encode('iso-8859-1'))[:30])
+        with self.assertRaises(EOFError):
+            list(iter_records("actors", source))
+        self.assertTrue(source.closed)
+
+    def test_unknown_list(self):
+        with self.assertRaises(KeyError):
+            iter_records("budgets", io.StringIO(""))
+
+
+if __name__ == '__main__':
+    unittest.main()
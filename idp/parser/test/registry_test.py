@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+import unittest
+from .. import registry
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..")
+
+
+class RegistryTests(unittest.TestCase):
+    def test_get_parser_class(self):
+        ParserClass = registry.get_parser_class("movies")
+        self.assertEqual(ParserClass.__name__, "MoviesParser")
+        with self.assertRaises(KeyError):
+            registry.get_parser_class("unknown")
+
+    def test_list_parsers_imports_no_parser(self):
+        """
+        guards the startup time of --list-parsers, it must not import parsers or settings
+        """
+        result = subprocess.run([sys.executable, "-X", "importtime", os.path.join(ROOT, "imdbparser.py"), "--list-parsers"],
+                                cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.split(), registry.list_names())
+        imported = [line.split("|")[-1].strip() for line in result.stderr.splitlines()]
+        self.assertNotIn("idp.settings", imported)
+        self.assertEqual([name for name in imported if name.startswith("idp.parser.") and name.endswith("parser")], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
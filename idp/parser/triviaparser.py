@@ -16,6 +16,8 @@ along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from .baseparser import *
+from .records import Trivia
+from ..utils.recordassembler import RecordAssembler
 
 
 class TriviaParser(BaseParser):
@@ -33,41 +35,43 @@ class TriviaParser(BaseParser):
     base_matcher_pattern = "((.+?) (.*))|\n"
     input_file_name = "trivia.list"
     number_of_lines_to_be_skipped = 15
+    header_end_pattern = rb"^FILM TRIVIA\r?\n=+\r?\n\r?\n"
     db_table_info = {
         'tablename' : 'trivia',
         'columns' : [
-            {
-                'colname' : '',
-                'colinfo' : DbScriptHelper.keywords['string'] + '(255) NOT NULL'
-            }
+            {'colname' : 'title', 'colinfo' : DbScriptHelper.keywords['string'] + '(255) NOT NULL'},
+            {'colname' : 'trivia', 'colinfo' : DbScriptHelper.keywords['string'] + '(4000)'}
         ],
         'constraints' : ''
     }
+    doc_type = "trivia"
     end_of_dump_delimiter = ""
 
-    title = ""
-    trivia = ""
+    def __init__(self, preferences_map, input_file=None):
+        super(TriviaParser, self).__init__(preferences_map, input_file)
 
-    def __init__(self, preferences_map):
-        super(TriviaParser, self).__init__(preferences_map)
-        self.first_one = True
+        # specific to this class
+        self.title = ""
+        self.assembler = RecordAssembler(Trivia)
 
-    def parse_into_tsv(self, matcher):
+    def parse_record(self, matcher):
         is_match = matcher.match(self.base_matcher_pattern)
 
         if(is_match):
             if(matcher.group(2) == "#"): #Title
+                record = self.assembler.finish()
                 self.title = matcher.group(3)
+                return record
             elif(matcher.group(2) == "-"): #Descriptive text
-                self.trivia = matcher.group(3)
+                record = self.assembler.start(self.title)
+                self.assembler.add(matcher.group(3))
+                return record
             elif(matcher.group(2) == " "):
-                self.trivia += ' ' + matcher.group(3)
+                self.assembler.add(matcher.group(3))
             else:
-                self.tsv_file.write(self.title + self.seperator + self.trivia + "\n")
+                return self.assembler.finish()
         else:
-            logging.critical("This line is fucked up: " + matcher.get_last_string())
-            self.fucked_up_count += 1
+            self.reject(matcher)
 
-    def parse_into_db(self, matcher):
-        #TODO
-        pass
+    def finish(self):
+        return self.assembler.finish()
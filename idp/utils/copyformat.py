@@ -0,0 +1,74 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+PostgreSQL COPY text format
+
+Fields are separated by tabs and rows end with a newline, so backslash, tab,
+newline and carriage return in values are written as backslash sequences.
+NULL is written as \\N. The parsers turn unmatched regex groups into empty
+strings, these are written as NULL as well.
+"""
+
+import re
+
+NULL = "\\N"
+
+# (character, replacement), backslash first so that added backslashes stay as they are.
+# PostgreSQL text cannot hold NUL characters
+COPY_ESCAPES = (
+    ("\\", "\\\\"),
+    ("\t", "\\t"),
+    ("\n", "\\n"),
+    ("\r", "\\r"),
+    ("\0", "")
+)
+
+UNESCAPES = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+
+escape_sequence = re.compile(r"\\(x[0-9a-fA-F]{1,2}|[0-7]{1,3}|.)")
+
+
+def copy_field(value):
+    """
+    Returns a value as a COPY field, None and "" become NULL
+    """
+    if not value:
+        return NULL
+    for character, replacement in COPY_ESCAPES:
+        if character in value:
+            value = value.replace(character, replacement)
+    return value
+
+
+def _unescape(matcher):
+    sequence = matcher.group(1)
+    if sequence[0] == "x" and len(sequence) > 1:
+        return chr(int(sequence[1:], 16))
+    if sequence[0] in "01234567":
+        return chr(int(sequence, 8))
+    return UNESCAPES.get(sequence, sequence)
+
+
+def parse_copy_line(line):
+    """
+    Returns the values of a COPY text format line, NULL fields are None.
+    This is how PostgreSQL reads the lines, it is used to check what we write
+    """
+    if line.endswith("\n"):
+        line = line[:-1]
+    return [None if field == NULL else escape_sequence.sub(_unescape, field) for field in line.split("\t")]
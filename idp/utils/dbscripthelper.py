@@ -17,6 +17,37 @@ along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
 
+DIALECTS = ("mysql", "postgres", "sqlite")
+
+# (character, replacement) tables escaping the inside of a single quoted
+# string literal, backslash comes first so that added backslashes stay as they are
+STRING_ESCAPES = {
+    # MySQL treats backslash as an escape character in string literals
+    "mysql": (
+        ("\\", "\\\\"),
+        ("'", "\\'"),
+        ("\0", "\\0"),
+        ("\n", "\\n"),
+        ("\r", "\\r"),
+        ("\x1a", "\\Z")
+    ),
+    # standard SQL, quotes are doubled and everything else is literal.
+    # PostgreSQL text cannot hold NUL characters
+    "postgres": (("'", "''"), ("\0", "")),
+    "sqlite": (("'", "''"),)
+}
+
+
+def escape(value, escapes):
+    """
+    Applies an escape table to value. A str.replace per character is several
+    times faster than str.translate since most values have none of them
+    """
+    for character, replacement in escapes:
+        if character in value:
+            value = value.replace(character, replacement)
+    return value
+
 
 class DbScriptHelper(object):
     keywords = {
@@ -31,12 +62,41 @@ class DbScriptHelper(object):
         'insert': "INSERT INTO "
     }
 
-    def __init__(self, db_table_info):
+    def __init__(self, db_table_info, dialect="mysql"):
+        if dialect not in DIALECTS:
+            raise ValueError("Unknown SQL dialect: " + str(dialect))
+        self.dialect = dialect
+        self.escapes = STRING_ESCAPES[dialect]
         self.scripts = {
-            'drop': "DROP TABLE ",
+            'drop': "DROP TABLE IF EXISTS ",
             'create': "CREATE TABLE ",
-            'insert': "INSERT INTO "
+            'insert': "INSERT INTO ",
+            'copy': "COPY "
         }
-        self.scripts['drop'] += db_table_info['tablename'] + ";" + os.linesep
-        self.scripts['create'] += db_table_info['tablename'] + "(" + ', '.join(filter(None, (', '.join('%s %s' % (col['colname'], col['colinfo']) for col in db_table_info['columns']), db_table_info['constraints']))) + ") CHARACTER SET utf8 COLLATE utf8_bin;" + os.linesep
-        self.scripts['insert'] += db_table_info['tablename'] + "(" + ', '.join(col['colname'] for col in db_table_info['columns']) + ") VALUES" + os.linesep
\ No newline at end of file
+        tablename = db_table_info['tablename']
+        # table options are MySQL only
+        table_options = " CHARACTER SET utf8 COLLATE utf8_bin" if dialect == "mysql" else ""
+        column_names = ', '.join(col['colname'] for col in db_table_info['columns'])
+        column_definitions = ', '.join('%s %s' % (col['colname'], col['colinfo']) for col in db_table_info['columns'])
+        self.scripts['drop'] += tablename + ";" + os.linesep
+        self.scripts['create'] += tablename + "(" + ', '.join(filter(None, (column_definitions, db_table_info['constraints']))) + ")" + table_options + ";" + os.linesep
+        self.scripts['insert'] += tablename + "(" + column_names + ") VALUES" + os.linesep
+        self.scripts['copy'] += tablename + " (" + column_names + ") FROM STDIN;" + os.linesep
+
+        # for bulk loads the table is created bare, constraints and indexes are added after the data
+        self.scripts['create_bare'] = "CREATE TABLE " + tablename + "(" + column_definitions + ")" + table_options + ";" + os.linesep
+        self.scripts['constraints'] = ("ALTER TABLE " + tablename + " ADD " + db_table_info['constraints'] + ";" + os.linesep) if db_table_info['constraints'] else ""
+        # 'indexes' (optional) lists the columns of the indexes, e.g. ['title', 'surname, name']
+        self.scripts['indexes'] = "".join("CREATE INDEX %s_%s_idx ON %s (%s);%s" % (tablename, "_".join(index.replace(",", " ").split()), tablename, index, os.linesep) for index in db_table_info.get('indexes', ()))
+
+    def quote(self, value):
+        """
+        Returns value as a string literal of the dialect
+        """
+        return "'" + escape(value, self.escapes) + "'"
+
+    def quote_or_null(self, value):
+        """
+        Returns value as a string literal, or NULL for a missing value
+        """
+        return "NULL" if value is None else "'" + escape(value, self.escapes) + "'"
@@ -0,0 +1,93 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import heapq
+import os
+import tempfile
+from itertools import islice
+
+
+# lines read between checks of the memory budget
+READ_BATCH_LINES = 10000
+
+
+def _read_chunk(input_file, chunk_lines, budget):
+    """
+    Reads up to chunk_lines lines, fewer if the memory budget is nearly used up.
+    Returns the lines and whether the end of the file is reached
+    """
+    lines = []
+    while len(lines) < chunk_lines:
+        batch_lines = min(READ_BATCH_LINES, chunk_lines - len(lines))
+        batch = list(islice(input_file, batch_lines))
+        lines.extend(batch)
+        if len(batch) < batch_lines:
+            return lines, True
+        if budget is not None and budget.near():
+            break
+    return lines, False
+
+
+def sort_lines(path, chunk_lines=1000000, encoding='utf-8', budget=None):
+    """
+    Sorts the lines of a text file in place in code point order, which is
+    the byte order of the UTF-8 encoded lines
+
+    Files of more than chunk_lines lines are sorted in chunks that are
+    written to temporary run files next to path and merged, so memory use
+    stays bounded by the chunk size. With a MemoryBudget, chunks are also
+    spilled as soon as the budget is nearly used up. The sorted file
+    replaces path atomically.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    runs = []
+    try:
+        with open(path, "r", encoding=encoding, newline="") as input_file:
+            while True:
+                lines, at_end = _read_chunk(input_file, chunk_lines, budget)
+                if not lines:
+                    break
+                if not lines[-1].endswith("\n"):
+                    lines[-1] += "\n"
+                lines.sort()
+                if not runs and at_end:
+                    # the whole file fits in memory, no runs needed
+                    _replace(path, directory, lines, encoding)
+                    return
+                run = tempfile.TemporaryFile("w+", encoding=encoding, newline="", dir=directory)
+                runs.append(run)
+                run.writelines(lines)
+                run.seek(0)
+                del lines
+                if at_end:
+                    break
+        if runs:
+            _replace(path, directory, heapq.merge(*runs), encoding)
+    finally:
+        for run in runs:
+            run.close()
+
+
+def _replace(path, directory, lines, encoding):
+    descriptor, temp_path = tempfile.mkstemp(prefix=".sorting-", dir=directory)
+    try:
+        with open(descriptor, "w", encoding=encoding, newline="") as output_file:
+            output_file.writelines(lines)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
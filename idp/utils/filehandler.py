@@ -15,7 +15,6 @@ You should have received a copy of the GNU General Public License
 along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-import gzip
 import os.path
 import logging
 from ..settings import *
@@ -41,6 +40,48 @@ class FileHandler(object):
     def sql_path(self):
         return os.path.join(self.preferences_map['output_dir'], self.list_name) + ".sql"
 
+    def copy_path(self):
+        return os.path.join(self.preferences_map['output_dir'], self.list_name) + ".copy"
+
+    def create_sql_path(self):
+        return os.path.join(self.preferences_map['output_dir'], self.list_name) + ".create.sql"
+
+    def post_load_sql_path(self):
+        return os.path.join(self.preferences_map['output_dir'], self.list_name) + ".post_load.sql"
+
+    def episode_index_path(self):
+        """ prefix of the files of the episode index, see EpisodeIndex """
+        return os.path.join(self.preferences_map['output_dir'], self.list_name) + ".episodes"
+
+    def genre_bitmap_path(self):
+        """ prefix of the files of the genre bitmaps, see GenreBitmaps """
+        return os.path.join(self.preferences_map['output_dir'], self.list_name) + ".bitmap"
+
+    def aggregates_path(self):
+        return os.path.join(self.preferences_map['output_dir'], self.list_name) + ".aggregates.json"
+
+    def profile_path(self):
+        return os.path.join(self.preferences_map['output_dir'], self.list_name) + ".profile.json"
+
+    def existing_input_path(self):
+        """
+        Returns the path of the list or of its .gz file, whichever exists, or None
+        """
+        for path in (self.full_path(), self.full_path() + ".gz"):
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def output_paths(self):
+        """
+        Returns the paths of all outputs of the list in the output directory
+        """
+        output_dir = self.preferences_map['output_dir']
+        return [os.path.join(output_dir, name) for name in sorted(os.listdir(output_dir)) if name.startswith(self.list_name + ".")]
+
+    def rejects_path(self):
+        return os.path.join(self.preferences_map['output_dir'], self.list_name) + ".rejects.tsv"
+
     def get_input_file(self):
         full_file_path = self.full_path()
         logging.info("Trying to find file: %s", full_file_path)
@@ -53,7 +94,7 @@ class FileHandler(object):
         logging.info("Trying to find file: %s", full_file_path + ".gz")
         if os.path.isfile(full_file_path + ".gz"):
             logging.info("File found: %s", full_file_path + ".gz")
-            if extract(full_file_path + ".gz") == 0:
+            if FileHandler.extract(full_file_path + ".gz") == 0:
                 return open(full_file_path, "r", encoding='iso-8859-1')
             else:
                 raise RuntimeError("Unknown error occured")
@@ -70,19 +111,44 @@ class FileHandler(object):
 #       return gzip.open(full_file_path, 'rt')
 #   print("File cannot be found:", full_file_path)
 
+    def get_output_file(self, path):
+        """
+        Opens an output file, or a ShardedFile writing part files if the
+        'sharding' preference is set (see ShardedFile for its keys)
+        """
+        sharding = self.preferences_map.get('sharding')
+        if sharding:
+            from .shardedfile import ShardedFile
+            return ShardedFile(path, **sharding)
+        return open(path, "w", encoding='utf-8')
+
+    def pipe_file(self):
+        """
+        Opens the output of pipe runs, which write to the 'pipe' preference
+        instead of output_dir (see pipeoutput.py), returns None for other runs
+        """
+        if self.preferences_map.get('pipe'):
+            from .pipeoutput import open_pipe
+            return open_pipe(self.preferences_map['pipe'])
+        return None
+
     def get_tsv_file(self):
-        return open(self.tsv_path(), "w", encoding='utf-8')
+        return self.pipe_file() or self.get_output_file(self.tsv_path())
 
     def get_json_file(self):
-        return open(self.json_path(), "w", encoding='utf-8')
+        return self.pipe_file() or self.get_output_file(self.json_path())
+
+    def get_copy_file(self):
+        return self.pipe_file() or self.get_output_file(self.copy_path())
 
     def get_log_file(self):
         return open(self.log_file_path(), "w", encoding='utf-8')
 
     def get_sql_file(self):
-        return open(self.sql_path(), "w", encoding='utf-8')
+        return self.pipe_file() or open(self.sql_path(), "w", encoding='utf-8')
 
     def extract(gzip_path):
+        import gzip
         try:
             logging.info("Started to extract list: %s", gzip_path)
             with gzip.open(gzip_path, "rb") as f:
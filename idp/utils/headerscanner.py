@@ -0,0 +1,113 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import io
+import itertools
+import logging
+import re
+
+# headers of the lists are a few hundred lines, the data start is searched in this many bytes
+HEADER_SCAN_LIMIT = 1 << 20
+
+
+def find_data_offset(head, header_end_pattern):
+    """
+    Returns the offset of the first data line in head (the raw bytes at the
+    beginning of a list) or None if the end of the header cannot be found
+    """
+    matcher = re.search(header_end_pattern, head, re.MULTILINE)
+    if matcher:
+        return matcher.end()
+    return None
+
+
+class _PrefixedReader(io.RawIOBase):
+    """
+    Serves the bytes that were already read from a non-seekable stream before the rest of it
+    """
+
+    def __init__(self, prefix, raw):
+        self.prefix = memoryview(prefix)
+        self.raw = raw
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.prefix:
+            size = min(len(buffer), len(self.prefix))
+            buffer[:size] = self.prefix[:size]
+            self.prefix = self.prefix[size:]
+            return size
+        return self.raw.readinto(buffer)
+
+    def close(self):
+        self.raw.close()
+        super(_PrefixedReader, self).close()
+
+
+def skip_header(input_file, header_end_pattern, number_of_lines_to_be_skipped):
+    """
+    Positions a freshly opened list at its first data line
+
+    The end of the header is searched in the raw bytes, seekable files are
+    then seeked to the data and streams continue from it. Seekable text files
+    without an underlying binary buffer (e.g. StringIO) are searched as
+    iso-8859-1. If the header is not recognized, or input_file is such a text
+    stream, number_of_lines_to_be_skipped lines are skipped instead.
+
+    Returns (input_file, data_offset, header_lines)
+    """
+    if header_end_pattern is not None and hasattr(input_file, 'buffer'):
+        encoding = input_file.encoding
+        raw = input_file.detach()
+        try:
+            seekable = raw.seekable()
+            start = raw.tell() if seekable else 0
+            head = raw.read(HEADER_SCAN_LIMIT)
+            offset = find_data_offset(head, header_end_pattern)
+
+            if seekable:
+                raw.seek(start if offset is None else start + offset)
+            else:
+                raw = io.BufferedReader(_PrefixedReader(head if offset is None else head[offset:], raw))
+        except BaseException:
+            # the caller only has the detached input_file, which cannot close it
+            raw.close()
+            raise
+        input_file = io.TextIOWrapper(raw, encoding=encoding)
+
+        if offset is not None:
+            return input_file, start + offset, head.count(b"\n", 0, offset)
+        logging.warning("Header end cannot be found, skipping " + str(number_of_lines_to_be_skipped) + " lines instead")
+    elif header_end_pattern is not None and input_file.seekable():
+        start = input_file.tell()
+        head = input_file.read(HEADER_SCAN_LIMIT).encode('iso-8859-1', 'replace')
+        offset = find_data_offset(head, header_end_pattern)
+        input_file.seek(start)
+        if offset is not None:
+            input_file.read(offset)
+            return input_file, offset, head.count(b"\n", 0, offset)
+        logging.warning("Header end cannot be found, skipping " + str(number_of_lines_to_be_skipped) + " lines instead")
+
+    # lists are single byte encoded, so lengths of lines are their sizes in bytes
+    offset = 0
+    header_lines = 0
+    for line in itertools.islice(input_file, number_of_lines_to_be_skipped):
+        offset += len(line)
+        header_lines += 1
+    return input_file, offset, header_lines
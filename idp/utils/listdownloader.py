@@ -15,11 +15,14 @@ You should have received a copy of the GNU General Public License
 along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import asyncio
 import gzip
 import logging
 import os
+import re
 from ftplib import FTP
 from .filehandler import FileHandler
+from .streampipeline import StreamPipeline
 from ..settings import *
 
 
@@ -43,3 +46,78 @@ def download():
 
     logging.info(str(download_count) + " lists are downloaded")
     ftp.quit()
+
+
+def stream(list_file_name):
+    """
+    Opens a list on the server as a text stream, the download, decompression
+    and parsing stages overlap and nothing is written to INPUT_DIR
+    """
+    logging.info("Streaming list " + list_file_name + " from server:" + INTERFACES_SERVER)
+
+    ftp = FTP(INTERFACES_SERVER)
+    ftp.login()
+
+    def producer(write):
+        try:
+            ftp.retrbinary("RETR " + INTERFACES_DIRECTORY + list_file_name + ".gz", write)
+        finally:
+            ftp.close()
+
+    return StreamPipeline(producer, name=list_file_name).open()
+
+
+async def _ftp_response(reader):
+    line = (await reader.readline()).decode('latin-1')
+    code = line[:3]
+    if line[3:4] == "-": # multi-line response
+        while True:
+            next_line = (await reader.readline()).decode('latin-1')
+            if not next_line or (next_line[:3] == code and next_line[3:4] == " "):
+                break
+    if not code or code[0] in "45":
+        raise IOError("FTP error: " + line.strip())
+    return line
+
+
+async def _ftp_command(reader, writer, command):
+    writer.write((command + "\r\n").encode('latin-1'))
+    await writer.drain()
+    return await _ftp_response(reader)
+
+
+async def download_async(list_item, chunk_size=1 << 16):
+    """
+    Downloads one list with asyncio streams, so several lists can be
+    fetched concurrently without threads. Returns the path of the .gz file
+    """
+    target_path = os.path.join(INPUT_DIR, list_item + ".list.gz")
+    logging.info("Started to download list:" + list_item)
+
+    reader, writer = await asyncio.open_connection(INTERFACES_SERVER, 21)
+    try:
+        await _ftp_response(reader)
+        await _ftp_command(reader, writer, "USER anonymous")
+        await _ftp_command(reader, writer, "PASS anonymous@")
+        await _ftp_command(reader, writer, "TYPE I")
+        pasv = await _ftp_command(reader, writer, "PASV")
+        # like ftplib, connect to the control host instead of the advertised address
+        port_hi, port_lo = re.search(r"(\d+),(\d+),(\d+),(\d+),(\d+),(\d+)", pasv).groups()[4:]
+        data_reader, data_writer = await asyncio.open_connection(INTERFACES_SERVER, int(port_hi) * 256 + int(port_lo))
+        try:
+            await _ftp_command(reader, writer, "RETR " + INTERFACES_DIRECTORY + list_item + ".list.gz")
+            with open(target_path, "wb") as target:
+                while True:
+                    chunk = await data_reader.read(chunk_size)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+        finally:
+            data_writer.close()
+        await _ftp_response(reader)
+        await _ftp_command(reader, writer, "QUIT")
+    finally:
+        writer.close()
+
+    logging.info(list_item + "list downloaded successfully")
+    return target_path
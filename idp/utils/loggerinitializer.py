@@ -30,6 +30,10 @@ def initialize_logger(preferences_map):
     ch.setFormatter(formatter)
     logger.addHandler(ch)
 
+    # pipe runs have no output directory, they log to stderr only
+    if preferences_map.get('output_dir') is None:
+        return
+
     # create error file handler and set level to error
     ch = logging.FileHandler(os.path.join(preferences_map['output_dir'], "imdbparserError.log"),"w", encoding=None, delay="true")
     ch.setLevel(logging.ERROR)
@@ -0,0 +1,106 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import gc
+import logging
+import os
+import re
+
+UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def parse_size(size):
+    """
+    Parses a size like 512M, 2G or 1048576 into bytes
+    """
+    matcher = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*$", str(size), re.IGNORECASE)
+    if not matcher:
+        raise ValueError("Invalid size: " + str(size))
+    return int(float(matcher.group(1)) * UNITS[matcher.group(2).upper()])
+
+
+def current_rss():
+    """
+    Resident set size of this process in bytes, from /proc/self/statm on
+    Linux. Elsewhere the peak RSS so far is the best that is available
+    """
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        import resource
+        import sys
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def format_size(size):
+    return "%.1f MB" % (size / float(1 << 20))
+
+
+class MemoryBudget(object):
+    """
+    Watches the RSS of the process against a limit
+
+    Structures that accumulate state register a shrink callback that flushes
+    their buffers or drops cached data. check() is called regularly, e.g.
+    every few thousand lines, and calls the callbacks when RSS reaches
+    high_water of the limit. Code that can spill to temporary files asks
+    near() before it buffers more. Without a limit only the peak is tracked.
+    """
+
+    def __init__(self, limit=None, high_water=0.9, name=""):
+        self.limit = limit
+        self.high_water = high_water
+        self.name = name
+        self.shrinkers = []
+        self.peak = 0
+        self.shrink_count = 0
+        self.over_limit = False
+
+    def register(self, shrink):
+        self.shrinkers.append(shrink)
+
+    def measure(self):
+        rss = current_rss()
+        if rss > self.peak:
+            self.peak = rss
+        return rss
+
+    def near(self):
+        return self.limit is not None and self.measure() >= self.high_water * self.limit
+
+    def check(self):
+        rss = self.measure()
+        if self.limit is None or rss < self.high_water * self.limit:
+            return rss
+        for shrink in self.shrinkers:
+            shrink()
+        gc.collect()
+        self.shrink_count += 1
+        rss = self.measure()
+        if rss > self.limit and not self.over_limit:
+            # freed memory is often kept by the allocator, so this is logged once
+            logging.warning("%s uses %s, over the memory limit of %s", self.name, format_size(rss), format_size(self.limit))
+            self.over_limit = True
+        return rss
+
+    def report(self):
+        logging.info("Peak memory of %s: %s%s", self.name, format_size(self.peak), (", shrunk %d times" % self.shrink_count) if self.shrink_count else "")
@@ -0,0 +1,163 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import ast
+import logging
+import os.path
+from collections import OrderedDict
+
+# partition value of records whose year is not known, e.g. "(????)" titles
+UNKNOWN = "unknown"
+
+# names a filter expression may use
+FILTER_NAMES = ("type", "year")
+
+
+def compile_filter(expression):
+    """
+    Compiles a partition filter expression like
+        type == "MOVIE" and 1990 <= year < 2000
+    into a function of (type, year). type is the movie type without
+    parentheses (MOVIE, TV, V, VG, TV_SERIES), year is an int or None
+    """
+    tree = ast.parse(expression, "<partition filter>", "eval")
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Call, ast.Attribute, ast.Subscript, ast.Lambda, ast.NamedExpr)):
+            raise ValueError("Partition filter may only compare type and year: " + expression)
+        if isinstance(node, ast.Name) and node.id not in FILTER_NAMES:
+            raise ValueError("Unknown name in partition filter: " + node.id)
+    code = compile(tree, "<partition filter>", "eval")
+
+    def accept(type, year):
+        try:
+            return bool(eval(code, {"__builtins__": {}}, {"type": type, "year": year}))
+        except TypeError:
+            # year is None for unknown years, comparing it with numbers fails
+            return False
+    return accept
+
+
+def partition_of(record):
+    """
+    Returns the (type, year) partition of a record that carries a title
+    """
+    year = record.year_released
+    return record.movie_type.strip("()"), int(year) if year.isdigit() else None
+
+
+class _PartitionFile(object):
+    """
+    Output file of one partition, the underlying file is opened by the sink
+    on demand and may be closed in between when too many files are open
+    """
+
+    def __init__(self, sink, path):
+        self.sink = sink
+        self.path = path
+
+    def write(self, text):
+        return self.sink.handle(self.path).write(text)
+
+    def close(self):
+        self.sink.release(self.path)
+
+
+class PartitionedSink(object):
+    """
+    Routes records to type=<type>/year=<year>/<file_name> files under output_dir
+
+    Partitions rejected by accept(type, year) are never written. Lists have
+    thousands of type and year combinations, so at most max_open_files files
+    are kept open; the least recently used one is closed and reopened for
+    appending when it gets more records.
+
+    make_writer(output_file) creates the record writer of a partition, e.g. a
+    TsvWriter. The sink itself is used like a record writer.
+    """
+
+    def __init__(self, output_dir, file_name, make_writer, accept=None, max_open_files=64):
+        self.output_dir = output_dir
+        self.file_name = file_name
+        self.make_writer = make_writer
+        self.accept = accept
+        self.max_open_files = max_open_files
+        self.writers = {} # partition -> writer, None for rejected partitions
+        self.handles = OrderedDict() # path -> open file, least recently used first
+        self.reopened = 0
+
+    def partition_path(self, partition):
+        type, year = partition
+        return os.path.join(self.output_dir, "type=" + type, "year=" + (UNKNOWN if year is None else str(year)), self.file_name)
+
+    def write(self, record):
+        partition = partition_of(record)
+        try:
+            writer = self.writers[partition]
+        except KeyError:
+            writer = self.writers[partition] = self.open_partition(partition)
+        if writer is not None:
+            writer.write(record)
+
+    def open_partition(self, partition):
+        if self.accept is not None and not self.accept(*partition):
+            return None
+        path = self.partition_path(partition)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "w", encoding='utf-8').close()
+        return self.make_writer(_PartitionFile(self, path))
+
+    def handle(self, path):
+        try:
+            self.handles.move_to_end(path)
+            return self.handles[path]
+        except KeyError:
+            pass
+        if len(self.handles) >= self.max_open_files:
+            _, least_recent = self.handles.popitem(last=False)
+            least_recent.close()
+            self.reopened += 1
+        output_file = self.handles[path] = open(path, "a", encoding='utf-8')
+        return output_file
+
+    def release(self, path):
+        output_file = self.handles.pop(path, None)
+        if output_file is not None:
+            output_file.close()
+
+    def shrink(self):
+        """
+        Closes all open files, called when memory runs low. They are reopened
+        for appending as records arrive
+        """
+        for output_file in self.handles.values():
+            output_file.close()
+        self.handles.clear()
+
+    def partitions(self):
+        """
+        Returns the written partitions
+        """
+        return sorted((partition for partition, writer in self.writers.items() if writer is not None), key=lambda partition: (partition[0], partition[1] or 0))
+
+    def close(self):
+        for writer in self.writers.values():
+            if writer is not None:
+                writer.close()
+        for output_file in self.handles.values():
+            output_file.close()
+        self.handles.clear()
+        logging.info("Wrote %d partitions of %s, reopened files %d times", len(self.partitions()), self.file_name, self.reopened)
@@ -0,0 +1,51 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Output of pipe runs, which write a single list to stdout or a named pipe
+"""
+
+import os
+import signal
+import sys
+
+STDOUT = "-"
+
+# writes to the pipe are buffered in blocks of this size
+PIPE_BUFFER_SIZE = 1 << 20
+
+
+def open_pipe(target, buffer_size=PIPE_BUFFER_SIZE):
+    """
+    Opens target for writing text, target is STDOUT or the path of a file or
+    a named pipe. Closing the returned file leaves stdout open
+    """
+    if target == STDOUT:
+        sys.stdout.flush()
+        return open(sys.stdout.fileno(), "w", encoding='utf-8', buffering=buffer_size, closefd=False)
+    return open(target, "w", encoding='utf-8', buffering=buffer_size)
+
+
+def exit_on_broken_pipe():
+    """
+    Exits quietly when the reader of the output went away, e.g. `| head`,
+    with the status of a process killed by SIGPIPE
+    """
+    # the interpreter flushes stdout at exit, which would fail again
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    sys.exit(128 + getattr(signal, 'SIGPIPE', 13))
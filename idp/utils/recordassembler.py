@@ -0,0 +1,60 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+class RecordAssembler(object):
+    """
+    Assembles records of block structured lists (plot, trivia) whose text
+    spans several lines
+
+    Text fragments are collected in a list and joined once when the record is
+    finished, so building a record is linear in its length. Only the record
+    being assembled is kept in memory.
+
+    Usage:
+        record = assembler.start(title)  # returns the previous record, if any
+        assembler.add(line_text)
+        record = assembler.finish()      # at the end of a block or of the input
+    """
+
+    def __init__(self, record_class, seperator=" "):
+        self.record_class = record_class
+        self.seperator = seperator
+        self.key = None
+        self.fragments = []
+
+    def start(self, key):
+        """
+        Starts a new record and returns the previous one or None
+        """
+        record = self.finish()
+        self.key = key
+        return record
+
+    def add(self, fragment):
+        self.fragments.append(fragment)
+
+    def finish(self):
+        """
+        Returns the record being assembled, or None if no record was started
+        """
+        if self.key is None:
+            return None
+        record = self.record_class(self.key, self.seperator.join(self.fragments))
+        self.key = None
+        self.fragments = []
+        return record
@@ -0,0 +1,188 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from operator import attrgetter
+from .dbscripthelper import DbScriptHelper
+from .copyformat import copy_field
+
+
+def columns_getter(columns):
+    """
+    Returns a function that gives the values of the columns of a record as a tuple
+    """
+    getter = attrgetter(*columns)
+    if len(columns) == 1:
+        return lambda record: (getter(record),)
+    return getter
+
+
+class TsvWriter(object):
+    """
+    Writes records as tab separated lines, one line per record
+    """
+
+    def __init__(self, output_file, columns, seperator="\t"):
+        self.output_file = output_file
+        self.values = columns_getter(columns)
+        self.seperator = seperator
+        if len(columns) == 1:
+            # a single column needs no join
+            value = attrgetter(columns[0])
+            self.write = lambda record: output_file.write(value(record) + "\n")
+
+    def write(self, record):
+        self.output_file.write(self.seperator.join(self.values(record)) + "\n")
+
+    def close(self):
+        self.output_file.close()
+
+
+class JsonWriter(object):
+    """
+    Writes one JSON document per line, documents are tagged with doc_type.
+    With columns the documents hold those attributes instead of to_json()
+    """
+
+    def __init__(self, output_file, doc_type, columns=None):
+        import json
+        self.output_file = output_file
+        self.doc_type = doc_type
+        self.dumps = json.dumps
+        self.columns = columns
+        if columns is not None:
+            self.values = columns_getter(columns)
+
+    def write(self, record):
+        document = {"doc_type": self.doc_type}
+        if self.columns is None:
+            document.update(record.to_json())
+        else:
+            document.update(zip(self.columns, self.values(record)))
+        self.output_file.write(self.dumps(document) + "\n")
+
+    def close(self):
+        self.output_file.close()
+
+
+class SqlWriter(object):
+    """
+    Writes a script that drops and creates the table of a list and fills it
+    in one transaction
+
+    Rows are written as multi-row INSERT statements of at most batch_rows rows
+    and about batch_bytes bytes of UTF-8, so no statement exceeds limits like
+    MySQL's max_allowed_packet. With copy (PostgreSQL only) rows are written as a
+    COPY ... FROM STDIN block for psql instead, which loads fastest.
+
+    String values are escaped for the dialect, empty values of other columns
+    are written as NULL.
+    """
+
+    def __init__(self, output_file, db_table_info, dialect="mysql", copy=False, batch_rows=1000, batch_bytes=1 << 20):
+        if copy and dialect != "postgres":
+            raise ValueError("COPY FROM STDIN is supported by postgres only")
+        self.output_file = output_file
+        self.columns = [col['colname'] for col in db_table_info['columns']]
+        self.values = columns_getter(self.columns)
+        self.scripthelper = DbScriptHelper(db_table_info, dialect)
+        self.copy = copy
+        self.batch_rows = batch_rows
+        self.batch_bytes = batch_bytes
+        self.batch = []
+        self.batch_size = 0
+
+        # one function per column that turns a value into its SQL text
+        is_string = [DbScriptHelper.keywords['string'] in col['colinfo'] for col in db_table_info['columns']]
+        if copy:
+            self.formatters = [copy_field] * len(self.columns)
+        else:
+            self.formatters = [self.scripthelper.quote_or_null if string else self.literal for string in is_string]
+
+        self.output_file.write(self.scripthelper.scripts['drop'])
+        self.output_file.write(self.scripthelper.scripts['create'])
+        self.output_file.write("BEGIN;\n")
+        if copy:
+            self.output_file.write(self.scripthelper.scripts['copy'])
+
+    @staticmethod
+    def literal(value):
+        return value if value else "NULL"
+
+    def write(self, record):
+        values = [format(value) for format, value in zip(self.formatters, self.values(record))]
+        if self.copy:
+            self.output_file.write("\t".join(values) + "\n")
+            return
+        row = "(" + ", ".join(values) + ")"
+        self.batch.append(row)
+        self.batch_size += len(row.encode('utf-8'))
+        if len(self.batch) >= self.batch_rows or self.batch_size >= self.batch_bytes:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered rows as one INSERT statement
+        """
+        if self.batch:
+            self.output_file.write(self.scripthelper.scripts['insert'] + ",\n".join(self.batch) + ";\n")
+            self.batch = []
+            self.batch_size = 0
+
+    # frees the batch when memory runs low, see MemoryBudget
+    shrink = flush
+
+    def close(self):
+        if self.copy:
+            self.output_file.write("\\.\n")
+        else:
+            self.flush()
+        self.output_file.write(self.scripthelper.scripts['indexes'])
+        self.output_file.write("COMMIT;\n")
+        self.output_file.close()
+
+
+class CopyWriter(object):
+    """
+    Writes records in PostgreSQL COPY text format for bulk loads, empty values
+    are written as NULL (see copyformat.py)
+
+    The CREATE TABLE script is written to create_file when the writer is
+    created, the primary key and indexes go to post_load_file as building
+    them after the load is much faster than keeping them up to date. Without
+    these files only the data is written
+    """
+
+    def __init__(self, output_file, db_table_info, create_file=None, post_load_file=None):
+        self.output_file = output_file
+        self.columns = [col['colname'] for col in db_table_info['columns']]
+        self.values = columns_getter(self.columns)
+
+        scripthelper = DbScriptHelper(db_table_info, "postgres")
+        if create_file is not None:
+            with create_file:
+                create_file.write(scripthelper.scripts['drop'])
+                create_file.write(scripthelper.scripts['create_bare'])
+        if post_load_file is not None:
+            with post_load_file:
+                post_load_file.write(scripthelper.scripts['constraints'])
+                post_load_file.write(scripthelper.scripts['indexes'])
+
+    def write(self, record):
+        self.output_file.write("\t".join([copy_field(value) for value in self.values(record)]) + "\n")
+
+    def close(self):
+        self.output_file.close()
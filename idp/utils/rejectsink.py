@@ -0,0 +1,93 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import logging
+import time
+
+
+class TooManyRejectsError(RuntimeError):
+    """
+    Raised when the ratio of rejected lines shows the list format has changed
+    """
+    pass
+
+
+class RejectSink(object):
+    """
+    Collects lines that cannot be parsed
+
+    Rejected lines are written in batches to a reject file as
+    line number <tab> byte offset <tab> line, the file is only created
+    when the first line is rejected. Without a path they are only counted. Logging is limited to the first
+    rejected line and a summary every summary_interval seconds.
+
+    If max_reject_ratio is given, TooManyRejectsError is raised as soon as
+    more than that ratio of the lines is rejected, after min_lines lines.
+    """
+
+    def __init__(self, path, list_name, max_reject_ratio=None, min_lines=10000, batch_size=1000, summary_interval=10):
+        self.path = path
+        self.list_name = list_name
+        self.max_reject_ratio = max_reject_ratio
+        self.min_lines = min_lines
+        self.batch_size = batch_size
+        self.summary_interval = summary_interval
+
+        self.count = 0
+        self.batch = []
+        self.reject_file = None
+        self.last_summary_time = None
+
+    def reject(self, line, line_number, offset, processed_lines):
+        """
+        processed_lines: number of data lines read so far, including this one
+        """
+        self.count += 1
+        self.batch.append("%d\t%d\t%s\n" % (line_number, offset, line.rstrip("\n")))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+        now = time.monotonic()
+        if self.last_summary_time is None:
+            logging.warning("First rejected line of %s at line %d: %s", self.list_name, line_number, line.rstrip("\n"))
+            self.last_summary_time = now
+        elif now - self.last_summary_time >= self.summary_interval:
+            logging.warning("%d lines of %s rejected so far", self.count, self.list_name)
+            self.last_summary_time = now
+
+        if self.max_reject_ratio is not None and processed_lines >= self.min_lines and self.count > self.max_reject_ratio * processed_lines:
+            self.close()
+            raise TooManyRejectsError("%d of %d lines of %s rejected, the list format may have changed" % (self.count, processed_lines, self.list_name))
+
+    def flush(self):
+        if self.batch and self.path is None:
+            self.batch = []
+        elif self.batch:
+            if self.reject_file is None:
+                self.reject_file = open(self.path, "w", encoding='utf-8')
+            self.reject_file.write("".join(self.batch))
+            self.batch = []
+
+    # writes the batch when memory runs low, see MemoryBudget
+    shrink = flush
+
+    def close(self):
+        self.flush()
+        if self.reject_file is not None:
+            self.reject_file.close()
+            self.reject_file = None
+            logging.info("%d rejected lines of %s written to %s", self.count, self.list_name, self.path)
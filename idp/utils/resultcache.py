@@ -0,0 +1,151 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+# bump when the layout of cache entries changes
+CACHE_VERSION = 1
+
+
+def link_or_copy(source, target):
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class ResultCache(object):
+    """
+    Local cache of parser outputs, keyed by the input list, the parser and the output options
+
+    An entry is a directory named after the key holding the output files of
+    one list. On a hit the files are hard linked (or copied) into the new
+    output directory instead of parsing again. When the total size exceeds
+    size_limit, least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir, size_limit=None, hash_inputs=False):
+        """
+        hash_inputs: identify inputs by their content instead of size and modification time
+        """
+        self.cache_dir = cache_dir
+        self.size_limit = size_limit
+        self.hash_inputs = hash_inputs
+
+    def input_identity(self, input_path):
+        if self.hash_inputs:
+            hasher = hashlib.sha256()
+            with open(input_path, "rb") as input_file:
+                for chunk in iter(lambda: input_file.read(1 << 20), b""):
+                    hasher.update(chunk)
+            return hasher.hexdigest()
+        stat = os.stat(input_path)
+        return "%d:%d" % (stat.st_size, stat.st_mtime_ns)
+
+    @staticmethod
+    def parser_version(parser_class):
+        """
+        Digest of the source of the parser and of the modules shaping its output
+        """
+        hasher = hashlib.sha256()
+        for kls in inspect.getmro(parser_class):
+            if kls is not object:
+                with open(inspect.getsourcefile(kls), "rb") as source_file:
+                    hasher.update(source_file.read())
+        from . import recordwriters
+        from ..parser import records, listspec
+        for module in (records, listspec, recordwriters):
+            with open(inspect.getsourcefile(module), "rb") as source_file:
+                hasher.update(source_file.read())
+        return hasher.hexdigest()
+
+    def key(self, input_path, parser_class, options):
+        """
+        options: output affecting preferences, e.g. mode and sharding
+        """
+        key_info = {
+            "version": CACHE_VERSION,
+            "input": [os.path.basename(input_path), self.input_identity(input_path)],
+            "parser": parser_class.__module__ + "." + parser_class.__name__,
+            "parser_version": self.parser_version(parser_class),
+            "pattern": parser_class.base_matcher_pattern,
+            "options": options
+        }
+        return hashlib.sha256(json.dumps(key_info, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def restore(self, key, output_dir):
+        """
+        Links the cached outputs into output_dir, returns False on a cache miss
+        """
+        entry = self.entry_path(key)
+        if not os.path.isdir(entry):
+            return False
+        for name in os.listdir(entry):
+            link_or_copy(os.path.join(entry, name), os.path.join(output_dir, name))
+        os.utime(entry) # most recently used
+        return True
+
+    def store(self, key, paths):
+        """
+        Adds output files to the cache, then evicts old entries if needed
+        """
+        entry = self.entry_path(key)
+        if os.path.isdir(entry):
+            return
+        staging = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # entries appear atomically so concurrent runs never see half of one
+            staging = tempfile.mkdtemp(prefix=".staging-", dir=self.cache_dir)
+            for path in paths:
+                link_or_copy(path, os.path.join(staging, os.path.basename(path)))
+            os.rename(staging, entry)
+        except OSError as e:
+            logging.error("Cannot add outputs to cache: " + str(e))
+            if staging is not None:
+                shutil.rmtree(staging, ignore_errors=True)
+            return
+        self.evict()
+
+    def evict(self):
+        if self.size_limit is None:
+            return
+        entries = []
+        total_size = 0
+        for name in os.listdir(self.cache_dir):
+            entry = os.path.join(self.cache_dir, name)
+            if name.startswith(".") or not os.path.isdir(entry):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+            entries.append((os.path.getmtime(entry), size, entry))
+            total_size += size
+
+        for _, size, entry in sorted(entries):
+            if total_size <= self.size_limit:
+                break
+            logging.info("Evicting cache entry: " + entry)
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
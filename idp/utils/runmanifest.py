@@ -0,0 +1,109 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Deterministic run outputs
+
+A deterministic run writes to a directory named after the digests of its
+inputs, parsers and options, sorts the lines of its line based outputs into a
+canonical order and lists the sha256 of every output in a run manifest. Two
+runs produced the same data if their manifests have the same digest.
+"""
+
+import hashlib
+import json
+import os
+from .externalsort import sort_lines
+
+MANIFEST_NAME = "run.manifest.json"
+
+# outputs with one record per line, they are sorted into canonical order
+LINE_BASED_EXTENSIONS = (".tsv", ".json", ".copy")
+
+# JSON documents written whole next to the outputs, e.g. by the aggregates
+# and profile hooks, their lines are kept in order
+DOCUMENT_SUFFIXES = (".aggregates.json", ".profile.json")
+
+
+def file_sha256(path):
+    """
+    sha256 of a file, .gz files are hashed decompressed so a list and its
+    compressed download have the same digest
+    """
+    if path.endswith(".gz"):
+        import gzip
+        opener = gzip.open
+    else:
+        opener = open
+    hasher = hashlib.sha256()
+    with opener(path, "rb") as input_file:
+        for chunk in iter(lambda: input_file.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def run_id(inputs, options):
+    """
+    Returns the name part of a deterministic output directory
+    inputs: list name -> digest of the list and its parser
+    """
+    key_info = {"inputs": inputs, "options": options}
+    return hashlib.sha256(json.dumps(key_info, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def is_run_output(name):
+    # logs have timestamps and durations, they differ between identical runs
+    return name != MANIFEST_NAME and not name.endswith(".log") and not (name.startswith("log_") and name.endswith(".txt"))
+
+
+def output_files(output_dir):
+    """
+    Returns the paths of the outputs under output_dir relative to it, sorted
+    """
+    paths = []
+    for directory, dir_names, file_names in os.walk(output_dir):
+        for name in file_names:
+            if is_run_output(name) and not name.startswith("."):
+                paths.append(os.path.relpath(os.path.join(directory, name), output_dir).replace(os.sep, "/"))
+    return sorted(paths)
+
+
+def finalize(output_dir, inputs, options, chunk_lines=1000000, budget=None):
+    """
+    Sorts the line based outputs of a finished run and writes its manifest.
+    Returns the manifest, its 'digest' identifies the content of the run
+    budget: optional MemoryBudget, sorting spills to disk when it is nearly used up
+    """
+    files = {}
+    for path in output_files(output_dir):
+        full_path = os.path.join(output_dir, path)
+        if path.endswith(LINE_BASED_EXTENSIONS) and not path.endswith(DOCUMENT_SUFFIXES):
+            sort_lines(full_path, chunk_lines, budget=budget)
+        files[path] = {"sha256": file_sha256(full_path), "bytes": os.path.getsize(full_path)}
+
+    hasher = hashlib.sha256()
+    for path in sorted(files):
+        hasher.update((path + "\t" + files[path]["sha256"] + "\n").encode('utf-8'))
+    manifest = {
+        "inputs": inputs,
+        "options": options,
+        "files": files,
+        "digest": hasher.hexdigest()
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True, default=str)
+    return manifest
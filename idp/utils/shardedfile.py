@@ -0,0 +1,196 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+import json
+import os.path
+import queue
+import threading
+import zlib
+
+COMPRESSION_EXTENSIONS = {
+    None: "",
+    "gzip": ".gz",
+    "zstd": ".zst"
+}
+
+# rows are handed to the compression thread in chunks of about this size
+CHUNK_SIZE = 1 << 20
+
+
+class _Part(object):
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.bytes = 0
+        self.size = 0
+        self.sha256 = None
+
+    def manifest_entry(self):
+        return {
+            "path": os.path.basename(self.path),
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "size": self.size,
+            "sha256": self.sha256
+        }
+
+
+class _EndOfPart(object):
+    pass
+
+
+class ShardedFile(object):
+    """
+    Text output split into part files of at most max_rows rows or max_bytes
+    (uncompressed) bytes, optionally compressed with gzip or zstd
+
+    Every write() call is one row, which is how the record writers use their
+    output files, so parts never split a record. Compression and writing run
+    in a worker thread. close() writes <path>.manifest.json listing the parts
+    with their row counts and sha256 checksums.
+
+    movies.list.tsv is written as movies.list.part-00000.tsv[.gz], ...
+    """
+
+    def __init__(self, path, max_rows=None, max_bytes=None, compression=None, compression_level=None, encoding='utf-8'):
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError("Unknown compression: " + str(compression))
+        if compression == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                raise RuntimeError("zstd compression needs the zstandard package")
+
+        self.path = path
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.compression = compression
+        self.compression_level = compression_level
+        self.encoding = encoding
+
+        self.parts = []
+        self.buffer = []
+        self.buffer_size = 0
+        self.error = None
+        self.queue = queue.Queue(8)
+        self.thread = threading.Thread(target=self._compress_parts, name="shard-" + os.path.basename(path), daemon=True)
+        self.thread.start()
+        self._start_part()
+
+    def part_path(self, index):
+        root, extension = os.path.splitext(self.path)
+        return "%s.part-%05d%s%s" % (root, index, extension, COMPRESSION_EXTENSIONS[self.compression])
+
+    def manifest_path(self):
+        return self.path + ".manifest.json"
+
+    def write(self, text):
+        part = self.parts[-1]
+        if part.rows and ((self.max_rows and part.rows >= self.max_rows) or (self.max_bytes and part.bytes >= self.max_bytes)):
+            self._end_part()
+            self._start_part()
+            part = self.parts[-1]
+
+        data = text.encode(self.encoding)
+        self.buffer.append(data)
+        self.buffer_size += len(data)
+        part.rows += 1
+        part.bytes += len(data)
+        if self.buffer_size >= CHUNK_SIZE:
+            self._flush()
+
+    def close(self):
+        if self.thread is None:
+            return
+        self._end_part()
+        self._put(None)
+        self.thread.join()
+        self.thread = None
+        self._check_error()
+
+        with open(self.manifest_path(), "w", encoding='utf-8') as manifest_file:
+            json.dump({
+                "path": os.path.basename(self.path),
+                "compression": self.compression,
+                "rows": sum(part.rows for part in self.parts),
+                "parts": [part.manifest_entry() for part in self.parts]
+            }, manifest_file, indent=2)
+
+    def _start_part(self):
+        part = _Part(self.part_path(len(self.parts)))
+        self.parts.append(part)
+        self._put(part)
+
+    def _end_part(self):
+        self._flush()
+        self._put(_EndOfPart())
+
+    def _flush(self):
+        if self.buffer:
+            self._put(b"".join(self.buffer))
+            self.buffer = []
+            self.buffer_size = 0
+
+    def _put(self, item):
+        self._check_error()
+        self.queue.put(item)
+
+    def _check_error(self):
+        if self.error is not None:
+            raise IOError("Writing part file failed: " + str(self.error))
+
+    def _compressor(self):
+        if self.compression == "gzip":
+            level = 6 if self.compression_level is None else self.compression_level
+            return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif self.compression == "zstd":
+            import zstandard
+            level = 3 if self.compression_level is None else self.compression_level
+            return zstandard.ZstdCompressor(level=level).compressobj()
+        return None
+
+    def _compress_parts(self):
+        part = part_file = compressor = hasher = None
+
+        def write(data):
+            if data:
+                part_file.write(data)
+                hasher.update(data)
+                part.size += len(data)
+
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            if self.error is not None:
+                continue # keep draining so the parser is never blocked
+            try:
+                if isinstance(item, _Part):
+                    part = item
+                    part_file = open(part.path, "wb")
+                    compressor = self._compressor()
+                    hasher = hashlib.sha256()
+                elif isinstance(item, _EndOfPart):
+                    if compressor is not None:
+                        write(compressor.flush())
+                    part_file.close()
+                    part.sha256 = hasher.hexdigest()
+                else:
+                    write(item if compressor is None else compressor.compress(item))
+            except Exception as e:
+                self.error = e
@@ -0,0 +1,176 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import io
+import logging
+import queue
+import threading
+import zlib
+
+
+class PipelineCancelled(Exception):
+    """
+    Raised inside a producer when the consumer closed the pipeline early
+    """
+    pass
+
+
+class _EndOfStream(object):
+    """
+    Marks the end of a stage's output, optionally carrying the error that ended it
+    """
+    def __init__(self, error=None):
+        self.error = error
+
+
+class StreamPipeline(object):
+    """
+    Overlaps download, decompression and parsing of a single gzipped list
+
+    producer is a callable taking a write callback, e.g.
+        lambda write: ftp.retrbinary("RETR movies.list.gz", write)
+    it is run in a download thread and every chunk it writes goes through a
+    bounded queue into a decompression thread, which feeds decoded bytes
+    through a second bounded queue to the reader returned by open().
+    Nothing is written to disk, and a slow stage blocks the faster ones
+    instead of letting the queues grow without limit.
+    """
+
+    def __init__(self, producer, queue_size=64, name="stream"):
+        self.producer = producer
+        self.name = name
+        self.compressed = queue.Queue(queue_size)
+        self.decompressed = queue.Queue(queue_size)
+        self.cancelled = threading.Event()
+        self.threads = []
+
+    def start(self):
+        for target, name in ((self._download, "download"), (self._decompress, "decompress")):
+            thread = threading.Thread(target=target, name=self.name + "-" + name, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def open(self, encoding='iso-8859-1'):
+        """
+        Starts the pipeline and returns a text file object over the decompressed stream
+        """
+        if not self.threads:
+            self.start()
+        return io.TextIOWrapper(io.BufferedReader(_QueueReader(self)), encoding=encoding)
+
+    def cancel(self):
+        """
+        Stops all stages, used when the consumer stops reading before the end
+        """
+        self.cancelled.set()
+        for thread in self.threads:
+            thread.join()
+
+    def _put(self, q, item):
+        # never block forever, so a cancelled consumer releases the producers
+        while not self.cancelled.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise PipelineCancelled(self.name)
+
+    def _get(self, q):
+        while not self.cancelled.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        raise PipelineCancelled(self.name)
+
+    def _download(self):
+        end = _EndOfStream()
+        try:
+            self.producer(lambda chunk: self._put(self.compressed, bytes(chunk)))
+        except PipelineCancelled:
+            return
+        except Exception as e:
+            logging.error("Download stage failed for: " + self.name + "\n\t" + str(e))
+            end = _EndOfStream(e)
+        try:
+            self._put(self.compressed, end)
+        except PipelineCancelled:
+            pass
+
+    def _decompress(self):
+        end = _EndOfStream()
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            while True:
+                chunk = self._get(self.compressed)
+                if isinstance(chunk, _EndOfStream):
+                    end = chunk
+                    if end.error is None and not decompressor.eof:
+                        end = _EndOfStream(EOFError("Compressed stream ended before the end-of-stream marker: " + self.name))
+                    break
+                while chunk:
+                    data = decompressor.decompress(chunk)
+                    if data:
+                        self._put(self.decompressed, data)
+                    chunk = decompressor.unused_data
+                    if decompressor.eof and chunk:
+                        # concatenated gzip members
+                        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        except PipelineCancelled:
+            return
+        except Exception as e:
+            logging.error("Decompression stage failed for: " + self.name + "\n\t" + str(e))
+            end = _EndOfStream(e)
+        try:
+            self._put(self.decompressed, end)
+        except PipelineCancelled:
+            pass
+
+
+class _QueueReader(io.RawIOBase):
+    """
+    Raw binary reader on top of the last queue of a StreamPipeline
+    """
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.pending = memoryview(b"")
+        self.finished = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self.pending and not self.finished:
+            item = self.pipeline._get(self.pipeline.decompressed)
+            if isinstance(item, _EndOfStream):
+                self.finished = True
+                if item.error is not None:
+                    raise item.error
+            else:
+                self.pending = memoryview(item)
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            self.pipeline.cancel()
+        super(_QueueReader, self).close()
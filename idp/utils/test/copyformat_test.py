@@ -0,0 +1,52 @@
+import io
+import unittest
+from ..copyformat import copy_field, parse_copy_line, NULL
+from ..recordwriters import CopyWriter
+from ...parser.actorsparser import ActorsParser
+from ...parser.records import Credit
+
+
+class CopyFormatTests(unittest.TestCase):
+    values = [
+        "Anno 2033 (1973)",
+        "tab\there",
+        "new\nline\r\n",
+        "back\\slash \\N \\t",
+        "\"'Allo 'Allo!\" (1982) {A Bun in the Oven (#8.0)}",
+        "Ünïcödé",
+        "\\"
+    ]
+
+    def test_round_trip(self):
+        line = "\t".join(copy_field(value) for value in self.values) + "\n"
+        self.assertEqual(line.count("\t"), len(self.values) - 1)
+        self.assertEqual(line.count("\n"), 1)
+        self.assertEqual(parse_copy_line(line), self.values)
+
+    def test_null(self):
+        self.assertEqual(copy_field(""), NULL)
+        self.assertEqual(copy_field(None), NULL)
+        self.assertEqual(parse_copy_line("\\N\ta\t\\\\N\n"), [None, "a", "\\N"])
+
+    def test_reader_escapes(self):
+        self.assertEqual(parse_copy_line("\\x41\\101\\b\\v\\f\\q"), ["AA\b\v\f" + "q"])
+
+    def test_copy_writer(self):
+        output, create_file, post_load_file = io.StringIO(), io.StringIO(), io.StringIO()
+        output.close = create_file.close = post_load_file.close = lambda: None
+        writer = CopyWriter(output, ActorsParser.db_table_info, create_file, post_load_file)
+        credit = Credit("Johnny", "Depp", "Cry-Baby (1990)", "Cry-Baby (1990)", "", "(as J.\tD.)", "", "[Wade]")
+        writer.write(credit)
+        writer.close()
+        self.assertEqual(parse_copy_line(output.getvalue()), ["Johnny", "Depp", "Cry-Baby (1990)", "(as J.\tD.)", None, "[Wade]"])
+        self.assertIn("CREATE TABLE actors(name VARCHAR(127)", create_file.getvalue())
+        self.assertNotIn("PRIMARY KEY", create_file.getvalue())
+        self.assertNotIn("CHARACTER SET", create_file.getvalue())
+        self.assertEqual(post_load_file.getvalue().splitlines(), [
+            "CREATE INDEX actors_title_idx ON actors (title);",
+            "CREATE INDEX actors_surname_name_idx ON actors (surname, name);"
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
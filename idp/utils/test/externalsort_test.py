@@ -0,0 +1,39 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from ..externalsort import sort_lines
+
+
+class ExternalSortTests(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.output_dir, "movies.list.tsv")
+        self.lines = ["title %d\t%d\n" % (i, random.randint(1900, 2020)) for i in range(1000)] + ["Ünïcödé\t1999\n", "\"quoted\"\t2000\n"]
+        random.shuffle(self.lines)
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def sort(self, lines, **kwargs):
+        with open(self.path, "w", encoding='utf-8') as output_file:
+            output_file.writelines(lines)
+        sort_lines(self.path, **kwargs)
+        with open(self.path, encoding='utf-8') as sorted_file:
+            return sorted_file.readlines()
+
+    def test_in_memory(self):
+        self.assertEqual(self.sort(self.lines), sorted(self.lines))
+
+    def test_merges_runs(self):
+        self.assertEqual(self.sort(self.lines, chunk_lines=100), sorted(self.lines))
+        # no run or temporary files are left behind
+        self.assertEqual(os.listdir(self.output_dir), ["movies.list.tsv"])
+
+    def test_last_line_without_newline(self):
+        self.assertEqual(self.sort(["b\n", "a"]), ["a\n", "b\n"])
+
+
+if __name__ == '__main__':
+    unittest.main()
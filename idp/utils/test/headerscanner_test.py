@@ -0,0 +1,58 @@
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from ..headerscanner import skip_header
+from ..streampipeline import StreamPipeline
+from ...parser.actorsparser import ActorsParser
+from ...parser.parsinghelper import ParsingHelper
+
+HEADER = (b"CRC: 0x2B8C6F21  File: actors.list  Date: Fri Dec 22 00:00:00 2017\n\n"
+          b"Copyright 1990-2017 The Internet Movie Database, Inc.  All rights reserved.\n\n"
+          + b"Name mentioned in passing\n" * 300 +
+          b"THE ACTORS LIST\n===============\n\nName\t\t\tTitles \n----\t\t\t------\n")
+DATA = b"Abbott, Bud\t\tAnno 2033 (1973)  [Himself]\n\t\t\tAnno 2006 (2007) (TV)\n"
+
+
+class HeaderScannerTests(unittest.TestCase):
+    def setUp(self):
+        self.input_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.input_dir, "actors.list")
+        with open(self.path, "wb") as list_file:
+            list_file.write(HEADER + DATA)
+
+    def tearDown(self):
+        shutil.rmtree(self.input_dir)
+
+    def test_seekable_file(self):
+        input_file, offset, header_lines = skip_header(open(self.path, encoding='iso-8859-1'), ActorsParser.header_end_pattern, 0)
+        with input_file:
+            self.assertEqual(offset, len(HEADER))
+            self.assertEqual(header_lines, HEADER.count(b"\n"))
+            self.assertEqual(input_file.read(), DATA.decode('iso-8859-1'))
+
+    def test_stream(self):
+        stream = StreamPipeline(lambda write: write(gzip.compress(HEADER + DATA))).open()
+        input_file, offset, _ = skip_header(stream, ActorsParser.header_end_pattern, 0)
+        with input_file:
+            self.assertEqual(offset, len(HEADER))
+            self.assertEqual(input_file.read(), DATA.decode('iso-8859-1'))
+
+    def test_unknown_header_falls_back_to_line_count(self):
+        input_file, offset, header_lines = skip_header(open(self.path, encoding='iso-8859-1'), rb"^NOT THERE\n", HEADER.count(b"\n"))
+        with input_file:
+            self.assertEqual(offset, len(HEADER))
+            self.assertEqual(header_lines, HEADER.count(b"\n"))
+            self.assertEqual(input_file.read(), DATA.decode('iso-8859-1'))
+
+    def test_data_offsets(self):
+        with gzip.open(self.path + ".gz", "wb") as gz_file:
+            gz_file.write(HEADER + DATA)
+        self.assertEqual(ActorsParser.find_data_offset(self.path + ".gz"), len(HEADER))
+        self.assertEqual(ParsingHelper.data_offsets(self.input_dir, ["actors", "movies"]), {"actors": len(HEADER), "movies": None})
+
+
+if __name__ == '__main__':
+    unittest.main()
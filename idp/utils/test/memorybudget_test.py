@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+from ..memorybudget import MemoryBudget, parse_size, current_rss
+from ..externalsort import sort_lines
+
+
+class MemoryBudgetTests(unittest.TestCase):
+    def test_parse_size(self):
+        self.assertEqual(parse_size("1048576"), 1 << 20)
+        self.assertEqual(parse_size("512M"), 512 << 20)
+        self.assertEqual(parse_size("2g"), 2 << 30)
+        self.assertEqual(parse_size("1.5GiB"), 3 << 29)
+        with self.assertRaises(ValueError):
+            parse_size("lots")
+
+    def test_rss(self):
+        self.assertGreater(current_rss(), 1 << 20)
+
+    def test_shrinks_near_the_limit(self):
+        shrunk = []
+        budget = MemoryBudget(current_rss() // 2, name="test")
+        budget.register(lambda: shrunk.append(True))
+        with self.assertLogs(level='WARNING'):
+            budget.check()
+        self.assertEqual(shrunk, [True])
+        self.assertGreater(budget.peak, 0)
+
+    def test_no_limit(self):
+        shrunk = []
+        budget = MemoryBudget()
+        budget.register(lambda: shrunk.append(True))
+        budget.check()
+        self.assertFalse(budget.near())
+        self.assertEqual(shrunk, [])
+        self.assertGreater(budget.peak, 0)
+
+    def test_sort_spills_when_near(self):
+        output_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(output_dir, "movies.list.tsv")
+            lines = ["%05d\n" % ((i * 7919) % 30000) for i in range(30000)]
+            with open(path, "w", encoding='utf-8') as output_file:
+                output_file.writelines(lines)
+            # every chunk is spilled after one read batch
+            sort_lines(path, budget=MemoryBudget(1))
+            with open(path, encoding='utf-8') as sorted_file:
+                self.assertEqual(sorted_file.readlines(), sorted(lines))
+        finally:
+            shutil.rmtree(output_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
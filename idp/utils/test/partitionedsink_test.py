@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+from ..partitionedsink import PartitionedSink, compile_filter
+from ..recordwriters import TsvWriter
+from ...parser.records import Movie
+
+
+def movie(title, full_name, type=""):
+    return Movie(title, full_name, type, "", "", "", "")
+
+
+class PartitionedSinkTests(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.movies = [
+            movie("The Matrix (1999)", "The Matrix (1999)"),
+            movie("Heat (1995)", "Heat (1995)"),
+            movie("\"Friends\" (1994)", "\"Friends\" (1994)"),
+            movie("Quake (1996) (VG)", "Quake (1996)", "(VG)"),
+            movie("Unknown (????)", "Unknown (????)"),
+            movie("Toy Story (1995)", "Toy Story (1995)")
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def write_movies(self, **kwargs):
+        sink = PartitionedSink(self.output_dir, "movies.list.tsv", lambda output_file: TsvWriter(output_file, ["title"]), **kwargs)
+        for record in self.movies:
+            sink.write(record)
+        sink.close()
+        return sink
+
+    def read_partition(self, type, year):
+        with open(os.path.join(self.output_dir, "type=" + type, "year=" + year, "movies.list.tsv"), encoding='utf-8') as partition_file:
+            return partition_file.read().splitlines()
+
+    def test_partitions(self):
+        sink = self.write_movies()
+        self.assertEqual(sink.partitions(), [("MOVIE", None), ("MOVIE", 1995), ("MOVIE", 1999), ("TV_SERIES", 1994), ("VG", 1996)])
+        self.assertEqual(self.read_partition("MOVIE", "1995"), ["Heat (1995)", "Toy Story (1995)"])
+        self.assertEqual(self.read_partition("MOVIE", "unknown"), ["Unknown (????)"])
+
+    def test_filter(self):
+        sink = self.write_movies(accept=compile_filter("type == 'MOVIE' and year >= 1995"))
+        self.assertEqual(sink.partitions(), [("MOVIE", 1995), ("MOVIE", 1999)])
+        self.assertEqual(sorted(os.listdir(self.output_dir)), ["type=MOVIE"])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.output_dir, "type=MOVIE"))), ["year=1995", "year=1999"])
+
+    def test_reopens_closed_files(self):
+        sink = self.write_movies(max_open_files=1)
+        self.assertGreater(sink.reopened, 0)
+        self.assertEqual(self.read_partition("MOVIE", "1995"), ["Heat (1995)", "Toy Story (1995)"])
+
+    def test_invalid_filter(self):
+        with self.assertRaises(ValueError):
+            compile_filter("__import__('os')")
+        with self.assertRaises(ValueError):
+            compile_filter("title == 'x'")
+
+
+if __name__ == '__main__':
+    unittest.main()
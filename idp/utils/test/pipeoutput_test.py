@@ -0,0 +1,56 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from ..pipeoutput import open_pipe
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..")
+
+
+class PipeOutputTests(unittest.TestCase):
+    def setUp(self):
+        self.input_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.input_dir, "movies.list"), "w", encoding='iso-8859-1') as list_file:
+            list_file.write("MOVIES LIST\n===========\n\n")
+            for i in range(100000):
+                list_file.write("Synthetic Movie %d (2000)\t\t\t2000\n" % i)
+
+    def tearDown(self):
+        shutil.rmtree(self.input_dir)
+
+    def pipe(self, *arguments):
+        return subprocess.Popen([sys.executable, os.path.join(ROOT, "imdbparser.py"), "-i", self.input_dir, "--no_cache", "--pipe", "movies"] + list(arguments),
+                                cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    def test_open_pipe(self):
+        path = os.path.join(self.input_dir, "out")
+        with open_pipe(path) as output_file:
+            output_file.write("a\tb\n")
+        with open(path, encoding='utf-8') as output_file:
+            self.assertEqual(output_file.read(), "a\tb\n")
+
+    def test_stdout_carries_only_data(self):
+        process = self.pipe("--columns", "movies=title,year")
+        stdout, stderr = process.communicate()
+        self.assertEqual(process.returncode, 0)
+        lines = stdout.decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 100000)
+        self.assertEqual(lines[0], "Synthetic Movie 0 (2000)\t2000")
+        self.assertIn(b"Lines processed", stderr)
+        # nothing but the input is on disk
+        self.assertEqual(os.listdir(self.input_dir), ["movies.list"])
+
+    def test_closed_pipe(self):
+        process = self.pipe()
+        process.stdout.readline()
+        process.stdout.close()
+        stderr = process.stderr.read()
+        process.stderr.close()
+        self.assertEqual(process.wait(), 141)
+        self.assertNotIn(b"Traceback", stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+from ..recordassembler import RecordAssembler
+from ...parser.records import Plot
+
+
+class RecordAssemblerTests(unittest.TestCase):
+    def setUp(self):
+        self.assembler = RecordAssembler(Plot)
+
+    def test_records_are_returned_when_next_one_starts(self):
+        self.assertIsNone(self.assembler.start("first"))
+        self.assembler.add("one")
+        self.assembler.add("two")
+        self.assertEqual(self.assembler.start("second"), Plot("first", "one two"))
+        self.assertEqual(self.assembler.finish(), Plot("second", ""))
+
+    def test_finish_is_idempotent(self):
+        self.assembler.start("first")
+        self.assembler.add("text")
+        self.assertEqual(self.assembler.finish(), Plot("first", "text"))
+        self.assertIsNone(self.assembler.finish())
+
+
+if __name__ == '__main__':
+    unittest.main()
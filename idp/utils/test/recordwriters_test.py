@@ -0,0 +1,101 @@
+import io
+import json
+import sqlite3
+import unittest
+from ..recordwriters import TsvWriter, JsonWriter, SqlWriter
+from ..dbscripthelper import DbScriptHelper
+from ...parser.records import Movie, Rating
+from ...parser.ratingsparser import RatingsParser
+
+
+class RecordWritersTests(unittest.TestCase):
+    def setUp(self):
+        self.output = io.StringIO()
+        self.output.close = lambda: None
+        self.rating = Rating("0000000125", "1234", "8.5", "Anno 2033 (1973)", "Anno 2033 (1973)", "")
+
+    def test_tsv(self):
+        writer = TsvWriter(self.output, Rating.fields)
+        writer.write(self.rating)
+        self.assertEqual(self.output.getvalue(), "0000000125\t1234\t8.5\tAnno 2033 (1973)\n")
+
+    def test_tsv_single_column(self):
+        writer = TsvWriter(self.output, ['title'])
+        writer.write(self.rating)
+        self.assertEqual(self.output.getvalue(), "Anno 2033 (1973)\n")
+
+    def test_json(self):
+        writer = JsonWriter(self.output, "rating")
+        writer.write(self.rating)
+        self.assertEqual(json.loads(self.output.getvalue()), {
+            "doc_type": "rating", "distribution": "0000000125", "votes": 1234, "rank": 8.5,
+            "year_released": "1973", "movie_name": "Anno 2033", "movie_type": "(MOVIE)"
+        })
+
+    def test_json_columns(self):
+        writer = JsonWriter(self.output, "rating", ["title", "year_released"])
+        writer.write(self.rating)
+        self.assertEqual(json.loads(self.output.getvalue()), {"doc_type": "rating", "title": "Anno 2033 (1973)", "year_released": "1973"})
+
+    def test_sql(self):
+        writer = SqlWriter(self.output, RatingsParser.db_table_info)
+        writer.write(self.rating)
+        writer.write(self.rating)
+        writer.close()
+        script = self.output.getvalue()
+        self.assertTrue(script.startswith("DROP TABLE IF EXISTS ratings;"))
+        self.assertIn("CHARACTER SET utf8", script)
+        self.assertEqual(script.count("('0000000125', '1234'"), 2)
+        self.assertEqual(script.count("INSERT INTO"), 1)
+        self.assertTrue(script.endswith(";\nCOMMIT;\n"))
+
+    def test_sql_batches(self):
+        writer = SqlWriter(self.output, RatingsParser.db_table_info, batch_rows=2)
+        for _ in range(5):
+            writer.write(self.rating)
+        writer.close()
+        self.assertEqual(self.output.getvalue().count("INSERT INTO"), 3)
+
+    def test_sql_batch_bytes(self):
+        # 93 characters but 153 bytes, each row fills a batch of 120 bytes
+        title = "\xe9" * 60
+        writer = SqlWriter(self.output, RatingsParser.db_table_info, batch_bytes=120)
+        for _ in range(2):
+            writer.write(Rating("0000000125", "1234", "8.5", title, title, ""))
+        writer.close()
+        self.assertEqual(self.output.getvalue().count("INSERT INTO"), 2)
+
+    def test_sql_escaping(self):
+        self.assertEqual(DbScriptHelper(RatingsParser.db_table_info, "mysql").quote("It's a \\ \n"), "'It\\'s a \\\\ \\n'")
+        self.assertEqual(DbScriptHelper(RatingsParser.db_table_info, "postgres").quote("It's a \\ \n"), "'It''s a \\ \n'")
+
+    def test_sql_loads_into_sqlite(self):
+        titles = ["Anno 2033 (1973)", "\"'Allo 'Allo!\" (1982)", "Back\\slash (2000)", "Line\nbreak (2001)"]
+        writer = SqlWriter(self.output, RatingsParser.db_table_info, "sqlite", batch_rows=3)
+        for title in titles:
+            writer.write(Rating("0000000125", "1234", "8.5", title, title, ""))
+        writer.close()
+        connection = sqlite3.connect(":memory:")
+        connection.executescript(self.output.getvalue())
+        self.assertEqual(sorted(row[0] for row in connection.execute("SELECT title FROM ratings")), sorted(titles))
+
+    def test_sql_copy(self):
+        writer = SqlWriter(self.output, RatingsParser.db_table_info, "postgres", copy=True)
+        writer.write(Rating("0000000125", "1234", "8.5", "Tab\tand \\ (2000)", "", ""))
+        writer.close()
+        script = self.output.getvalue()
+        self.assertNotIn("CHARACTER SET", script)
+        self.assertIn("COPY ratings (distribution, votes, rank, title) FROM STDIN;\n0000000125\t1234\t8.5\tTab\\tand \\\\ (2000)\n\\.\n", script)
+        with self.assertRaises(ValueError):
+            SqlWriter(io.StringIO(), RatingsParser.db_table_info, "mysql", copy=True)
+
+    def test_derived_title_fields(self):
+        movie = Movie("\"'Allo 'Allo!\" (1982) {A Bun in the Oven (#8.0)}", "\"'Allo 'Allo!\" (1982)", "", "A Bun in the Oven", "(#8.0)", "", "1991")
+        self.assertEqual(movie.movie_name, "'Allo 'Allo!")
+        self.assertEqual(movie.movie_type, "(TV_SERIES)")
+        self.assertEqual(movie.year_released, "1982")
+        self.assertFalse(hasattr(movie, '__dict__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from ..rejectsink import RejectSink, TooManyRejectsError
+from ...parser.genresparser import GenresParser
+
+
+class RejectSinkTests(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.output_dir, "genres.list.rejects.tsv")
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_no_file_without_rejects(self):
+        RejectSink(self.path, "genres.list").close()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_ratio_aborts(self):
+        sink = RejectSink(self.path, "genres.list", max_reject_ratio=0.5, min_lines=4, batch_size=2)
+        sink.reject("bad\n", 10, 100, 1)
+        sink.reject("bad\n", 11, 104, 2)
+        with self.assertRaises(TooManyRejectsError):
+            sink.reject("bad\n", 12, 108, 4)
+        with open(self.path) as reject_file:
+            self.assertEqual(len(reject_file.readlines()), 3)
+
+    def test_parser_writes_line_numbers_and_offsets(self):
+        header = "\n" * GenresParser.number_of_lines_to_be_skipped
+        data = "Anno 2033 (1973)\t\tDrama\nnot a genre line\nAnno 2033 (1973)\t\tShort\n"
+        parser = GenresParser({"mode": "TSV", "input_dir": "", "output_dir": self.output_dir}, io.StringIO(header + data))
+        parser.start_processing()
+        with open(self.path) as reject_file:
+            self.assertEqual(reject_file.read(), "%d\t%d\tnot a genre line\n" % (len(header) + 2, len(header) + data.index("not")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import unittest
+from ..resultcache import ResultCache
+from ...parser.moviesparser import MoviesParser
+from ...parser.genresparser import GenresParser
+from ...parser.parsinghelper import ParsingHelper
+
+
+class ResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache = ResultCache(os.path.join(self.root, "cache"))
+        self.input_path = os.path.join(self.root, "movies.list")
+        shutil.copy(os.path.join(os.path.dirname(__file__), "..", "..", "..", "samples", "movies.list"), self.input_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def output_dir(self, name):
+        path = os.path.join(self.root, name)
+        os.makedirs(path)
+        return path
+
+    def test_key_depends_on_input_parser_and_options(self):
+        key = self.cache.key(self.input_path, MoviesParser, {"mode": "TSV"})
+        self.assertEqual(key, self.cache.key(self.input_path, MoviesParser, {"mode": "TSV"}))
+        self.assertNotEqual(key, self.cache.key(self.input_path, MoviesParser, {"mode": "JSON"}))
+        self.assertNotEqual(key, self.cache.key(self.input_path, GenresParser, {"mode": "TSV"}))
+        with open(self.input_path, "a") as input_file:
+            input_file.write("\nmore")
+        self.assertNotEqual(key, self.cache.key(self.input_path, MoviesParser, {"mode": "TSV"}))
+
+    def test_parse_one_restores_cached_outputs(self):
+        first = {"mode": "TSV", "input_dir": self.root, "output_dir": self.output_dir("first"), "cache": self.cache}
+        second = dict(first, output_dir=self.output_dir("second"))
+        ParsingHelper.parse_one("movies", first)
+        self.assertEqual(len(os.listdir(self.cache.cache_dir)), 1)
+        ParsingHelper.parse_one("movies", second)
+        self.assertEqual(os.listdir(second["output_dir"]), ["movies.list.tsv"])
+        with open(os.path.join(first["output_dir"], "movies.list.tsv")) as a, open(os.path.join(second["output_dir"], "movies.list.tsv")) as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_lru_eviction(self):
+        paths = []
+        for i in range(3):
+            path = os.path.join(self.root, "output%d" % i)
+            with open(path, "w") as output_file:
+                output_file.write("x" * 100)
+            paths.append(path)
+        self.cache.size_limit = 250
+        self.cache.store("a", [paths[0]])
+        self.cache.store("b", [paths[1]])
+        os.utime(self.cache.entry_path("a"), (0, 0))
+        os.utime(self.cache.entry_path("b"), (1, 1))
+        self.cache.restore("a", self.output_dir("restored"))
+        self.cache.store("c", [paths[2]])
+        self.assertEqual(sorted(os.listdir(self.cache.cache_dir)), ["a", "c"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from ..runmanifest import finalize, file_sha256, run_id, MANIFEST_NAME
+
+
+class RunManifestTests(unittest.TestCase):
+    def setUp(self):
+        self.output_dirs = [tempfile.mkdtemp(), tempfile.mkdtemp()]
+
+    def tearDown(self):
+        for output_dir in self.output_dirs:
+            shutil.rmtree(output_dir)
+
+    def write(self, output_dir, name, lines):
+        path = os.path.join(output_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding='utf-8') as output_file:
+            output_file.writelines(lines)
+
+    def test_same_content_in_any_order(self):
+        rows = ["c\t3\n", "a\t1\n", "b\t2\n"]
+        for output_dir, order, log in zip(self.output_dirs, (rows, rows[::-1]), ("first run\n", "second run\n")):
+            self.write(output_dir, "movies.list.tsv", order)
+            self.write(output_dir, os.path.join("type=MOVIE", "year=1999", "movies.list.tsv"), order)
+            self.write(output_dir, "log_movies.list.txt", [log])
+            self.write(output_dir, "imdbparserAll.log", [log])
+        manifests = [finalize(output_dir, {"movies": ["digest"]}, {"mode": "TSV"}) for output_dir in self.output_dirs]
+
+        self.assertEqual(manifests[0]["digest"], manifests[1]["digest"])
+        self.assertEqual(sorted(manifests[0]["files"]), ["movies.list.tsv", "type=MOVIE/year=1999/movies.list.tsv"])
+        with open(os.path.join(self.output_dirs[1], "movies.list.tsv"), encoding='utf-8') as sorted_file:
+            self.assertEqual(sorted_file.readlines(), sorted(rows))
+        self.assertTrue(os.path.isfile(os.path.join(self.output_dirs[0], MANIFEST_NAME)))
+
+    def test_documents_are_not_sorted(self):
+        document = json.dumps({"records": 2, "titles_per_year": {"1990": 2}}, indent=1) + "\n"
+        for name in ("movies.list.aggregates.json", "movies.list.profile.json"):
+            self.write(self.output_dirs[0], name, [document])
+        finalize(self.output_dirs[0], {}, {})
+        for name in ("movies.list.aggregates.json", "movies.list.profile.json"):
+            with open(os.path.join(self.output_dirs[0], name), encoding='utf-8') as document_file:
+                self.assertEqual(document_file.read(), document)
+
+    def test_different_content(self):
+        self.write(self.output_dirs[0], "movies.list.tsv", ["a\t1\n"])
+        self.write(self.output_dirs[1], "movies.list.tsv", ["a\t2\n"])
+        manifests = [finalize(output_dir, {}, {}) for output_dir in self.output_dirs]
+        self.assertNotEqual(manifests[0]["digest"], manifests[1]["digest"])
+
+    def test_input_digests(self):
+        path = os.path.join(self.output_dirs[0], "movies.list")
+        self.write(self.output_dirs[0], "movies.list", ["MOVIES LIST\n"])
+        with gzip.open(path + ".gz", "wb") as gzip_file:
+            gzip_file.write(b"MOVIES LIST\n")
+        self.assertEqual(file_sha256(path), file_sha256(path + ".gz"))
+        self.assertEqual(run_id({"movies": [file_sha256(path)]}, {"mode": "TSV"}), run_id({"movies": [file_sha256(path + ".gz")]}, {"mode": "TSV"}))
+        self.assertNotEqual(run_id({"movies": ["a"]}, {"mode": "TSV"}), run_id({"movies": ["a"]}, {"mode": "JSON"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from ..shardedfile import ShardedFile
+
+
+class ShardedFileTests(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.output_dir, "movies.list.tsv")
+        self.rows = ["title %d\t%d\n" % (i, 1900 + i) for i in range(25)]
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def write_rows(self, **kwargs):
+        sharded_file = ShardedFile(self.path, **kwargs)
+        for row in self.rows:
+            sharded_file.write(row)
+        sharded_file.close()
+        with open(sharded_file.manifest_path(), encoding='utf-8') as manifest_file:
+            return json.load(manifest_file)
+
+    def read_part(self, part):
+        with open(os.path.join(self.output_dir, part["path"]), "rb") as part_file:
+            data = part_file.read()
+        self.assertEqual(hashlib.sha256(data).hexdigest(), part["sha256"])
+        if part["path"].endswith(".gz"):
+            data = gzip.decompress(data)
+        return data.decode('utf-8')
+
+    def test_rollover_by_rows(self):
+        manifest = self.write_rows(max_rows=10)
+        self.assertEqual([part["rows"] for part in manifest["parts"]], [10, 10, 5])
+        self.assertEqual(manifest["parts"][0]["path"], "movies.list.part-00000.tsv")
+        self.assertEqual("".join(self.read_part(part) for part in manifest["parts"]), "".join(self.rows))
+
+    def test_rollover_by_bytes(self):
+        manifest = self.write_rows(max_bytes=50)
+        for part in manifest["parts"]:
+            self.assertLess(part["bytes"] - len(self.rows[-1]), 50)
+        self.assertEqual(manifest["rows"], 25)
+
+    def test_gzip_parts(self):
+        manifest = self.write_rows(max_rows=20, compression="gzip", compression_level=1)
+        self.assertEqual(manifest["parts"][1]["path"], "movies.list.part-00001.tsv.gz")
+        self.assertEqual("".join(self.read_part(part) for part in manifest["parts"]), "".join(self.rows))
+
+    def test_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            ShardedFile(self.path, compression="rar")
+
+
+if __name__ == '__main__':
+    unittest.main()
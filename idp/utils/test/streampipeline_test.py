@@ -0,0 +1,70 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from ..streampipeline import StreamPipeline
+from ...parser.moviesparser import MoviesParser
+
+
+def chunked_producer(data, chunk_size=7):
+    def producer(write):
+        for i in range(0, len(data), chunk_size):
+            write(data[i:i + chunk_size])
+    return producer
+
+
+class StreamPipelineTests(unittest.TestCase):
+    def setUp(self):
+        self.lines = ["line %d \xe9\n" % i for i in range(5000)]
+        self.data = gzip.compress("".join(self.lines).encode('iso-8859-1'))
+
+    def test_lines_are_decoded_in_order(self):
+        with StreamPipeline(chunked_producer(self.data), queue_size=2).open() as stream:
+            self.assertEqual(list(stream), self.lines)
+
+    def test_concatenated_members(self):
+        data = self.data + gzip.compress(b"last\n")
+        with StreamPipeline(chunked_producer(data, 4096)).open() as stream:
+            self.assertEqual(list(stream), self.lines + ["last\n"])
+
+    def test_producer_error_reaches_reader(self):
+        def producer(write):
+            write(self.data[:100])
+            raise IOError("connection lost")
+
+        with StreamPipeline(producer).open() as stream:
+            with self.assertRaises(IOError):
+                stream.read()
+
+    def test_truncated_stream_is_an_error(self):
+        with StreamPipeline(chunked_producer(self.data[:-20], 4096)).open() as stream:
+            with self.assertRaises(EOFError):
+                stream.read()
+
+    def test_early_close_stops_producer(self):
+        pipeline = StreamPipeline(chunked_producer(self.data, 16), queue_size=1)
+        stream = pipeline.open()
+        self.assertEqual(stream.readline(), self.lines[0])
+        stream.close()
+        for thread in pipeline.threads:
+            self.assertFalse(thread.is_alive())
+
+    def test_parser_reads_the_stream(self):
+        movies = "dummy\n" * 12 + "MOVIES LIST\n===========\n\n" + "Ed Wood (1994)\t\t\t\t\t1994\nCry-Baby (1990)\t\t\t\t\t1990\n"
+        output_dir = tempfile.mkdtemp()
+        try:
+            # the input directory has no movies.list, the list only comes from the stream
+            preferences_map = {"mode": "JSON", "input_dir": output_dir, "output_dir": output_dir}
+            stream = StreamPipeline(chunked_producer(gzip.compress(movies.encode('iso-8859-1')))).open()
+            MoviesParser(preferences_map, stream).start_processing()
+            with open(os.path.join(output_dir, "movies.list.json"), encoding='utf-8') as json_file:
+                names = [json.loads(line)["movie_name"] for line in json_file]
+        finally:
+            shutil.rmtree(output_dir)
+        self.assertEqual(names, ["Ed Wood", "Cry-Baby"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from ..titlefilter import BloomFilter, HashSetFilter, build_title_filter
+
+
+class TitleFilterTests(unittest.TestCase):
+    def setUp(self):
+        self.titles = ["Movie %d (%d)" % (i, 1900 + i % 120) for i in range(5000)]
+        self.others = ["Other %d (%d)" % (i, 1900 + i % 120) for i in range(5000)]
+
+    def test_bloom_filter(self):
+        bloom_filter = build_title_filter(self.titles, len(self.titles), error_rate=0.01)
+        self.assertIsInstance(bloom_filter, BloomFilter)
+        self.assertTrue(all(title in bloom_filter for title in self.titles))
+        false_positives = sum(title in bloom_filter for title in self.others)
+        self.assertLess(false_positives, len(self.others) * 0.03)
+        # about 10 bits per title
+        self.assertLess(len(bloom_filter.bits), len(self.titles) * 2)
+
+    def test_hash_set_filter(self):
+        hash_set_filter = build_title_filter(self.titles + self.titles[:10], len(self.titles), exact=True)
+        self.assertIsInstance(hash_set_filter, HashSetFilter)
+        self.assertEqual(len(hash_set_filter), len(self.titles))
+        self.assertTrue(all(title in hash_set_filter for title in self.titles))
+        self.assertFalse(any(title in hash_set_filter for title in self.others))
+
+    def test_str_identifies_content(self):
+        self.assertEqual(str(build_title_filter(self.titles, len(self.titles))), str(build_title_filter(self.titles, len(self.titles))))
+        self.assertNotEqual(str(build_title_filter(self.titles, len(self.titles))), str(build_title_filter(self.others, len(self.others))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+This file is part of imdb-data-parser.
+
+imdb-data-parser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+imdb-data-parser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with imdb-data-parser.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+import math
+from array import array
+from bisect import bisect_left
+
+
+def title_hash(title):
+    """
+    Returns a 128 bit hash of a #TITLE as two 64 bit integers
+    """
+    digest = hashlib.blake2b(title.encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+
+
+class BloomFilter(object):
+    """
+    Set of titles in about 10 bits per title (at 1% error rate)
+
+    `title in bloom_filter` is True for every added title and for about
+    error_rate of the others, so a few titles outside of the set pass
+    """
+
+    def __init__(self, capacity, error_rate=0.01, description=""):
+        capacity = max(capacity, 1)
+        self.size = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+        self.description = description
+
+    def positions(self, title):
+        # double hashing, k positions from two hashes
+        h1, h2 = title_hash(title)
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hash_count)]
+
+    def add(self, title):
+        bits = self.bits
+        for position in self.positions(title):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, title):
+        bits = self.bits
+        for position in self.positions(title):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self):
+        return self.count
+
+    def __str__(self):
+        # part of result cache keys, so it identifies the content
+        return "BloomFilter(%s, %d titles, %s)" % (self.description, self.count, hashlib.sha256(self.bits).hexdigest())
+
+
+class HashSetFilter(object):
+    """
+    Set of titles kept as a sorted array of 64 bit title hashes, 8 bytes per
+    title. Unlike BloomFilter it has no false positives in practice
+    """
+
+    def __init__(self, description=""):
+        self.hashes = array('Q')
+        self.is_sorted = True
+        self.description = description
+
+    def add(self, title):
+        self.hashes.append(title_hash(title)[0])
+        self.is_sorted = False
+
+    def freeze(self):
+        """
+        Sorts the hashes, called after the last add
+        """
+        if not self.is_sorted:
+            self.hashes = array('Q', sorted(set(self.hashes)))
+            self.is_sorted = True
+
+    def __contains__(self, title):
+        self.freeze()
+        hashes = self.hashes
+        value = title_hash(title)[0]
+        index = bisect_left(hashes, value)
+        return index < len(hashes) and hashes[index] == value
+
+    def __len__(self):
+        self.freeze()
+        return len(self.hashes)
+
+    def __str__(self):
+        self.freeze()
+        return "HashSetFilter(%s, %d titles, %s)" % (self.description, len(self.hashes), hashlib.sha256(self.hashes.tobytes()).hexdigest())
+
+
+def build_title_filter(titles, capacity, exact=False, error_rate=0.01, description=""):
+    """
+    Builds a BloomFilter or, if exact, a HashSetFilter of titles
+    capacity: expected number of titles, only used by BloomFilter
+    """
+    if exact:
+        title_filter = HashSetFilter(description)
+    else:
+        title_filter = BloomFilter(capacity, error_rate, description)
+    for title in titles:
+        title_filter.add(title)
+    if exact:
+        title_filter.freeze()
+    return title_filter
@@ -24,10 +24,12 @@ http://stackoverflow.com/a/8735625/878361
 
 import sys
 import argparse
-import datetime
-from idp.utils.loggerinitializer import *
-from idp.parser.parsinghelper import ParsingHelper
-from idp.settings import *
+
+
+def size(value):
+    # imported when the option is given, --list-parsers imports only the registry
+    from idp.utils.memorybudget import parse_size
+    return parse_size(value)
 
 
 # check python version
@@ -35,40 +37,216 @@ if sys.version_info.major != 3:
     sys.exit("Error: wrong version! You need to install python3 to run this application properly.")
 
 parser = argparse.ArgumentParser(description="an IMDB data parser")
-parser.add_argument('-m', '--mode', help='Parsing mode, defines output of parsing process. Default: TSV', choices=['TSV', 'SQL'])
+parser.add_argument('-m', '--mode', help='Parsing mode, defines output of parsing process. Default: TSV', choices=['TSV', 'JSON', 'SQL', 'COPY'])
+parser.add_argument('--sql_dialect', help='database of SQL mode scripts. Default: mysql', choices=['mysql', 'postgres', 'sqlite'])
+parser.add_argument('--sql_copy', action='store_true', help='writes rows as COPY FROM STDIN blocks instead of INSERT statements, postgres only')
 parser.add_argument('-i', '--input_dir', help='source directory of interface lists')
 parser.add_argument('-o', '--output_dir', help='destination directory for outputs')
 parser.add_argument('-u', '--update_lists', action='store_true', help='downloads lists from server')
+parser.add_argument('-s', '--stream', action='store_true', help='downloads and parses lists in one pass without writing them to input_dir')
+parser.add_argument('-c', '--concurrent', action='store_true', help='runs download, parse and load stages concurrently')
+parser.add_argument('-w', '--workers', type=int, help='number of parser processes in concurrent mode. Default: number of CPUs')
+parser.add_argument('--shard_rows', type=int, help='starts a new part file after this many rows (TSV and JSON modes)')
+parser.add_argument('--shard_bytes', type=int, help='starts a new part file after this many uncompressed bytes (TSV and JSON modes)')
+parser.add_argument('--compression', help='compresses output part files', choices=['gzip', 'zstd'])
+parser.add_argument('--compression_level', type=int, help='compression level, Default: 6 for gzip, 3 for zstd')
+parser.add_argument('--partition', action='store_true', help='writes titled lists to type=<type>/year=<year>/ directories (TSV and JSON modes)')
+parser.add_argument('--partition_filter', help='writes only partitions matching this expression of type and year, e.g. "type == \'MOVIE\' and year >= 1990"; implies --partition')
+parser.add_argument('--max_open_files', type=int, help='number of partition files kept open at a time. Default: 64')
+parser.add_argument('--title_filter', help='writes only records of titles in movies.list matching this expression of type and year, e.g. "type == \'MOVIE\'"')
+parser.add_argument('--exact_title_filter', action='store_true', help='keeps the titles of --title_filter in an exact set instead of a Bloom filter, which lets about 1%% of other titles through')
+parser.add_argument('--columns', action='append', metavar='LIST=COLUMN,...', help='writes only these columns of a list and skips extracting the others, e.g. actors=surname,name,title; may be repeated for other lists')
+parser.add_argument('--max_reject_ratio', type=float, help='aborts parsing a list when more than this ratio of its lines cannot be parsed, e.g. 0.05')
+parser.add_argument('--no_cache', action='store_true', help='parses every list even if a cached result exists')
+parser.add_argument('--hash_inputs', action='store_true', help='identifies cached inputs by content hash instead of size and modification time')
+parser.add_argument('--memory_limit', '--memory-limit', type=size, help='flushes buffers and spills to disk when the memory of a list gets near this size, e.g. 2G')
+parser.add_argument('--deterministic', action='store_true', help='names the output directory after the inputs, sorts output rows and writes a run manifest with file digests')
+parser.add_argument('--aggregates', action='store_true', help='counts titles per year, credits per person and similar while parsing and writes them to <list>.aggregates.json')
+parser.add_argument('--profile', action='store_true', help='profiles the columns while parsing (distinct and empty counts, value lengths, min and max numbers) and writes <list>.profile.json')
+parser.add_argument('--episode_index', action='store_true', help='builds a series, season and episode index while parsing movies.list, see idp/parser/episodeindex.py')
+parser.add_argument('--genre_bitmap', action='store_true', help='saves the genres of each title as a bitmap while parsing genres.list, see idp/parser/genrebitmap.py')
+parser.add_argument('--credit_graph', action='store_true', help='saves the person-title graph of actors and actresses lists as numpy arrays to credit_graph/ in output_dir, needs numpy')
+parser.add_argument('--pipe', metavar='LIST', help='parses only this list and writes it to stdout, logs and progress go to stderr and no output_dir is created')
+parser.add_argument('--pipe_path', help='writes the --pipe output to this file or named pipe instead of stdout')
+parser.add_argument('--list_parsers', '--list-parsers', action='store_true', help='lists the names of the lists that can be parsed and exits')
+parser.add_argument('--load_command', help='shell command run for each parsed list in concurrent mode, may use {list}, {mode} and {output_dir}')
 
 args = parser.parse_args()
 
+if args.list_parsers:
+    # answered before settings and parsers are imported, see benchmarks/startup_bench.py
+    from idp.parser import registry
+    try:
+        print("\n".join(registry.list_names()))
+        sys.stdout.flush()
+    except BrokenPipeError:
+        from idp.utils.pipeoutput import exit_on_broken_pipe
+        exit_on_broken_pipe()
+    sys.exit(0)
+
+import os
+import datetime
+import logging
+from idp.utils.loggerinitializer import initialize_logger
+from idp.parser.parsinghelper import ParsingHelper
+from idp import settings
+
 # preparing preferences map
 if args.mode:
     mode = args.mode
-elif MODE:
-    mode = 'JSON'
+elif settings.MODE:
+    mode = settings.MODE
 else: #default
     mode = "TSV"
 
 if args.input_dir:
     input_dir = args.input_dir
 else:
-    input_dir = INPUT_DIR
+    input_dir = settings.INPUT_DIR
 
-postfix =  datetime.datetime.now().strftime("%Y-%m-%d_%H%M%S") + '_ImdbParserOutput'
-if args.input_dir:
+preferences_map = {
+    "mode":mode,
+    "input_dir": input_dir
+}
+
+if mode == "SQL":
+    if args.sql_copy and args.sql_dialect != "postgres":
+        parser.error("--sql_copy needs --sql_dialect postgres")
+    preferences_map["sql_dialect"] = args.sql_dialect or "mysql"
+    preferences_map["sql_copy"] = args.sql_copy
+
+if args.memory_limit:
+    preferences_map["memory_limit"] = args.memory_limit
+
+if args.aggregates:
+    preferences_map["aggregates"] = True
+
+if args.profile:
+    preferences_map["profile"] = True
+
+if args.episode_index:
+    preferences_map["episode_index"] = True
+
+if args.genre_bitmap:
+    preferences_map["genre_bitmap"] = True
+
+if args.max_reject_ratio is not None:
+    preferences_map["max_reject_ratio"] = args.max_reject_ratio
+
+if args.shard_rows or args.shard_bytes or args.compression:
+    preferences_map["sharding"] = {
+        "max_rows": args.shard_rows,
+        "max_bytes": args.shard_bytes,
+        "compression": args.compression,
+        "compression_level": args.compression_level
+    }
+
+if args.partition or args.partition_filter:
+    if mode not in ("TSV", "JSON"):
+        parser.error("partitioning is supported in TSV and JSON modes")
+    if args.partition_filter:
+        from idp.utils.partitionedsink import compile_filter
+        try:
+            compile_filter(args.partition_filter)
+        except (SyntaxError, ValueError) as e:
+            parser.error("invalid --partition_filter: " + str(e))
+    preferences_map["partitioning"] = {
+        "filter": args.partition_filter,
+        "max_open_files": args.max_open_files
+    }
+
+if args.title_filter:
+    from idp.utils.partitionedsink import compile_filter
+    try:
+        compile_filter(args.title_filter)
+    except (SyntaxError, ValueError) as e:
+        parser.error("invalid --title_filter: " + str(e))
+
+if args.columns:
+    from idp.parser import registry
+    preferences_map["columns"] = {}
+    for projection in args.columns:
+        list_name, _, columns = projection.partition("=")
+        columns = [column.strip() for column in columns.split(",") if column.strip()]
+        try:
+            registry.get_parser_class(list_name.strip()).select_columns(columns)
+        except KeyError:
+            parser.error("invalid --columns: unknown list " + list_name)
+        except ValueError as e:
+            parser.error("invalid --columns: " + str(e))
+        if not columns:
+            parser.error("invalid --columns: no columns for " + list_name)
+        preferences_map["columns"][list_name.strip()] = columns
+
+if args.pipe:
+    # the list goes to stdout or a named pipe, logs go to stderr and nothing is written to disk
+    from idp.parser import registry
+    from idp.parser.recordreader import open_list
+    from idp.utils import pipeoutput
+    from idp.utils.filehandler import FileHandler
+    if args.deterministic or args.concurrent or "sharding" in preferences_map or "partitioning" in preferences_map:
+        parser.error("--pipe writes a single stream, it cannot be used with --deterministic, --concurrent, sharding or partitioning")
+    if args.aggregates or args.profile or args.episode_index or args.genre_bitmap or args.credit_graph:
+        parser.error("--pipe writes no files, it cannot be used with --aggregates, --profile, --episode_index, --genre_bitmap or --credit_graph")
+    try:
+        ParserClass = registry.get_parser_class(args.pipe)
+    except KeyError:
+        parser.error("invalid --pipe: unknown list " + args.pipe)
+    preferences_map["output_dir"] = None
+    preferences_map["pipe"] = args.pipe_path or pipeoutput.STDOUT
+    initialize_logger(preferences_map)
+
+    if args.update_lists and not args.stream:
+        from idp.utils import listdownloader
+        listdownloader.download()
+    if args.title_filter:
+        preferences_map["title_filter"] = ParsingHelper.build_title_filter(preferences_map, args.title_filter, args.exact_title_filter)
+
+    if args.stream:
+        from idp.utils import listdownloader
+        input_file = listdownloader.stream(ParserClass.input_file_name)
+    else:
+        # .gz lists are read as they are instead of being extracted into input_dir
+        input_path = FileHandler(ParserClass.input_file_name, preferences_map).existing_input_path()
+        if input_path is None:
+            logging.error("File cannot be found: %s", os.path.join(input_dir, ParserClass.input_file_name))
+            sys.exit(1)
+        input_file = open_list(input_path)
+    try:
+        ParserClass(preferences_map, input_file).start_processing()
+    except BrokenPipeError:
+        pipeoutput.exit_on_broken_pipe()
+    sys.exit(0)
+
+if args.deterministic:
+    if args.update_lists or args.stream:
+        parser.error("--deterministic needs the lists in input_dir, it cannot be used with --update_lists or --stream")
+    if "sharding" in preferences_map:
+        parser.error("--deterministic cannot sort sharded outputs")
+    preferences_map["deterministic"] = True
+
+    # the same inputs, parsers and options always go to the same directory
+    from idp.utils import runmanifest
+    input_digests = ParsingHelper.input_digests(preferences_map)
+    run_options = ParsingHelper.output_options(preferences_map)
+    run_options["title_filter"] = args.title_filter
+    run_options["credit_graph"] = args.credit_graph
+    postfix = runmanifest.run_id(input_digests, run_options) + '_ImdbParserOutput'
+else:
+    postfix =  datetime.datetime.now().strftime("%Y-%m-%d_%H%M%S") + '_ImdbParserOutput'
+if args.output_dir:
     output_dir = os.path.join(args.output_dir, postfix)
 else:
-    output_dir = os.path.join(OUTPUT_DIR, postfix)
+    output_dir = os.path.join(settings.OUTPUT_DIR, postfix)
 
 if not os.path.exists(output_dir):
     os.makedirs(output_dir)
+preferences_map["output_dir"] = output_dir
 
-preferences_map = {
-    "mode":mode,
-    "input_dir": input_dir,
-    "output_dir": output_dir
-}
+# settings files created before the cache existed have no CACHE_DIR
+if not args.no_cache and getattr(settings, 'CACHE_DIR', None):
+    from idp.utils.resultcache import ResultCache
+    preferences_map["cache"] = ResultCache(settings.CACHE_DIR, getattr(settings, 'CACHE_SIZE_LIMIT', None), args.hash_inputs)
 
 initialize_logger(preferences_map)
 
@@ -76,15 +254,37 @@ logging.info("mode:%s", mode)
 logging.info("input_dir:%s", input_dir)
 logging.info("output_dir:%s", output_dir)
 logging.info("update_lists:%s", args.update_lists)
+logging.info("stream:%s", args.stream)
 
-if args.update_lists:
+if args.update_lists and not (args.stream or args.concurrent):
     from idp.utils import listdownloader
     logging.info("Downloading IMDB dumps, this may take a while depending on your connection speed")
     listdownloader.download()
 
+if args.title_filter:
+    logging.info("Building title filter from movies list")
+    preferences_map["title_filter"] = ParsingHelper.build_title_filter(preferences_map, args.title_filter, args.exact_title_filter)
+
 logging.info("Parsing, please wait. This may take very long time...")
 
-ParsingHelper.parse_all(preferences_map)
+if args.concurrent:
+    from idp.parser.asyncparsinghelper import AsyncParsingHelper
+    AsyncParsingHelper.parse_all(preferences_map, update_lists=args.update_lists, workers=args.workers, load_command=args.load_command)
+else:
+    ParsingHelper.parse_all(preferences_map, args.stream)
+
+if args.credit_graph:
+    logging.info("Building credit graph")
+    from idp.parser.creditgraph import export_credit_graph
+    export_credit_graph(preferences_map, os.path.join(output_dir, "credit_graph"))
+
+if args.deterministic:
+    logging.info("Sorting outputs and writing run manifest")
+    from idp.utils.memorybudget import MemoryBudget
+    sort_memory = MemoryBudget(args.memory_limit, name="sorting outputs")
+    manifest = runmanifest.finalize(output_dir, input_digests, ParsingHelper.output_options(preferences_map), budget=sort_memory)
+    sort_memory.report()
+    logging.info("Run digest: %s", manifest["digest"])
 
 logging.info("Check out output folder: %s", output_dir)
 print ("All done, enjoy ;)") #don't print this via logger, this is part of the program